@@ -0,0 +1,156 @@
+"""Batch feature extraction against the per-document functions.
+
+Scores the same synthetic resumes once through the scalar regex extractors
+(quantified achievements, contact details, years of experience, role signals
+and the ATS score) and once through ``scorer.extract_features_batch``, at each
+``--docs`` size. Prints both timings and the smallest size at which the batch
+path is faster, and exits non-zero if any value differs.
+
+The scalar baseline calls the extractors' compute functions on fresh documents,
+so it neither reads nor writes the document store, just like the batch path.
+``--alternatives`` also times the batch's per-text pattern loops against pandas
+``.str`` methods and against one combined named-group pattern over all texts.
+
+    python benchmarks/bench_batch_features.py --docs 100 1000 10000 --size 4096
+    python benchmarks/bench_batch_features.py --docs 10000 --alternatives
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, "..", "src"))
+
+from document import ResumeDocument  # noqa: E402
+from nlp_utils import (  # noqa: E402
+    TextBatch,
+    _count_quantified_achievements,
+    _detect_contact_details,
+    _estimate_experience_years,
+    _extract_role_signals,
+)
+from patterns import EMAIL, EXPERIENCE_YEARS, PHONE, QUANTIFIED  # noqa: E402
+from scorer import _resume_ats_score, extract_features_batch  # noqa: E402
+from synthetic import make_resume  # noqa: E402
+
+
+def scalar_features(texts):
+    rows = []
+    for text in texts:
+        # A fresh document each time, so nothing is served from the document LRU.
+        doc = ResumeDocument(text)
+        quantified = _count_quantified_achievements(doc)
+        contact = _detect_contact_details(doc)
+        # The ATS score reuses these, as it does after the public functions have run.
+        doc.set_feature("quantified_achievements", quantified)
+        doc.set_feature("contact_details", contact)
+        rows.append({
+            "quantified_achievements": quantified,
+            "experience_years": _estimate_experience_years(doc),
+            **contact,
+            **_extract_role_signals(doc),
+            "ats_score": _resume_ats_score(doc),
+        })
+    return rows
+
+
+def run(texts):
+    start = time.perf_counter()
+    expected = scalar_features(texts)
+    scalar_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    frame = extract_features_batch(texts)
+    batch_seconds = time.perf_counter() - start
+
+    mismatches = sum(
+        frame.iloc[index][name] != value for index, row in enumerate(expected) for name, value in row.items()
+    )
+    return scalar_seconds, batch_seconds, mismatches
+
+
+def timed(func):
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def compare_alternatives(texts):
+    """Time the pattern scans as per-text loops, pandas ``.str`` calls and one combined pattern."""
+    import pandas as pd
+
+    batch = TextBatch(texts)
+    series = pd.Series(texts)
+    cases = [
+        ("quantified count", lambda: batch.count(QUANTIFIED), lambda: series.str.count(QUANTIFIED)),
+        ("email contains", lambda: batch.contains(EMAIL), lambda: series.str.contains(EMAIL)),
+        ("phone contains", lambda: batch.contains(PHONE), lambda: series.str.contains(PHONE)),
+        (
+            "experience years",
+            lambda: [EXPERIENCE_YEARS.findall(text) for text in batch.texts],
+            lambda: series.str.extractall(EXPERIENCE_YEARS),
+        ),
+    ]
+    print(f"{'scan':<18}  {'loop ms':>8}  {'.str ms':>8}")
+    for name, loop, vectorised in cases:
+        print(f"{name:<18}  {timed(loop) * 1000:>8.1f}  {timed(vectorised) * 1000:>8.1f}")
+
+    # Every scan above as named groups of one pattern, run once over the joined texts.
+    combined = re.compile(
+        "|".join(
+            f"(?P<{name}>{pattern.pattern})"
+            for name, pattern in [("quantified", QUANTIFIED), ("email", EMAIL), ("phone", PHONE), ("years", EXPERIENCE_YEARS)]
+        ),
+        re.IGNORECASE,
+    )
+    joined = "\0".join(texts)
+    loops = timed(lambda: (
+        batch.count(QUANTIFIED),
+        batch.contains(EMAIL),
+        batch.contains(PHONE),
+        [EXPERIENCE_YEARS.findall(text) for text in batch.texts],
+    ))
+    print(f"all four as loops  {loops * 1000:>8.1f}")
+    print(f"one combined scan  {timed(lambda: sum(1 for _ in combined.finditer(joined))) * 1000:>8.1f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--docs", type=int, nargs="+", default=[10, 100, 1000, 10_000])
+    parser.add_argument("--size", type=int, default=4096, help="Resume size in bytes")
+    parser.add_argument("--alternatives", action="store_true", help="Also time pandas .str and a combined pattern")
+    args = parser.parse_args(argv)
+
+    # Imports pandas and compiles the patterns before anything is timed.
+    run([make_resume(args.size, seed) for seed in range(10)])
+
+    crossover = None
+    failed = False
+    print(f"{'docs':>6}  {'scalar ms':>10}  {'batch ms':>10}  speed-up")
+    for docs in sorted(args.docs):
+        texts = [make_resume(args.size, seed) for seed in range(docs)]
+        scalar_seconds, batch_seconds, mismatches = run(texts)
+        speedup = scalar_seconds / batch_seconds
+        print(f"{docs:>6}  {scalar_seconds * 1000:>10.1f}  {batch_seconds * 1000:>10.1f}  x{speedup:.2f}")
+        if speedup > 1 and crossover is None:
+            crossover = docs
+        elif speedup <= 1:
+            crossover = None
+        if mismatches:
+            print(f"{docs} docs: {mismatches} value(s) differ between the scalar and batch features", file=sys.stderr)
+            failed = True
+
+    if crossover is None:
+        print("batch is not faster at the largest size")
+    else:
+        print(f"batch is faster from {crossover} docs")
+    if args.alternatives:
+        compare_alternatives([make_resume(args.size, seed) for seed in range(max(args.docs))])
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+"""Cold-start guard: import time of the scoring modules, measured with ``python -X importtime``.
+
+Each module is imported in a fresh interpreter several times. The script fails if
+the best cumulative import time exceeds the budget, or if importing it pulls in a
+heavy dependency that should only load on first use (scikit-learn, SciPy,
+NumPy, NLTK, requests, PyPDF2, python-dotenv).
+
+    python benchmarks/bench_import.py --budget-ms 150
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+
+MODULES = ["scorer", "nlp_utils", "ai_analyzer", "parser", "bulk_score", "search_index"]
+
+DEFERRED = ["sklearn", "scipy", "numpy", "nltk", "requests", "urllib3", "PyPDF2", "dotenv"]
+
+# Nested imports are indented by two spaces per level after the second "|".
+_IMPORT_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)$")
+
+
+def import_profile(module):
+    """Return ``(cumulative_ms, imported_module_names)`` for one cold import of ``module``."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=SRC_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    cumulative_us = None
+    imported = set()
+    for line in result.stderr.splitlines():
+        match = _IMPORT_LINE.match(line)
+        if not match:
+            continue
+        name = match.group(4)
+        imported.add(name)
+        if name == module and not match.group(3):
+            cumulative_us = int(match.group(2))
+    return cumulative_us / 1000, imported
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("modules", nargs="*", default=MODULES)
+    parser.add_argument("--budget-ms", type=float, default=150.0, help="Maximum cumulative import time per module")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    failures = 0
+    for module in args.modules:
+        profiles = [import_profile(module) for _ in range(args.repeat)]
+        best = min(elapsed for elapsed, _ in profiles)
+        imported = profiles[0][1]
+        leaked = [name for name in DEFERRED if name in imported]
+        status = "ok" if best <= args.budget_ms and not leaked else "SLOW"
+        failures += status != "ok"
+        note = f"  eager: {', '.join(leaked)}" if leaked else ""
+        print(f"{status:4} {module:14} {best:8.1f} ms{note}")
+
+    if failures:
+        print(f"{failures} module(s) exceeded the {args.budget_ms} ms budget or imported heavy dependencies", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+"""Micro-benchmark guarding the extraction regexes against catastrophic backtracking.
+
+Each pattern is run over adversarial inputs (long digit, dash, and word runs like
+those produced by malformed PDFs) at full size and at a quarter of it. The script
+exits non-zero if any scan exceeds its time budget or grows clearly faster than
+linearly with input size, so it can gate CI.
+
+    python benchmarks/bench_patterns.py --size 50000 --budget-ms 50
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from patterns import EMAIL, EXPERIENCE_YEARS, PHONE, QUANTIFIED, URL  # noqa: E402
+
+PATTERNS = {
+    "email": EMAIL,
+    "phone": PHONE,
+    "url": URL,
+    "quantified": QUANTIFIED,
+    "experience_years": EXPERIENCE_YEARS,
+}
+
+
+MAX_GROWTH = 8.0
+
+
+def adversarial_inputs(size):
+    return {
+        "digits": "7" * size,
+        "dashes": "-" * size,
+        "digit_dash": ("12-" * size)[:size],
+        "digit_space": ("1 " * size)[:size],
+        "digit_dot": ("555." * size)[:size],
+        "word_run": "a" * size,
+        "dotted_words": ("a." * size)[:size],
+        "at_runs": ("a@" * size)[:size],
+        "email_no_tld": "x" * (size // 2) + "@" + "y" * (size // 2),
+        "digit_then_spaces": "5" + " " * (size - 1),
+        "money_commas": "$1" + "," * (size - 2),
+        "parens": ("(555)" * size)[:size],
+    }
+
+
+def time_scan(pattern, text, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in pattern.finditer(text):
+            pass
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=50_000, help="Characters per adversarial input")
+    parser.add_argument("--budget-ms", type=float, default=50.0, help="Maximum milliseconds per scan")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    failures = 0
+    quarter_inputs = adversarial_inputs(args.size // 4)
+    for input_name, text in adversarial_inputs(args.size).items():
+        for pattern_name, pattern in PATTERNS.items():
+            elapsed = time_scan(pattern, text, args.repeat)
+            quarter = time_scan(pattern, quarter_inputs[input_name], args.repeat)
+            # Linear scans grow ~4x from a quarter-size input; quadratic ones ~16x.
+            growth = elapsed / quarter if quarter > 0 else 0
+            superlinear = elapsed > 2 and growth > MAX_GROWTH
+            status = "ok" if elapsed <= args.budget_ms and not superlinear else "SLOW"
+            failures += status != "ok"
+            print(f"{status:4} {pattern_name:17} {input_name:18} {elapsed:8.2f} ms  x{growth:4.1f}")
+
+    if failures:
+        print(f"{failures} scan(s) exceeded the {args.budget_ms} ms budget", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
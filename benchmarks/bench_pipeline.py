@@ -0,0 +1,224 @@
+"""Scoring-pipeline benchmark with a stored-baseline regression gate.
+
+Each (case, size) pair runs in a fresh interpreter over freshly generated
+synthetic documents, so memoisation never hides work and peak RSS belongs to
+that case alone. The AI step is stubbed: no token is set, so ``score_resume``
+uses the built-in fallback analysis and makes no network calls. Throughput,
+p50/p95/p99 latency and peak RSS go to a JSON report. With a baseline file,
+any case whose p50 or p95 slows by more than ``--tolerance`` fails the run.
+
+    python benchmarks/bench_pipeline.py --sizes 1k,10k,100k --docs 200
+    python benchmarks/bench_pipeline.py --update-baseline      # record this machine's baseline
+"""
+
+import argparse
+import io
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+SRC_DIR = os.path.join(BENCH_DIR, "..", "src")
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, "baseline.json")
+
+CASES = [
+    "preprocess_text",
+    "extract_skills",
+    "extract_keywords",
+    "calculate_similarity",
+    "calculate_ats_score",
+    "score_resume",
+    "extract_text_from_pdf",
+]
+
+# Job descriptions stay a realistic size while resume size varies.
+JOB_DESCRIPTION_SIZE = 2048
+WARMUP_CALLS = 2
+
+
+def parse_size(value):
+    units = {"k": 1024, "m": 1024 * 1024}
+    value = value.strip().lower()
+    if value[-1] in units:
+        return int(float(value[:-1]) * units[value[-1]])
+    return int(value)
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an ascending list."""
+    index = max(0, math.ceil(fraction * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+
+def peak_rss_mb():
+    import resource
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes.
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _build_call(case):
+    """Return ``(make_input, call)``; inputs are generated before timing starts."""
+    from synthetic import make_job_description, make_pdf, make_resume
+
+    import nlp_utils
+    import parser
+    import scorer
+
+    def texts(size, seed):
+        return make_resume(size, seed), make_job_description(JOB_DESCRIPTION_SIZE, seed)
+
+    if case == "preprocess_text":
+        return texts, lambda resume, job: nlp_utils.preprocess_text(resume)
+    if case == "extract_skills":
+        return texts, lambda resume, job: nlp_utils.extract_skills(resume)
+    if case == "extract_keywords":
+        return texts, lambda resume, job: nlp_utils.extract_keywords(resume, 15)
+    if case == "calculate_similarity":
+        return texts, nlp_utils.calculate_similarity
+    if case == "calculate_ats_score":
+        return texts, scorer.calculate_ats_score
+    if case == "score_resume":
+        return texts, scorer.score_resume
+    if case == "extract_text_from_pdf":
+        return (
+            lambda size, seed: (make_pdf(make_resume(size, seed)), None),
+            lambda pdf_bytes, _: parser.extract_text_from_pdf(io.BytesIO(pdf_bytes)),
+        )
+    raise ValueError(f"Unknown case {case!r}")
+
+
+def run_case(case, size, docs):
+    """Time ``docs`` calls of one case on distinct documents of ``size`` bytes."""
+    make_input, call = _build_call(case)
+    inputs = [make_input(size, seed) for seed in range(docs + WARMUP_CALLS)]
+    for args in inputs[:WARMUP_CALLS]:
+        call(*args)
+
+    latencies = []
+    started = time.perf_counter()
+    for args in inputs[WARMUP_CALLS:]:
+        start = time.perf_counter()
+        call(*args)
+        latencies.append((time.perf_counter() - start) * 1000)
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "case": case,
+        "size": size,
+        "docs": docs,
+        "throughput_per_s": round(docs / elapsed, 2) if elapsed else None,
+        "p50_ms": round(percentile(latencies, 0.50), 4),
+        "p95_ms": round(percentile(latencies, 0.95), 4),
+        "p99_ms": round(percentile(latencies, 0.99), 4),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    }
+
+
+def run_isolated(case, size, docs):
+    """Run one case in a child interpreter with caches off and the AI stubbed out."""
+    scratch = tempfile.mkdtemp(prefix="bench-")
+    env = dict(
+        os.environ,
+        HUGGINGFACE_API_TOKEN="",
+        HF_TOKEN="",
+        RESULT_CACHE_SIZE="0",
+        RESULT_CACHE_PATH="",
+        DOCUMENT_STORE_PATH="",
+        # A path with no model on it, so similarity takes the same path on every machine.
+        CORPUS_MODEL_PATH=os.path.join(scratch, "corpus_model.npz"),
+    )
+    result = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child", case, str(size), str(docs)],
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"{case} at {size} bytes failed:\n{result.stderr}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def compare(results, baseline, tolerance):
+    """Return human-readable regressions against ``baseline`` results."""
+    previous = {(entry["case"], entry["size"]): entry for entry in baseline.get("results", [])}
+    regressions = []
+    for entry in results:
+        before = previous.get((entry["case"], entry["size"]))
+        if before is None:
+            continue
+        for metric in ("p50_ms", "p95_ms"):
+            # Sub-millisecond timings are too noisy to gate on ratios alone.
+            limit = max(before[metric] * (1 + tolerance), before[metric] + 0.05)
+            if entry[metric] > limit:
+                regressions.append(
+                    f"{entry['case']} @ {entry['size']} B: {metric} {entry[metric]:.3f} ms "
+                    f"vs baseline {before[metric]:.3f} ms (+{(entry[metric] / before[metric] - 1) * 100:.0f}%)"
+                )
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cases", default=",".join(CASES), help="Comma-separated cases to run")
+    parser.add_argument("--sizes", default="1k,10k,100k", help="Resume sizes, e.g. 1k,10k,1m")
+    parser.add_argument("--docs", type=int, default=100, help="Documents timed per case and size")
+    parser.add_argument("--output", help="Write the JSON report here (default: stdout only)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline report to compare against")
+    parser.add_argument("--update-baseline", action="store_true", help="Save this run as the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown before failing (0.25 = 25%%)")
+    parser.add_argument("--child", nargs=3, metavar=("CASE", "SIZE", "DOCS"), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        sys.path[:0] = [SRC_DIR, BENCH_DIR]
+        case, size, docs = args.child
+        print(json.dumps(run_case(case, int(size), int(docs))))
+        return 0
+
+    results = []
+    for case in args.cases.split(","):
+        for size in (parse_size(value) for value in args.sizes.split(",")):
+            entry = run_isolated(case, size, args.docs)
+            results.append(entry)
+            print(
+                f"{case:22} {size:>8} B  {entry['throughput_per_s']:>9.1f}/s  p50 {entry['p50_ms']:8.3f}  "
+                f"p95 {entry['p95_ms']:8.3f}  p99 {entry['p99_ms']:8.3f} ms  rss {entry['peak_rss_mb']:7.1f} MB"
+            )
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "docs": args.docs,
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            json.dump(report, handle, indent=2)
+
+    if args.update_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as handle:
+            json.dump(report, handle, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --update-baseline to record one", file=sys.stderr)
+        return 0
+    with open(args.baseline, encoding="utf-8") as handle:
+        regressions = compare(results, json.load(handle), args.tolerance)
+    for regression in regressions:
+        print(f"REGRESSION {regression}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,138 @@
+"""Deterministic synthetic resumes, job descriptions and PDFs for benchmarks and load tests.
+
+Every generator takes a seed, so the same arguments always produce the same
+document. Sizes are in bytes of UTF-8 text.
+"""
+
+import json
+import os
+import random
+import textwrap
+
+TAXONOMY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src", "data", "skills_taxonomy.json")
+
+VERBS = ["Led", "Built", "Designed", "Shipped", "Managed", "Developed", "Mentored", "Launched", "Helped", "Worked on"]
+OBJECTS = [
+    "a data pipeline", "the billing service", "an internal platform", "customer dashboards", "the search backend",
+    "a migration to the cloud", "the mobile app", "CI/CD tooling", "a recommendation engine", "observability",
+]
+IMPACTS = [
+    "reducing latency by {n}%", "saving ${n}K per year", "serving {n}M requests a day", "for {n} enterprise customers",
+    "cutting build time by {n} minutes", "improving conversion by {n}%", "with a team of {n} engineers",
+]
+FILLER = [
+    "collaborated with stakeholders across product and design", "responsible for on-call and incident reviews",
+    "partnered with cross-functional teams", "owned the roadmap for the quarter", "good communication skills",
+]
+DEGREES = ["BS Computer Science", "MS Data Science", "BA Economics", "BEng Electrical Engineering"]
+ROLES = ["Backend Engineer", "Data Scientist", "Platform Engineer", "Full Stack Developer", "ML Engineer"]
+
+
+def _skills():
+    with open(TAXONOMY_PATH, encoding="utf-8") as handle:
+        categories = json.load(handle)["categories"]
+    return [entry if isinstance(entry, str) else entry["name"] for entries in categories.values() for entry in entries]
+
+
+SKILLS = _skills()
+
+
+def _fill(rng, lines, size, make_line):
+    """Append generated lines until the document reaches ``size`` bytes, then trim to it."""
+    text = "\n".join(lines)
+    while len(text.encode("utf-8")) < size:
+        line = make_line(rng)
+        lines.append(line)
+        text += "\n" + line
+    return text.encode("utf-8")[:size].decode("utf-8", errors="ignore")
+
+
+def _bullet(rng):
+    impact = rng.choice(IMPACTS).format(n=rng.randint(2, 95))
+    skills = ", ".join(rng.sample(SKILLS, 2))
+    extra = f"; {rng.choice(FILLER)}" if rng.random() < 0.3 else ""
+    return f"- {rng.choice(VERBS)} {rng.choice(OBJECTS)} using {skills}, {impact}{extra}."
+
+
+def make_resume(size=4096, seed=0):
+    """A plausible resume of about ``size`` bytes with contact details, sections and quantified bullets."""
+    rng = random.Random(seed)
+    name = f"Candidate {seed}"
+    lines = [
+        name,
+        f"candidate{seed}@example.com | +1 (555) {rng.randint(100, 999)}-{rng.randint(1000, 9999)}",
+        f"linkedin.com/in/candidate{seed} | github.com/candidate{seed}",
+        "",
+        "Summary",
+        f"{rng.choice(ROLES)} with {rng.randint(1, 15)}+ years of experience in {', '.join(rng.sample(SKILLS, 4))}.",
+        "",
+        "Skills",
+        ", ".join(rng.sample(SKILLS, 12)),
+        "",
+        "Education",
+        f"{rng.choice(DEGREES)}, State University",
+        "",
+        "Projects",
+        _bullet(rng),
+        "",
+        "Experience",
+    ]
+    return _fill(rng, lines, size, _bullet)
+
+
+def make_job_description(size=2048, seed=0):
+    """A job description of about ``size`` bytes listing required skills and responsibilities."""
+    rng = random.Random(seed + 1_000_003)
+    required = rng.sample(SKILLS, 8)
+    lines = [
+        f"{rng.choice(ROLES)}",
+        f"We are looking for an engineer with {rng.randint(2, 8)}+ years of experience.",
+        f"Required: {', '.join(required[:5])}.",
+        f"Nice to have: {', '.join(required[5:])}.",
+        "Responsibilities:",
+    ]
+
+    def responsibility(rng):
+        return f"- {rng.choice(VERBS)} {rng.choice(OBJECTS)} with {rng.choice(required)} and {rng.choice(SKILLS)}."
+
+    return _fill(rng, lines, size, responsibility)
+
+
+def make_pdf(text, lines_per_page=60, chars_per_line=95) -> bytes:
+    """Lay ``text`` out as a minimal multi-page PDF using the built-in Helvetica font."""
+    lines = []
+    for paragraph in text.splitlines():
+        lines.extend(textwrap.wrap(paragraph, chars_per_line) or [""])
+    pages = [lines[start:start + lines_per_page] for start in range(0, len(lines), lines_per_page)] or [[]]
+
+    objects = []
+    page_ids = [4 + 2 * index for index in range(len(pages))]
+    objects.append(b"<< /Type /Catalog /Pages 2 0 R >>")
+    kids = " ".join(f"{page_id} 0 R" for page_id in page_ids)
+    objects.append(f"<< /Type /Pages /Kids [{kids}] /Count {len(pages)} >>".encode("ascii"))
+    objects.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>")
+    for page_id, page_lines in zip(page_ids, pages):
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Resources << /Font << /F1 3 0 R >> >> "
+            f"/Contents {page_id + 1} 0 R >>".encode("ascii")
+        )
+        stream = b"BT /F1 9 Tf 12 TL 40 760 Td\n" + b"".join(
+            b"(" + _escape_pdf_text(line) + b") Tj T*\n" for line in page_lines
+        ) + b"ET"
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref_at = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref_at)
+    return bytes(out)
+
+
+def _escape_pdf_text(line):
+    encoded = line.encode("cp1252", errors="replace")
+    return encoded.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)")
@@ -0,0 +1,155 @@
+"""Drive the scoring service locally with the LLM stubbed out.
+
+Starts the stub chat-completions server and ``src/service.py`` as child
+processes, then sends concurrent ``/score`` requests spread over a few job
+descriptions and reports throughput, latency percentiles and how well requests
+were batched.
+
+    python scripts/load_test.py --requests 500 --concurrency 32 --jobs 4 --workers 4
+    python scripts/load_test.py --ai --llm-latency 0.5     # exercise the AI path against the stub
+    python scripts/load_test.py --url http://127.0.0.1:8000 # target an already running service
+"""
+
+import argparse
+import json
+import math
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from synthetic import make_job_description, make_resume  # noqa: E402
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_until_ready(url, process, timeout=300):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process is not None and process.poll() is not None:
+            raise RuntimeError(f"{url} exited with code {process.returncode}")
+        try:
+            with urllib.request.urlopen(url, timeout=1):
+                return
+        except (urllib.error.URLError, ConnectionError):
+            time.sleep(0.2)
+    raise RuntimeError(f"{url} did not become ready within {timeout} s")
+
+
+def get_json(url):
+    with urllib.request.urlopen(url, timeout=10) as response:
+        return json.load(response)
+
+
+def post_score(url, payload):
+    request = urllib.request.Request(
+        url + "/score", data=json.dumps(payload).encode("utf-8"), headers={"Content-Type": "application/json"}
+    )
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=300) as response:
+            json.load(response)
+            status = response.status
+    except urllib.error.HTTPError as exc:
+        status = exc.code
+    return status, (time.perf_counter() - start) * 1000
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an ascending list."""
+    index = max(0, math.ceil(fraction * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+
+def start_local_stack(args):
+    """Start the stub LLM and the service; return ``(service_url, processes)``."""
+    stub_port, service_port = free_port(), free_port()
+    processes = [
+        subprocess.Popen(
+            [sys.executable, os.path.join(ROOT, "scripts", "stub_llm_server.py"), "--port", str(stub_port),
+             "--latency", str(args.llm_latency)],
+        )
+    ]
+    env = dict(
+        os.environ,
+        HF_API_URL=f"http://127.0.0.1:{stub_port}/v1/chat/completions",
+        HUGGINGFACE_API_TOKEN="stub",
+        RESULT_CACHE_SIZE="0",
+        RESULT_CACHE_PATH="",
+    )
+    service = subprocess.Popen(
+        [sys.executable, os.path.join(ROOT, "src", "service.py"), "--port", str(service_port),
+         "--workers", str(args.workers), "--max-batch", str(args.max_batch), "--batch-wait-ms", str(args.batch_wait_ms)],
+        env=env,
+    )
+    processes.append(service)
+    url = f"http://127.0.0.1:{service_port}"
+    wait_until_ready(url + "/healthz", service)
+    return url, processes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="Existing service to target instead of starting one")
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--jobs", type=int, default=4, help="Distinct job descriptions in the request mix")
+    parser.add_argument("--resume-size", type=int, default=4096, help="Resume size in bytes")
+    parser.add_argument("--ai", action="store_true", help="Ask for AI analysis (served by the stub)")
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="Stub LLM response delay in seconds")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--max-batch", type=int, default=32)
+    parser.add_argument("--batch-wait-ms", type=float, default=10.0)
+    args = parser.parse_args(argv)
+
+    processes = []
+    try:
+        if args.url:
+            url = args.url.rstrip("/")
+        else:
+            url, processes = start_local_stack(args)
+
+        jobs = [make_job_description(2048, seed) for seed in range(args.jobs)]
+        payloads = [
+            {"resume_text": make_resume(args.resume_size, seed), "job_description": jobs[seed % args.jobs], "use_ai": args.ai}
+            for seed in range(args.requests)
+        ]
+        before = get_json(url + "/healthz")
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+            outcomes = list(pool.map(lambda payload: post_score(url, payload), payloads))
+        elapsed = time.perf_counter() - started
+
+        after = get_json(url + "/healthz")
+        latencies = sorted(latency for _, latency in outcomes)
+        errors = sum(status != 200 for status, _ in outcomes)
+        batches = after["batches"] - before["batches"]
+        print(f"requests     {args.requests} ({errors} errors), concurrency {args.concurrency}, {args.jobs} job descriptions")
+        print(f"throughput   {args.requests / elapsed:.1f} req/s")
+        print(
+            f"latency      p50 {percentile(latencies, 0.50):.1f}  p95 {percentile(latencies, 0.95):.1f}  "
+            f"p99 {percentile(latencies, 0.99):.1f}  max {latencies[-1]:.1f} ms"
+        )
+        print(f"batches      {batches} (mean size {(after['requests'] - before['requests']) / max(batches, 1):.1f})")
+        return 1 if errors else 0
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.wait()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
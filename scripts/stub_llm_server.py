@@ -0,0 +1,148 @@
+"""Local stand-in for a chat-completions endpoint, for load tests and offline development.
+
+    python scripts/stub_llm_server.py --port 8765 --latency 0.5 --rate-limit-every 20
+    HF_API_URL=http://127.0.0.1:8765/v1/chat/completions HUGGINGFACE_API_TOKEN=stub streamlit run src/app.py
+
+Every request returns the same canned analysis in the chat-completions shape,
+as server-sent chunks when the request sets ``"stream": true``.
+Latency, periodic 429s with Retry-After, and random 5xx errors can be injected.
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CANNED_ANALYSIS = {
+    "overall_assessment": "Solid backend profile with partial alignment to the role.",
+    "matching_skills": ["python", "sql", "docker"],
+    "missing_critical_skills": ["kubernetes"],
+    "missing_nice_to_have_skills": ["terraform"],
+    "strengths": ["Relevant backend experience"],
+    "weaknesses": ["Few quantified achievements"],
+    "specific_improvements": ["Quantify the impact of recent projects"],
+    "keyword_gaps": ["microservices"],
+    "experience_match": "72",
+    "ats_recommendations": ["Use standard section headers"],
+    "content_to_add": ["Deployment metrics"],
+    "content_to_remove": ["Outdated tooling"],
+    "action_verbs_to_use": ["delivered", "optimized"],
+    "quantifiable_achievements": "Add latency and cost improvements with numbers.",
+    "role_fit_summary": "Good fit for a mid-level backend role.",
+    "seniority_alignment": "mid-level",
+    "industry_alignment": "Software",
+    "top_resume_highlights": ["Led a migration to PostgreSQL"],
+    "interview_readiness": "68",
+}
+
+
+STREAM_CHUNK_CHARS = 16
+
+
+class StubState:
+    def __init__(self, latency, rate_limit_every, error_rate, stream_delay=0.01):
+        self.latency = latency
+        self.stream_delay = stream_delay
+        self.rate_limit_every = rate_limit_every
+        self.error_rate = error_rate
+        self.requests = 0
+        self.lock = threading.Lock()
+
+    def next_request(self):
+        with self.lock:
+            self.requests += 1
+            return self.requests
+
+
+def make_handler(state):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length", 0))
+            request = json.loads(self.rfile.read(length) or b"{}")
+            number = state.next_request()
+
+            if state.rate_limit_every and number % state.rate_limit_every == 0:
+                self._send_json(429, {"error": "rate limited"}, {"Retry-After": "1"})
+                return
+            if state.error_rate and random.random() < state.error_rate:
+                self._send_json(503, {"error": "unavailable"})
+                return
+
+            time.sleep(state.latency)
+            content = json.dumps(CANNED_ANALYSIS)
+            if request.get("stream"):
+                self._send_stream(number, request.get("model", "stub"), content)
+                return
+            self._send_json(200, {
+                "id": f"stub-{number}",
+                "object": "chat.completion",
+                "model": request.get("model", "stub"),
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+            })
+
+        def _send_stream(self, number, model, content):
+            """Send the content as server-sent chat-completion chunks of a few characters each."""
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Connection", "close")
+            self.end_headers()
+            for start in range(0, len(content), STREAM_CHUNK_CHARS):
+                chunk = {
+                    "id": f"stub-{number}",
+                    "object": "chat.completion.chunk",
+                    "model": model,
+                    "choices": [{"index": 0, "delta": {"content": content[start:start + STREAM_CHUNK_CHARS]}}],
+                }
+                self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+                self.wfile.flush()
+                time.sleep(state.stream_delay)
+            self.wfile.write(b"data: [DONE]\n\n")
+            self.close_connection = True
+
+        def _send_json(self, status, payload, headers=None):
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def make_server(host="127.0.0.1", port=8765, latency=0.0, rate_limit_every=0, error_rate=0.0, stream_delay=0.01):
+    state = StubState(latency, rate_limit_every, error_rate, stream_delay)
+    return ThreadingHTTPServer((host, port), make_handler(state))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stub chat-completions server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds to wait before each successful response")
+    parser.add_argument("--rate-limit-every", type=int, default=0, help="Answer every Nth request with 429")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 503")
+    parser.add_argument("--stream-delay", type=float, default=0.01, help="Seconds between streamed chunks")
+    args = parser.parse_args(argv)
+
+    server = make_server(args.host, args.port, args.latency, args.rate_limit_every, args.error_rate, args.stream_delay)
+    print(f"Stub LLM listening on http://{args.host}:{args.port}/v1/chat/completions")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
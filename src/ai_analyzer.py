@@ -1,20 +1,101 @@
 import json
 import os
 import re
-from typing import Dict, List
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional, Tuple
 
-import requests
+from cache import get_result_cache, make_key
+from document import get_document
+from env import load_env
+from taxonomy import get_taxonomy
+from tracing import span, traced
 
-# Load environment variables
-try:
-    from dotenv import load_dotenv
-    load_dotenv()
-except ImportError:
-    pass
+if TYPE_CHECKING:
+    import requests
 
 
-class AIResumeAnalyzer:
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+_LONG_WORD = re.compile(r"\b[a-zA-Z]{4,}\b")
+
+# Marks the last item of AIResumeAnalyzer.stream_analysis, which carries the full analysis.
+STREAM_COMPLETE = "__complete__"
+
+
+class IncrementalJSONFields:
+    """Parse a JSON object as it streams in, emitting each top-level field once its value closes.
+
+    Text before the opening brace (such as a markdown fence) is ignored. Every
+    character is scanned once across all :meth:`feed` calls.
+    """
+
     def __init__(self):
+        self.done = False
+        self._text = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._key = None
+        self._key_start = None
+        self._value_start = None
+
+    def feed(self, chunk: str) -> List[Tuple[str, object]]:
+        completed = []
+        self._text += chunk
+        text = self._text
+        index = self._pos
+        while index < len(text) and not self.done:
+            char = text[index]
+            if self._depth == 0:
+                if char == "{":
+                    self._depth = 1
+            elif self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._key_start is not None:
+                        self._key = json.loads(text[self._key_start:index + 1])
+                        self._key_start = None
+            elif char == '"':
+                self._in_string = True
+                if self._depth == 1 and self._key is None:
+                    self._key_start = index
+            elif char == ":" and self._depth == 1 and self._value_start is None:
+                self._value_start = index + 1
+            elif char in "{[":
+                self._depth += 1
+            elif char in "}]":
+                if self._depth == 1:
+                    self._complete_field(text, index, completed)
+                    self.done = True
+                self._depth -= 1
+            elif char == "," and self._depth == 1:
+                self._complete_field(text, index, completed)
+            index += 1
+        self._pos = index
+        return completed
+
+    def _complete_field(self, text: str, end: int, completed: List[Tuple[str, object]]):
+        if self._key is not None and self._value_start is not None:
+            try:
+                completed.append((self._key, json.loads(text[self._value_start:end])))
+            except json.JSONDecodeError:
+                pass
+        self._key = None
+        self._value_start = None
+
+
+class AIResumeAnalyzer:
+    def __init__(self, base_url: Optional[str] = None, pool_size: Optional[int] = None, max_retries: Optional[int] = None):
+        load_env()
         self.api_key = (
             os.getenv("HUGGINGFACE_API_TOKEN")
             or os.getenv("HF_TOKEN")
@@ -22,7 +103,50 @@ class AIResumeAnalyzer:
         ).strip()
         self.model = os.getenv("HF_MODEL", "Qwen/Qwen2.5-7B-Instruct-1M").strip()
         self.use_ai = bool(self.api_key)
-        self.base_url = "https://router.huggingface.co/v1/chat/completions"
+        self.base_url = base_url or os.getenv("HF_API_URL", "https://router.huggingface.co/v1/chat/completions")
+        self.timeout = float(os.getenv("HF_TIMEOUT", "45"))
+        self.pool_size = pool_size if pool_size is not None else int(os.getenv("HF_POOL_SIZE", "10"))
+        self.max_retries = max_retries if max_retries is not None else int(os.getenv("HF_MAX_RETRIES", "3"))
+        self.retry_backoff = float(os.getenv("HF_RETRY_BACKOFF", "0.5"))
+        self._session = None
+        self._session_lock = threading.Lock()
+
+    @property
+    def session(self) -> "requests.Session":
+        """Keep-alive session shared by every request this analyzer makes, created on first use."""
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    self._session = self._create_session()
+        return self._session
+
+    def _create_session(self) -> "requests.Session":
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        # Connection failures and retryable statuses are retried, but never a read
+        # timeout: the POST may already be running (and billed) on the server, and
+        # each retry would restart the full ``HF_TIMEOUT`` wait.
+        retry = Retry(
+            total=self.max_retries,
+            read=0,
+            backoff_factor=self.retry_backoff,
+            status_forcelist=RETRY_STATUS_CODES,
+            allowed_methods=frozenset(["POST"]),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size, max_retries=retry)
+
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers.update({
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json",
+        })
+        return session
 
     def analyze_with_ai(self, resume_text: str, job_description: str) -> Dict:
         """Use Hugging Face AI to analyze a resume against a job description."""
@@ -30,7 +154,111 @@ class AIResumeAnalyzer:
             return self._fallback_analysis(resume_text, job_description)
 
         try:
-            prompt = f"""
+            return self._analyze_or_raise(resume_text, job_description)
+        except Exception as exc:
+            print(f"AI analysis failed: {exc}")
+            return self._fallback_analysis(resume_text, job_description)
+
+    def _analyze_or_raise(self, resume_text: str, job_description: str, timeout: Optional[float] = None) -> Dict:
+        """Cached AI analysis that lets transport errors propagate to the caller.
+
+        ``timeout`` overrides ``HF_TIMEOUT`` for the HTTP request.
+        """
+        cache = get_result_cache()
+        cache_key = make_key("ai_analysis", resume_text, job_description, self.model)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        with span("ai_request"):
+            parsed = self._request_analysis(resume_text, job_description, timeout)
+        if parsed:
+            analysis = self._normalize_ai_response(parsed)
+            cache.set(cache_key, analysis)
+            return analysis
+        return self._fallback_analysis(resume_text, job_description)
+
+    def _request_analysis(self, resume_text: str, job_description: str, timeout: Optional[float] = None) -> Dict:
+        """Call the chat-completions endpoint and return the parsed JSON payload."""
+        response = self.session.post(
+            self.base_url,
+            json=self._build_payload(resume_text, job_description),
+            timeout=timeout or self.timeout,
+        )
+        response.raise_for_status()
+
+        return self._parse_json_response(self._extract_response_text(response.json()))
+
+    def stream_analysis(self, resume_text: str, job_description: str) -> Iterator[Tuple[str, object]]:
+        """Stream the AI analysis, yielding ``(field, value)`` as soon as each field is complete.
+
+        The final item is ``(STREAM_COMPLETE, analysis)`` carrying the normalized
+        result. Cached results, disabled AI, and failures yield every field of the
+        cached or fallback analysis at once before completing.
+        """
+        if not self.use_ai:
+            yield from self._replay_fields(self._fallback_analysis(resume_text, job_description))
+            return
+
+        cache = get_result_cache()
+        cache_key = make_key("ai_analysis", resume_text, job_description, self.model)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            yield from self._replay_fields(cached)
+            return
+
+        parser = IncrementalJSONFields()
+        fields = {}
+        try:
+            with self.session.post(
+                self.base_url,
+                json=self._build_payload(resume_text, job_description, stream=True),
+                timeout=self.timeout,
+                stream=True,
+            ) as response:
+                response.raise_for_status()
+                for delta in self._iter_stream_deltas(response):
+                    for field, value in parser.feed(delta):
+                        fields[field] = value
+                        yield field, value
+        except Exception as exc:
+            print(f"AI analysis stream failed: {exc}")
+
+        if not fields:
+            yield from self._replay_fields(self._fallback_analysis(resume_text, job_description))
+            return
+
+        analysis = self._normalize_ai_response(fields)
+        if parser.done:
+            cache.set(cache_key, analysis)
+        else:
+            # A truncated stream must not be mistaken for a complete analysis by downstream caches.
+            analysis["analysis_source"] = "partial"
+        yield STREAM_COMPLETE, analysis
+
+    def _replay_fields(self, analysis: Dict) -> Iterator[Tuple[str, object]]:
+        yield from analysis.items()
+        yield STREAM_COMPLETE, analysis
+
+    def _iter_stream_deltas(self, response) -> Iterator[str]:
+        """Yield the content deltas of a server-sent chat-completions stream."""
+        for line in response.iter_lines(decode_unicode=True):
+            if not line or not line.startswith("data:"):
+                continue
+            data = line[len("data:"):].strip()
+            if data == "[DONE]":
+                break
+            try:
+                chunk = json.loads(data)
+            except json.JSONDecodeError:
+                continue
+            choices = chunk.get("choices") or [{}]
+            content = (choices[0].get("delta") or {}).get("content")
+            if content:
+                yield content
+
+    def _build_payload(self, resume_text: str, job_description: str, stream: bool = False) -> Dict:
+        prompt = f"""
 You are an expert ATS resume reviewer and career coach.
 Return valid JSON only with no markdown fences or extra commentary.
 
@@ -66,44 +294,25 @@ Return JSON in this exact shape:
 }}
 """
 
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json",
-            }
-            payload = {
-                "model": self.model,
-                "messages": [
-                    {
-                        "role": "system",
-                        "content": "You are an expert ATS resume reviewer and career coach. Always return valid JSON only.",
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt,
-                    },
-                ],
-                "max_tokens": 900,
-                "temperature": 0.2,
-                "stream": False,
-            }
-
-            response = requests.post(
-                self.base_url,
-                headers=headers,
-                json=payload,
-                timeout=45,
-            )
-            response.raise_for_status()
-
-            result_text = self._extract_response_text(response.json())
-            parsed = self._parse_json_response(result_text)
-            if parsed:
-                return self._normalize_ai_response(parsed)
-            return self._fallback_analysis(resume_text, job_description)
-        except Exception as exc:
-            print(f"AI analysis failed: {exc}")
-            return self._fallback_analysis(resume_text, job_description)
+        payload = {
+            "model": self.model,
+            "messages": [
+                {
+                    "role": "system",
+                    "content": "You are an expert ATS resume reviewer and career coach. Always return valid JSON only.",
+                },
+                {
+                    "role": "user",
+                    "content": prompt,
+                },
+            ],
+            "max_tokens": 900,
+            "temperature": 0.2,
+            "stream": stream,
+        }
+        return payload
 
+    @traced("ai_fallback")
     def _fallback_analysis(self, resume_text: str, job_description: str) -> Dict:
         """Fallback analysis when AI is unavailable."""
         return {
@@ -126,37 +335,27 @@ Return JSON in this exact shape:
             "industry_alignment": "Industry fit could not be deeply evaluated without AI support.",
             "top_resume_highlights": ["Core resume parsing is active.", "Skills and ATS checks are available."],
             "interview_readiness": "65",
+            "analysis_source": "fallback",
         }
 
     def _extract_matching_skills(self, resume_text: str, job_description: str) -> List[str]:
         """Extract skills that appear in both resume and job description."""
-        common_skills = [
-            "python", "java", "javascript", "react", "node.js", "sql", "aws",
-            "docker", "kubernetes", "git", "machine learning", "data analysis",
-            "project management", "agile", "scrum", "leadership", "communication",
-        ]
-
-        resume_lower = resume_text.lower()
-        job_lower = job_description.lower()
-        return [skill for skill in common_skills if skill in resume_lower and skill in job_lower]
+        taxonomy = get_taxonomy()
+        resume_skills = _skills_found(resume_text)
+        job_skills = _skills_found(job_description)
+        return [skill for skill in taxonomy.skill_sets["fallback_matching"] if skill in resume_skills and skill in job_skills]
 
     def _extract_missing_skills(self, resume_text: str, job_description: str) -> List[str]:
         """Extract skills mentioned in job description but not in resume."""
-        common_skills = [
-            "python", "java", "javascript", "react", "node.js", "sql", "aws",
-            "docker", "kubernetes", "git", "machine learning", "data analysis",
-            "project management", "agile", "scrum", "leadership", "communication",
-            "tensorflow", "pytorch", "mongodb", "postgresql", "redis",
-        ]
-
-        resume_lower = resume_text.lower()
-        job_lower = job_description.lower()
-        return [skill for skill in common_skills if skill in job_lower and skill not in resume_lower]
+        taxonomy = get_taxonomy()
+        resume_skills = _skills_found(resume_text)
+        job_skills = _skills_found(job_description)
+        return [skill for skill in taxonomy.skill_sets["fallback_missing"] if skill in job_skills and skill not in resume_skills]
 
     def _find_keyword_gaps(self, resume_text: str, job_description: str) -> List[str]:
         """Find important keywords missing from the resume."""
-        job_words = re.findall(r"\b[a-zA-Z]{4,}\b", job_description.lower())
-        resume_words = re.findall(r"\b[a-zA-Z]{4,}\b", resume_text.lower())
+        job_words = _long_words(job_description)
+        resume_words = _long_words(resume_text)
         important_keywords = [
             "experience", "development", "management", "analysis", "design",
             "implementation", "optimization", "collaboration", "innovation",
@@ -230,10 +429,162 @@ Return JSON in this exact shape:
             value = merged.get(field)
             merged[field] = defaults.get(field, "") if value is None else str(value).strip()
 
+        merged["analysis_source"] = "ai"
         return merged
 
 
+_analyzer = None
+_analyzer_lock = threading.Lock()
+
+
+def get_analyzer() -> AIResumeAnalyzer:
+    """Return the process-wide analyzer and its pooled HTTP session."""
+    global _analyzer
+    if _analyzer is None:
+        with _analyzer_lock:
+            if _analyzer is None:
+                _analyzer = AIResumeAnalyzer()
+    return _analyzer
+
+
+def _skills_found(text) -> set:
+    """Every taxonomy skill in a text, memoised on the shared document for that text."""
+    taxonomy = get_taxonomy()
+    return get_document(text).feature(("skills_found", taxonomy.version), lambda doc: taxonomy.find(doc.text))
+
+
+def _long_words(text) -> set:
+    return get_document(text).feature("long_words", lambda doc: set(_LONG_WORD.findall(doc.lowered)))
+
+
 def get_ai_recommendations(resume_text: str, job_description: str) -> Dict:
     """Get AI-powered recommendations for resume improvement."""
-    analyzer = AIResumeAnalyzer()
-    return analyzer.analyze_with_ai(resume_text, job_description)
+    return get_analyzer().analyze_with_ai(resume_text, job_description)
+
+
+def get_ai_model_name() -> str:
+    """Name of the model behind AI recommendations, or ``"fallback"`` when AI is disabled."""
+    analyzer = get_analyzer()
+    return analyzer.model if analyzer.use_ai else "fallback"
+
+
+def get_fallback_recommendations(resume_text, job_description) -> Dict:
+    """Get the built-in, non-AI recommendations without calling the remote model.
+
+    Accepts texts or :class:`ResumeDocument` objects; documents reuse their memoised skill matches.
+    """
+    return get_analyzer()._fallback_analysis(resume_text, job_description)
+
+
+class _RateLimitGate:
+    """Spaces out request starts and pauses them after the server rate-limits us."""
+
+    def __init__(self, max_rate: Optional[float] = None):
+        import asyncio
+
+        self.interval = 1 / max_rate if max_rate else 0.0
+        self._next_start = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self):
+        import asyncio
+
+        async with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start)
+            self._next_start = start + self.interval
+        if start > now:
+            await asyncio.sleep(start - now)
+
+    def back_off(self, seconds: float):
+        self._next_start = max(self._next_start, time.monotonic() + seconds)
+
+
+def _retry_after_seconds(response, default: float = 1.0) -> float:
+    value = response.headers.get("Retry-After") if response is not None else None
+    if not value:
+        return default
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        try:
+            return max((parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds(), 0.0)
+        except (TypeError, ValueError):
+            return default
+
+
+async def analyze_many(
+    pairs: Iterable[Tuple[str, str]],
+    concurrency: int = 8,
+    request_timeout: Optional[float] = None,
+    deadline: Optional[float] = None,
+    max_rate: Optional[float] = None,
+    analyzer: Optional["AIResumeAnalyzer"] = None,
+) -> List[Dict]:
+    """Analyze many (resume, job description) pairs concurrently.
+
+    At most ``concurrency`` requests are in flight at once, and request starts
+    are spaced to stay under ``max_rate`` per second. ``request_timeout`` bounds
+    each call and ``deadline`` bounds the whole batch, both in seconds. When the
+    server answers 429, new requests pause for its ``Retry-After``. Any pair
+    that times out, misses the deadline, or fails degrades to the fallback
+    analysis. Results are returned in input order.
+    """
+    analyzer = analyzer or get_analyzer()
+    pairs = list(pairs)
+    if not analyzer.use_ai:
+        return [analyzer._fallback_analysis(resume_text, job_description) for resume_text, job_description in pairs]
+
+    import asyncio
+
+    from requests import HTTPError
+
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(concurrency)
+    gate = _RateLimitGate(max_rate)
+    request_timeout = request_timeout or analyzer.timeout
+    deadline_at = loop.time() + deadline if deadline else None
+    executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="ai-analysis")
+
+    def release_slot(call):
+        semaphore.release()
+        if not call.cancelled():
+            # Retrieve the outcome of abandoned calls so asyncio does not log it as unhandled.
+            call.exception()
+
+    async def analyze_one(resume_text: str, job_description: str) -> Dict:
+        # A slot is held until its worker thread is done, not just until wait_for gives
+        # up on it, so a pair's timeout only starts once a thread is free to run it.
+        await semaphore.acquire()
+        call = None
+        try:
+            await gate.wait()
+            timeout = request_timeout
+            if deadline_at is not None:
+                timeout = min(timeout, deadline_at - loop.time())
+            if timeout <= 0:
+                return analyzer._fallback_analysis(resume_text, job_description)
+
+            # The HTTP request gets the same timeout, so an abandoned call frees its thread soon after.
+            call = loop.run_in_executor(executor, analyzer._analyze_or_raise, resume_text, job_description, timeout)
+            call.add_done_callback(release_slot)
+            try:
+                return await asyncio.wait_for(asyncio.shield(call), timeout)
+            except asyncio.TimeoutError:
+                print(f"AI analysis timed out after {timeout:.1f}s")
+            except HTTPError as exc:
+                if exc.response is not None and exc.response.status_code == 429:
+                    gate.back_off(_retry_after_seconds(exc.response))
+                print(f"AI analysis failed: {exc}")
+            except Exception as exc:
+                print(f"AI analysis failed: {exc}")
+            return analyzer._fallback_analysis(resume_text, job_description)
+        finally:
+            if call is None:
+                semaphore.release()
+
+    try:
+        return await asyncio.gather(*(analyze_one(resume_text, job_description) for resume_text, job_description in pairs))
+    finally:
+        # Timed-out calls keep their worker thread until the HTTP timeout fires; don't block on them.
+        executor.shutdown(wait=False)
@@ -1,17 +1,319 @@
+import io
+
 import streamlit as st
 
 from parser import extract_text_from_pdf, extract_text_from_txt
-from scorer import generate_detailed_feedback, generate_suggestions, score_resume
+from ai_analyzer import STREAM_COMPLETE
+from doc_store import content_hash
+from scorer import generate_detailed_feedback, generate_suggestions, score_resume_streaming
 
 st.set_page_config(page_title="AI Resume Analyzer", page_icon="📄", layout="wide")
 
+LIVE_AI_FIELDS = {
+    "overall_assessment": "🤖 Assessment",
+    "role_fit_summary": "🎯 Role Fit",
+    "matching_skills": "✅ Matching Skills",
+    "missing_critical_skills": "❌ Critical Missing Skills",
+    "strengths": "💪 Strengths",
+    "weaknesses": "⚠️ Weaknesses",
+    "specific_improvements": "🔧 Improvements",
+}
+
+# Analyses kept per browser session, so switching back to an earlier resume or job description is instant.
+SESSION_ANALYSES = 8
+
+
+@st.cache_resource(show_spinner=False)
+def load_analyzer():
+    """One analyzer, with its pooled HTTP session, per server process rather than per rerun."""
+    from ai_analyzer import get_analyzer
+
+    return get_analyzer()
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def parse_resume(data: bytes, file_type: str) -> str:
+    """Resume text, cached on the uploaded file's bytes."""
+    if file_type == "application/pdf":
+        return extract_text_from_pdf(io.BytesIO(data))
+    return extract_text_from_txt(io.BytesIO(data))
+
+
+def analysis_key(resume_bytes, job_text):
+    return f"{content_hash(resume_bytes)}:{content_hash(job_text)}"
+
+
+def run_analysis(resume_text, job_text):
+    """Score the resume, showing AI fields as they stream in."""
+    live_panel = st.empty()
+    live_fields = {}
+    for field, value in score_resume_streaming(resume_text, job_text):
+        if field == STREAM_COMPLETE:
+            score_data = value
+        elif field in LIVE_AI_FIELDS:
+            live_fields[field] = value
+            render_live_ai_fields(live_panel, live_fields)
+    live_panel.empty()
+    return {
+        "score_data": score_data,
+        "suggestions": generate_suggestions(score_data),
+        "detailed_feedback": generate_detailed_feedback(score_data),
+    }
+
+
+def remember_analysis(key, analysis):
+    analyses = st.session_state.setdefault("analyses", {})
+    analyses.pop(key, None)
+    analyses[key] = analysis
+    while len(analyses) > SESSION_ANALYSES:
+        analyses.pop(next(iter(analyses)))
+    st.session_state["current_analysis"] = key
+
+
+def render_live_ai_fields(placeholder, fields):
+    """Show the AI fields received so far while the analysis is still streaming."""
+    with placeholder.container():
+        st.subheader("🤖 AI Insights (live)")
+        for field, label in LIVE_AI_FIELDS.items():
+            if field in fields:
+                value = fields[field]
+                if isinstance(value, list):
+                    value = ", ".join(str(item) for item in value)
+                st.markdown(f"**{label}:** {value}")
+
+
+def render_analysis(analysis):
+    """Draw a stored analysis; pure rendering, so reruns never recompute it."""
+    score_data = analysis["score_data"]
+    suggestions = analysis["suggestions"]
+    detailed_feedback = analysis["detailed_feedback"]
+    ai_analysis = score_data.get("ai_analysis", {})
+
+    if ai_analysis.get("overall_assessment"):
+        st.info(f"🤖 **AI Assessment:** {ai_analysis['overall_assessment']}")
+
+    st.subheader("📊 Overall Assessment")
+    row1 = st.columns(5)
+    metrics_row1 = [
+        ("Overall Score", f"{score_data['overall_score']}%"),
+        ("Content Match", f"{score_data['similarity_score']}%"),
+        ("Skill Match", f"{score_data['skill_match_score']}%"),
+        ("Experience Match", f"{score_data['experience_match']}%"),
+        ("ATS Score", f"{score_data['ats_score']}%"),
+    ]
+    for column, (label, value) in zip(row1, metrics_row1):
+        with column:
+            st.metric(label, value)
+
+    row2 = st.columns(5)
+    metrics_row2 = [
+        ("Keyword Coverage", f"{score_data['keyword_coverage_score']}%"),
+        ("Contact Completeness", f"{score_data['contact_score']}%"),
+        ("Interview Readiness", f"{score_data['interview_readiness']}%"),
+        ("Leadership Signal", f"{score_data['leadership_score']}%"),
+        ("Quantified Wins", score_data["quantified_achievement_count"]),
+    ]
+    for column, (label, value) in zip(row2, metrics_row2):
+        with column:
+            st.metric(label, value)
+
+    tab1, tab2, tab3, tab4, tab5, tab6, tab7 = st.tabs([
+        "🎯 Skills Analysis",
+        "🔑 Keywords",
+        "📝 Sections",
+        "📈 Impact Signals",
+        "🤖 AI Insights",
+        "💡 Suggestions",
+        "📋 Action Plan",
+    ])
+
+    with tab1:
+        st.subheader("Comprehensive Skills Analysis")
+        total_skills = len(score_data["matching_skills"]) + len(score_data["missing_skills"])
+        skill_match_pct = len(score_data["matching_skills"]) / max(total_skills, 1) * 100
+        st.progress(skill_match_pct / 100)
+        st.write(f"**Skills Match: {skill_match_pct:.1f}%** ({len(score_data['matching_skills'])} of {max(total_skills, 1)} required skills)")
+
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.write("**✅ Matching Skills**")
+            if score_data["matching_skills"]:
+                for skill in score_data["matching_skills"]:
+                    st.success(f"✓ {skill.title()}")
+            else:
+                st.info("No matching skills found")
+
+        with col2:
+            st.write("**❌ Critical Missing Skills**")
+            critical_missing = ai_analysis.get("missing_critical_skills", [])
+            if critical_missing:
+                for skill in critical_missing[:6]:
+                    st.error(f"✗ {skill.title()} (Critical)")
+            other_missing = [skill for skill in score_data["missing_skills"] if skill not in critical_missing][:4]
+            for skill in other_missing:
+                st.warning(f"✗ {skill.title()}")
+            if not critical_missing and not other_missing:
+                st.success("All required skills present")
+
+        with col3:
+            st.write("**📊 Your Current Skills**")
+            if score_data["resume_skills"]:
+                for skill in score_data["resume_skills"][:8]:
+                    if skill in score_data["matching_skills"]:
+                        st.success(f"✓ {skill.title()} (Matches job)")
+                    else:
+                        st.info(f"• {skill.title()}")
+            else:
+                st.warning("No skills detected")
+
+        nice_to_have = ai_analysis.get("missing_nice_to_have_skills", [])
+        if nice_to_have:
+            st.write("**💡 Nice-to-Have Skills**")
+            for skill in nice_to_have[:6]:
+                st.info(f"+ {skill.title()}")
+
+    with tab2:
+        st.subheader("Keyword Analysis")
+        col1, col2 = st.columns(2)
+
+        with col1:
+            st.write("**🎯 Job Keywords**")
+            for keyword in score_data["job_keywords"][:10]:
+                if keyword in score_data["matching_keywords"]:
+                    st.success(f"✓ {keyword}")
+                else:
+                    st.error(f"✗ {keyword}")
+
+        with col2:
+            st.write("**📝 Missing Keywords to Add**")
+            if score_data["missing_keywords"]:
+                for keyword in score_data["missing_keywords"][:8]:
+                    st.warning(f"+ {keyword}")
+            else:
+                st.success("Great keyword coverage")
+
+    with tab3:
+        st.subheader("Resume Structure Analysis")
+        col1, col2 = st.columns(2)
+        with col1:
+            st.write("**✅ Present Sections**")
+            for section in score_data["found_sections"]:
+                st.success(f"✓ {section.title()}")
+
+        with col2:
+            st.write("**❌ Missing Sections**")
+            if score_data["missing_sections"]:
+                for section in score_data["missing_sections"]:
+                    st.error(f"✗ {section.title()}")
+            else:
+                st.success("All key sections present")
+
+        if score_data["weak_words"]:
+            st.write("**🔄 Words to Strengthen**")
+            for weak, strong in score_data["weak_words"][:5]:
+                st.warning(f"Replace '{weak}' -> '{strong}'")
+
+    with tab4:
+        st.subheader("Impact and Readiness Signals")
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.write("**📊 Achievement Strength**")
+            st.info(f"Quantified achievements found: {score_data['quantified_achievement_count']}")
+            st.info(f"Estimated experience referenced: {score_data['estimated_experience_years']} years")
+        with col2:
+            st.write("**🤝 Professional Signals**")
+            st.success(f"Leadership: {score_data['leadership_score']}%")
+            st.success(f"Collaboration: {score_data['collaboration_score']}%")
+            st.success(f"Project Depth: {score_data['project_score']}%")
+        with col3:
+            st.write("**📇 Contact Completeness**")
+            for label, present in score_data["contact_details"].items():
+                if present:
+                    st.success(f"✓ {label.title()}")
+                else:
+                    st.error(f"✗ {label.title()}")
+
+    with tab5:
+        st.subheader("🤖 AI-Powered Insights")
+        col1, col2 = st.columns(2)
+
+        with col1:
+            st.write("**💪 AI-Detected Strengths**")
+            for strength in ai_analysis.get("strengths", []):
+                st.success(f"✓ {strength}")
+
+            st.write("**🎯 Specific Improvements**")
+            for improvement in ai_analysis.get("specific_improvements", []):
+                st.warning(f"🔧 {improvement}")
+
+        with col2:
+            st.write("**⚠️ AI-Detected Weaknesses**")
+            for weakness in ai_analysis.get("weaknesses", []):
+                st.error(f"✗ {weakness}")
+
+            st.write("**📝 ATS Recommendations**")
+            for rec in ai_analysis.get("ats_recommendations", []):
+                st.info(f"📝 {rec}")
+
+        st.write("**💪 Recommended Action Verbs**")
+        action_verbs = ai_analysis.get("action_verbs_to_use", [])
+        if action_verbs:
+            for verb in action_verbs[:8]:
+                st.success(f"• {verb}")
+
+        quantifiable = ai_analysis.get("quantifiable_achievements", "")
+        if quantifiable:
+            st.info(f"📊 **Quantifiable Achievements:** {quantifiable}")
+
+        if ai_analysis.get("role_fit_summary"):
+            st.write("**🎯 Role Fit Summary**")
+            st.info(ai_analysis["role_fit_summary"])
+
+        col1, col2 = st.columns(2)
+        with col1:
+            st.write(f"**Seniority Alignment:** {ai_analysis.get('seniority_alignment', 'mixed')}")
+        with col2:
+            st.write(f"**Industry Alignment:** {ai_analysis.get('industry_alignment', 'General')}")
+
+        top_highlights = ai_analysis.get("top_resume_highlights", [])
+        if top_highlights:
+            st.write("**🌟 Top Resume Highlights**")
+            for item in top_highlights:
+                st.success(f"• {item}")
+
+    with tab6:
+        st.subheader("Prioritized Suggestions")
+        for suggestion in suggestions["critical"]:
+            st.error(f"🚨 {suggestion}")
+        for suggestion in suggestions["important"]:
+            st.warning(f"⚠️ {suggestion}")
+        for suggestion in suggestions["optional"]:
+            st.info(f"💡 {suggestion}")
+
+    with tab7:
+        st.subheader("Action Plan")
+        col1, col2 = st.columns(2)
+        with col1:
+            st.write("**➕ Content to Add**")
+            for addition in ai_analysis.get("content_to_add", detailed_feedback["additions"]):
+                st.success(f"+ {addition}")
+            st.write("**💪 Strengths to Highlight**")
+            for strength in detailed_feedback["strengths"]:
+                st.info(f"✓ {strength}")
+        with col2:
+            st.write("**➖ Content to Remove or Improve**")
+            for removal in ai_analysis.get("content_to_remove", detailed_feedback["removals"]):
+                st.warning(f"- {removal}")
+            st.write("**🔧 Areas for Improvement**")
+            for improvement in detailed_feedback["improvements"]:
+                st.error(f"🔧 {improvement}")
+
+
 st.title("📄 AI-Powered Resume Analyzer")
 st.markdown("Get richer ATS, skills, impact, and AI-backed resume feedback in one place.")
 
 try:
-    from ai_analyzer import AIResumeAnalyzer
-
-    analyzer = AIResumeAnalyzer()
+    analyzer = load_analyzer()
     if analyzer.use_ai:
         st.success(f"🤖 Hugging Face AI Analysis: Enabled ({analyzer.model})")
     else:
@@ -21,15 +323,15 @@ except Exception:
 
 col1, col2 = st.columns(2)
 
+resume_text = None
+resume_bytes = None
 with col1:
     st.header("📋 Resume")
     resume_file = st.file_uploader("Upload Resume", type=["pdf", "txt"])
 
     if resume_file:
-        if resume_file.type == "application/pdf":
-            resume_text = extract_text_from_pdf(resume_file)
-        else:
-            resume_text = extract_text_from_txt(resume_file)
+        resume_bytes = resume_file.getvalue()
+        resume_text = parse_resume(resume_bytes, resume_file.type)
 
         st.text_area("Resume Content Preview", resume_text[:500] + "...", height=200)
 
@@ -37,241 +339,27 @@ with col2:
     st.header("💼 Job Description")
     job_text = st.text_area("Paste Job Description", height=200, placeholder="Paste the complete job description here...")
 
+current_key = analysis_key(resume_bytes, job_text) if resume_file and job_text else None
+analyses = st.session_state.setdefault("analyses", {})
+
 if st.button("🔍 Analyze Resume", type="primary"):
     if resume_file and job_text:
-        with st.spinner("Performing comprehensive analysis..."):
-            if resume_file.type == "application/pdf":
-                resume_text = extract_text_from_pdf(resume_file)
-            else:
-                resume_text = extract_text_from_txt(resume_file)
-
-            score_data = score_resume(resume_text, job_text)
-            suggestions = generate_suggestions(score_data)
-            detailed_feedback = generate_detailed_feedback(score_data)
-            ai_analysis = score_data.get("ai_analysis", {})
-
+        if current_key not in analyses:
+            with st.spinner("Performing comprehensive analysis..."):
+                remember_analysis(current_key, run_analysis(resume_text, job_text))
             st.success("✅ Analysis Complete!")
+        st.session_state["current_analysis"] = current_key
 
-            if ai_analysis.get("overall_assessment"):
-                st.info(f"🤖 **AI Assessment:** {ai_analysis['overall_assessment']}")
-
-            st.subheader("📊 Overall Assessment")
-            row1 = st.columns(5)
-            metrics_row1 = [
-                ("Overall Score", f"{score_data['overall_score']}%"),
-                ("Content Match", f"{score_data['similarity_score']}%"),
-                ("Skill Match", f"{score_data['skill_match_score']}%"),
-                ("Experience Match", f"{score_data['experience_match']}%"),
-                ("ATS Score", f"{score_data['ats_score']}%"),
-            ]
-            for column, (label, value) in zip(row1, metrics_row1):
-                with column:
-                    st.metric(label, value)
-
-            row2 = st.columns(5)
-            metrics_row2 = [
-                ("Keyword Coverage", f"{score_data['keyword_coverage_score']}%"),
-                ("Contact Completeness", f"{score_data['contact_score']}%"),
-                ("Interview Readiness", f"{score_data['interview_readiness']}%"),
-                ("Leadership Signal", f"{score_data['leadership_score']}%"),
-                ("Quantified Wins", score_data["quantified_achievement_count"]),
-            ]
-            for column, (label, value) in zip(row2, metrics_row2):
-                with column:
-                    st.metric(label, value)
-
-            tab1, tab2, tab3, tab4, tab5, tab6, tab7 = st.tabs([
-                "🎯 Skills Analysis",
-                "🔑 Keywords",
-                "📝 Sections",
-                "📈 Impact Signals",
-                "🤖 AI Insights",
-                "💡 Suggestions",
-                "📋 Action Plan",
-            ])
-
-            with tab1:
-                st.subheader("Comprehensive Skills Analysis")
-                total_skills = len(score_data["matching_skills"]) + len(score_data["missing_skills"])
-                skill_match_pct = len(score_data["matching_skills"]) / max(total_skills, 1) * 100
-                st.progress(skill_match_pct / 100)
-                st.write(f"**Skills Match: {skill_match_pct:.1f}%** ({len(score_data['matching_skills'])} of {max(total_skills, 1)} required skills)")
-
-                col1, col2, col3 = st.columns(3)
-                with col1:
-                    st.write("**✅ Matching Skills**")
-                    if score_data["matching_skills"]:
-                        for skill in score_data["matching_skills"]:
-                            st.success(f"✓ {skill.title()}")
-                    else:
-                        st.info("No matching skills found")
-
-                with col2:
-                    st.write("**❌ Critical Missing Skills**")
-                    critical_missing = ai_analysis.get("missing_critical_skills", [])
-                    if critical_missing:
-                        for skill in critical_missing[:6]:
-                            st.error(f"✗ {skill.title()} (Critical)")
-                    other_missing = [skill for skill in score_data["missing_skills"] if skill not in critical_missing][:4]
-                    for skill in other_missing:
-                        st.warning(f"✗ {skill.title()}")
-                    if not critical_missing and not other_missing:
-                        st.success("All required skills present")
-
-                with col3:
-                    st.write("**📊 Your Current Skills**")
-                    if score_data["resume_skills"]:
-                        for skill in score_data["resume_skills"][:8]:
-                            if skill in score_data["matching_skills"]:
-                                st.success(f"✓ {skill.title()} (Matches job)")
-                            else:
-                                st.info(f"• {skill.title()}")
-                    else:
-                        st.warning("No skills detected")
-
-                nice_to_have = ai_analysis.get("missing_nice_to_have_skills", [])
-                if nice_to_have:
-                    st.write("**💡 Nice-to-Have Skills**")
-                    for skill in nice_to_have[:6]:
-                        st.info(f"+ {skill.title()}")
-
-            with tab2:
-                st.subheader("Keyword Analysis")
-                col1, col2 = st.columns(2)
-
-                with col1:
-                    st.write("**🎯 Job Keywords**")
-                    for keyword in score_data["job_keywords"][:10]:
-                        if keyword in score_data["matching_keywords"]:
-                            st.success(f"✓ {keyword}")
-                        else:
-                            st.error(f"✗ {keyword}")
-
-                with col2:
-                    st.write("**📝 Missing Keywords to Add**")
-                    if score_data["missing_keywords"]:
-                        for keyword in score_data["missing_keywords"][:8]:
-                            st.warning(f"+ {keyword}")
-                    else:
-                        st.success("Great keyword coverage")
-
-            with tab3:
-                st.subheader("Resume Structure Analysis")
-                col1, col2 = st.columns(2)
-                with col1:
-                    st.write("**✅ Present Sections**")
-                    for section in score_data["found_sections"]:
-                        st.success(f"✓ {section.title()}")
-
-                with col2:
-                    st.write("**❌ Missing Sections**")
-                    if score_data["missing_sections"]:
-                        for section in score_data["missing_sections"]:
-                            st.error(f"✗ {section.title()}")
-                    else:
-                        st.success("All key sections present")
-
-                if score_data["weak_words"]:
-                    st.write("**🔄 Words to Strengthen**")
-                    for weak, strong in score_data["weak_words"][:5]:
-                        st.warning(f"Replace '{weak}' -> '{strong}'")
-
-            with tab4:
-                st.subheader("Impact and Readiness Signals")
-                col1, col2, col3 = st.columns(3)
-                with col1:
-                    st.write("**📊 Achievement Strength**")
-                    st.info(f"Quantified achievements found: {score_data['quantified_achievement_count']}")
-                    st.info(f"Estimated experience referenced: {score_data['estimated_experience_years']} years")
-                with col2:
-                    st.write("**🤝 Professional Signals**")
-                    st.success(f"Leadership: {score_data['leadership_score']}%")
-                    st.success(f"Collaboration: {score_data['collaboration_score']}%")
-                    st.success(f"Project Depth: {score_data['project_score']}%")
-                with col3:
-                    st.write("**📇 Contact Completeness**")
-                    for label, present in score_data["contact_details"].items():
-                        if present:
-                            st.success(f"✓ {label.title()}")
-                        else:
-                            st.error(f"✗ {label.title()}")
-
-            with tab5:
-                st.subheader("🤖 AI-Powered Insights")
-                col1, col2 = st.columns(2)
-
-                with col1:
-                    st.write("**💪 AI-Detected Strengths**")
-                    for strength in ai_analysis.get("strengths", []):
-                        st.success(f"✓ {strength}")
-
-                    st.write("**🎯 Specific Improvements**")
-                    for improvement in ai_analysis.get("specific_improvements", []):
-                        st.warning(f"🔧 {improvement}")
-
-                with col2:
-                    st.write("**⚠️ AI-Detected Weaknesses**")
-                    for weakness in ai_analysis.get("weaknesses", []):
-                        st.error(f"✗ {weakness}")
-
-                    st.write("**📝 ATS Recommendations**")
-                    for rec in ai_analysis.get("ats_recommendations", []):
-                        st.info(f"📝 {rec}")
-
-                st.write("**💪 Recommended Action Verbs**")
-                action_verbs = ai_analysis.get("action_verbs_to_use", [])
-                if action_verbs:
-                    for verb in action_verbs[:8]:
-                        st.success(f"• {verb}")
-
-                quantifiable = ai_analysis.get("quantifiable_achievements", "")
-                if quantifiable:
-                    st.info(f"📊 **Quantifiable Achievements:** {quantifiable}")
-
-                if ai_analysis.get("role_fit_summary"):
-                    st.write("**🎯 Role Fit Summary**")
-                    st.info(ai_analysis["role_fit_summary"])
-
-                col1, col2 = st.columns(2)
-                with col1:
-                    st.write(f"**Seniority Alignment:** {ai_analysis.get('seniority_alignment', 'mixed')}")
-                with col2:
-                    st.write(f"**Industry Alignment:** {ai_analysis.get('industry_alignment', 'General')}")
-
-                top_highlights = ai_analysis.get("top_resume_highlights", [])
-                if top_highlights:
-                    st.write("**🌟 Top Resume Highlights**")
-                    for item in top_highlights:
-                        st.success(f"• {item}")
-
-            with tab6:
-                st.subheader("Prioritized Suggestions")
-                for suggestion in suggestions["critical"]:
-                    st.error(f"🚨 {suggestion}")
-                for suggestion in suggestions["important"]:
-                    st.warning(f"⚠️ {suggestion}")
-                for suggestion in suggestions["optional"]:
-                    st.info(f"💡 {suggestion}")
-
-            with tab7:
-                st.subheader("Action Plan")
-                col1, col2 = st.columns(2)
-                with col1:
-                    st.write("**➕ Content to Add**")
-                    for addition in ai_analysis.get("content_to_add", detailed_feedback["additions"]):
-                        st.success(f"+ {addition}")
-                    st.write("**💪 Strengths to Highlight**")
-                    for strength in detailed_feedback["strengths"]:
-                        st.info(f"✓ {strength}")
-                with col2:
-                    st.write("**➖ Content to Remove or Improve**")
-                    for removal in ai_analysis.get("content_to_remove", detailed_feedback["removals"]):
-                        st.warning(f"- {removal}")
-                    st.write("**🔧 Areas for Improvement**")
-                    for improvement in detailed_feedback["improvements"]:
-                        st.error(f"🔧 {improvement}")
     else:
         st.error("⚠️ Please upload a resume and enter a job description to begin analysis!")
+elif current_key in analyses:
+    st.session_state["current_analysis"] = current_key
+
+shown_key = st.session_state.get("current_analysis")
+if shown_key in analyses:
+    if shown_key != current_key:
+        st.info("The resume or job description changed since this analysis. Click Analyze to update it.")
+    render_analysis(analyses[shown_key])
 
 st.markdown("---")
 st.markdown("**💡 Pro Tips:**")
@@ -0,0 +1,95 @@
+import re
+from functools import lru_cache
+from typing import Callable, List, Optional, Sequence
+
+OPERATORS = frozenset(["AND", "OR", "NOT"])
+
+
+@lru_cache(maxsize=None)
+def _token_pattern(symbols):
+    alternatives = [r"\(", r"\)", r'"[^"]*"']
+    # Longest symbols first, so ">=" is not read as ">" followed by "=".
+    alternatives += [re.escape(symbol) for symbol in sorted(symbols, key=len, reverse=True)]
+    symbol_chars = "".join(sorted(set("".join(symbols))))
+    alternatives.append(r'[^\s()"' + re.escape(symbol_chars) + "]+")
+    return re.compile("|".join(alternatives))
+
+
+def tokenize(query: str, symbols: Sequence[str] = ()) -> List[str]:
+    """Split a query into parentheses, quoted phrases, the given ``symbols`` and bare words."""
+    return _token_pattern(tuple(symbols)).findall(query)
+
+
+def is_operand(token: Optional[str]) -> bool:
+    """Whether ``token`` can be a term or a term's argument, i.e. is not an operator or parenthesis."""
+    return token is not None and token not in OPERATORS and token not in ("(", ")")
+
+
+class TokenStream:
+    """Cursor over a query's tokens, handed to leaf parsers so they can read their arguments."""
+
+    def __init__(self, tokens: List[str]):
+        self.tokens = tokens
+        self.position = 0
+
+    def peek(self, offset: int = 0) -> Optional[str]:
+        index = self.position + offset
+        return self.tokens[index] if index < len(self.tokens) else None
+
+    def take(self) -> str:
+        self.position += 1
+        return self.tokens[self.position - 1]
+
+
+def parse_boolean(query: str, parse_leaf: Callable[[str, TokenStream], tuple], symbols: Sequence[str] = (), kind: str = "query"):
+    """Parse a boolean ``query`` into a tree.
+
+    ``AND``, ``OR`` and ``NOT`` must be upper case; adjacent terms are ANDed and
+    parentheses group. Every other token starts a leaf: ``parse_leaf(token, stream)``
+    returns its node, taking any arguments it needs from ``stream``. Operator nodes
+    are ``("and", a, b)``, ``("or", a, b)`` and ``("not", a)``. ``kind`` names the
+    query in error messages.
+    """
+    stream = TokenStream(tokenize(query, symbols))
+    peek, take = stream.peek, stream.take
+
+    def parse_or():
+        node = parse_and()
+        while peek() == "OR":
+            take()
+            node = ("or", node, parse_and())
+        return node
+
+    def parse_and():
+        node = parse_not()
+        while peek() is not None and peek() not in ("OR", ")"):
+            if peek() == "AND":
+                take()
+            node = ("and", node, parse_not())
+        return node
+
+    def parse_not():
+        if peek() == "NOT":
+            take()
+            return ("not", parse_not())
+        return parse_atom()
+
+    def parse_atom():
+        token = peek()
+        if token is None or token in OPERATORS or token == ")":
+            raise ValueError(f"Expected a term in {kind} {query!r}")
+        take()
+        if token == "(":
+            node = parse_or()
+            if peek() != ")":
+                raise ValueError(f"Unbalanced parentheses in {kind} {query!r}")
+            take()
+            return node
+        return parse_leaf(token, stream)
+
+    if not stream.tokens:
+        raise ValueError(f"Empty {kind}")
+    tree = parse_or()
+    if peek() is not None:
+        raise ValueError(f"Unexpected {peek()!r} in {kind} {query!r}")
+    return tree
@@ -0,0 +1,298 @@
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+import tarfile
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from parser import read_pdf_text
+
+RESUME_EXTENSIONS = (".pdf", ".txt")
+
+SUMMARY_FIELDS = [
+    "file",
+    "overall_score",
+    "similarity_score",
+    "skill_match_score",
+    "ats_score",
+    "experience_match",
+    "interview_readiness",
+    "keyword_coverage_score",
+    "contact_score",
+    "quantified_achievement_count",
+    "estimated_experience_years",
+    "leadership_score",
+    "collaboration_score",
+    "project_score",
+    "matching_skills",
+    "missing_skills",
+    "missing_sections",
+    "error",
+]
+
+
+def iter_resume_files(path):
+    """Yield ``(name, bytes)`` for each PDF/TXT resume in a directory, zip, or tar archive, one at a time."""
+    if os.path.isdir(path):
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for name in sorted(files):
+                if name.lower().endswith(RESUME_EXTENSIONS):
+                    full_path = os.path.join(root, name)
+                    with open(full_path, "rb") as handle:
+                        yield os.path.relpath(full_path, path), handle.read()
+    elif zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as archive:
+            for info in archive.infolist():
+                if not info.is_dir() and info.filename.lower().endswith(RESUME_EXTENSIONS):
+                    yield info.filename, archive.read(info)
+    elif tarfile.is_tarfile(path):
+        # Stream mode reads members sequentially without building an index of the archive.
+        with tarfile.open(path, "r|*") as archive:
+            for member in archive:
+                if member.isfile() and member.name.lower().endswith(RESUME_EXTENSIONS):
+                    yield member.name, archive.extractfile(member).read()
+    else:
+        raise ValueError(f"{path} is not a directory, zip, or tar archive")
+
+
+def read_text(name, data, max_chars=None):
+    if name.lower().endswith(".pdf"):
+        return read_pdf_text(io.BytesIO(data), max_chars=max_chars)
+    text = data.decode("utf-8", errors="ignore")
+    return text[:max_chars] if max_chars is not None else text
+
+
+def iter_resume_texts(path, max_chars=None):
+    """Yield ``(name, text)`` for each resume :func:`iter_resume_files` finds, skipping unreadable files.
+
+    A file that cannot be read, such as a corrupt PDF, is reported on stderr and skipped.
+    """
+    for name, data in iter_resume_files(path):
+        try:
+            text = read_text(name, data, max_chars)
+        except Exception as exc:
+            print(f"Skipping {name}: {type(exc).__name__}: {exc}", file=sys.stderr)
+            continue
+        yield name, text
+
+
+_job_text = None
+_use_ai = False
+_max_chars = None
+
+
+def _init_worker(job_text, use_ai, max_chars):
+    global _job_text, _use_ai, _max_chars
+    _job_text = job_text
+    _use_ai = use_ai
+    _max_chars = max_chars
+
+
+def _score_file(name, data):
+    from ai_analyzer import get_fallback_recommendations
+    from scorer import score_resume
+
+    try:
+        resume_text = read_text(name, data, _max_chars)
+        ai_analysis = None if _use_ai else get_fallback_recommendations(resume_text, _job_text)
+        return {"file": name, **score_resume(resume_text, _job_text, ai_analysis=ai_analysis)}
+    except Exception as exc:
+        return {"file": name, "error": f"{type(exc).__name__}: {exc}"}
+
+
+class JsonlWriter:
+    def __init__(self, path):
+        self._handle = open(path, "a", encoding="utf-8")
+
+    def write(self, record):
+        self._handle.write(json.dumps(record) + "\n")
+
+    def commit(self):
+        self._handle.flush()
+        return True
+
+    def close(self):
+        self._handle.close()
+
+
+class CsvWriter:
+    def __init__(self, path):
+        write_header = not os.path.exists(path) or os.path.getsize(path) == 0
+        self._handle = open(path, "a", encoding="utf-8", newline="")
+        self._writer = csv.DictWriter(self._handle, fieldnames=SUMMARY_FIELDS, extrasaction="ignore")
+        if write_header:
+            self._writer.writeheader()
+
+    def write(self, record):
+        self._writer.writerow(_summary_row(record))
+
+    def commit(self):
+        self._handle.flush()
+        return True
+
+    def close(self):
+        self._handle.close()
+
+
+class ParquetWriter:
+    """Writes numbered part files into a directory, buffering at most ``rows_per_part`` rows."""
+
+    def __init__(self, path, rows_per_part=5000):
+        self._directory = path
+        self._rows_per_part = rows_per_part
+        self._rows = []
+        os.makedirs(path, exist_ok=True)
+        self._part = len([name for name in os.listdir(path) if name.endswith(".parquet")])
+
+    def write(self, record):
+        self._rows.append(_summary_row(record))
+
+    def commit(self):
+        """Write a part file once enough rows are buffered; report whether every row is on disk."""
+        if len(self._rows) >= self._rows_per_part:
+            self._flush()
+        return not self._rows
+
+    def _flush(self):
+        if not self._rows:
+            return
+        import pandas as pd
+
+        frame = pd.DataFrame(self._rows, columns=SUMMARY_FIELDS)
+        frame.to_parquet(os.path.join(self._directory, f"part-{self._part:05d}.parquet"), index=False)
+        self._part += 1
+        self._rows = []
+
+    def close(self):
+        self._flush()
+
+
+WRITERS = {"jsonl": JsonlWriter, "csv": CsvWriter, "parquet": ParquetWriter}
+
+
+def _summary_row(record):
+    row = {}
+    for field in SUMMARY_FIELDS:
+        value = record.get(field)
+        row[field] = json.dumps(value) if isinstance(value, (list, dict)) else value
+    return row
+
+
+def _load_checkpoint(path):
+    if not os.path.exists(path):
+        return set()
+    with open(path, encoding="utf-8") as handle:
+        return {line.rstrip("\n") for line in handle if line.strip()}
+
+
+def run(input_path, job_text, output_path, output_format, workers, use_ai=False, checkpoint_path=None, max_chars=None, max_in_flight=None):
+    """Score every resume under ``input_path`` and append results to ``output_path`` as they finish.
+
+    Files listed in the checkpoint are skipped, so an interrupted run resumes where it stopped.
+    Files that cannot be read or scored get a row with an ``error`` field and stay
+    out of the checkpoint, so a rerun tries them again. Their names go to
+    ``<checkpoint>.errors``, so a file that fails again is not reported twice; one
+    that is scored on a rerun gets a second row, which supersedes the error row.
+    At most ``max_in_flight`` files are held in memory at once, whatever the corpus size.
+    """
+    checkpoint_path = checkpoint_path or f"{output_path}.checkpoint"
+    errors_path = f"{checkpoint_path}.errors"
+    done = _load_checkpoint(checkpoint_path)
+    reported = _load_checkpoint(errors_path)
+    writer = WRITERS[output_format](output_path)
+    max_in_flight = max_in_flight or workers * 4
+    scored = 0
+
+    in_flight = {}
+    uncommitted = []
+    uncommitted_errors = []
+
+    with open(checkpoint_path, "a", encoding="utf-8") as checkpoint, open(
+        errors_path, "a", encoding="utf-8"
+    ) as failures, ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(job_text, use_ai, max_chars)
+    ) as executor:
+        def checkpoint_names():
+            # Names are only checkpointed once their results are durably written.
+            checkpoint.writelines(name + "\n" for name in uncommitted)
+            checkpoint.flush()
+            uncommitted.clear()
+            failures.writelines(name + "\n" for name in uncommitted_errors)
+            failures.flush()
+            uncommitted_errors.clear()
+
+        def drain():
+            nonlocal scored
+            finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in finished:
+                record = future.result()
+                name = in_flight.pop(future)
+                # Failed files are reported once but never checkpointed, so every run retries them.
+                if "error" in record:
+                    if name not in reported:
+                        writer.write(record)
+                        reported.add(name)
+                        uncommitted_errors.append(name)
+                    continue
+                writer.write(record)
+                uncommitted.append(name)
+                scored += 1
+            if writer.commit():
+                checkpoint_names()
+
+        try:
+            for name, data in iter_resume_files(input_path):
+                if name in done:
+                    continue
+                in_flight[executor.submit(_score_file, name, data)] = name
+                if len(in_flight) >= max_in_flight:
+                    drain()
+            while in_flight:
+                drain()
+        finally:
+            writer.close()
+            checkpoint_names()
+
+    return scored
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score a directory or archive of resumes against one job description.")
+    parser.add_argument("input", help="Directory, .zip, or .tar(.gz) of PDF/TXT resumes")
+    parser.add_argument("--job", required=True, help="Job description file (.txt or .pdf)")
+    parser.add_argument("--output", required=True, help="Output file (.jsonl/.csv) or directory (parquet)")
+    parser.add_argument("--format", choices=sorted(WRITERS), help="Output format (default: from the output extension)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--max-in-flight", type=int, help="Maximum files queued at once (default: 4 x workers)")
+    parser.add_argument("--checkpoint", help="Checkpoint file of finished resumes (default: <output>.checkpoint)")
+    parser.add_argument("--max-chars", type=int, help="Stop reading each resume after this many characters")
+    parser.add_argument("--ai", action="store_true", help="Call the AI model for every resume (slow; default is local scoring)")
+    args = parser.parse_args(argv)
+
+    output_format = args.format or os.path.splitext(args.output)[1].lstrip(".").lower() or "jsonl"
+    if output_format not in WRITERS:
+        parser.error(f"Cannot infer output format from {args.output}; pass --format")
+
+    with open(args.job, "rb") as handle:
+        job_text = read_text(args.job, handle.read())
+
+    scored = run(
+        args.input,
+        job_text,
+        args.output,
+        output_format,
+        workers=args.workers,
+        use_ai=args.ai,
+        checkpoint_path=args.checkpoint,
+        max_chars=args.max_chars,
+        max_in_flight=args.max_in_flight,
+    )
+    print(f"Scored {scored} resumes into {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+from env import load_env
+
+
+def normalize_text(text: str) -> str:
+    """Collapse whitespace so trivially re-flowed inputs share a cache entry."""
+    return " ".join((text or "").split())
+
+
+def make_key(namespace: str, *parts) -> str:
+    """Content-addressed key: a SHA-256 over the namespace and normalized parts."""
+    digest = hashlib.sha256(namespace.encode("utf-8"))
+    for part in parts:
+        value = normalize_text(part) if isinstance(part, str) else json.dumps(part, sort_keys=True)
+        digest.update(b"\0")
+        digest.update(value.encode("utf-8"))
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """Two-tier cache for JSON-serialisable results.
+
+    The first tier is an in-process LRU bounded by entry count and TTL. The
+    optional second tier is a SQLite file shared across processes and restarts.
+    Values are stored as JSON, so every hit returns a fresh copy.
+    """
+
+    def __init__(self, max_entries: int = 256, ttl_seconds: float = 3600, disk_path: Optional[str] = None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk = None
+        if disk_path:
+            directory = os.path.dirname(disk_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._disk = sqlite3.connect(disk_path, check_same_thread=False)
+            self._disk.execute(
+                "CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, expires_at REAL, payload TEXT)"
+            )
+            self._disk.execute("DELETE FROM results WHERE expires_at < ?", (time.time(),))
+            self._disk.commit()
+
+    def get(self, key: str) -> Optional[Any]:
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                expires_at, payload = entry
+                if expires_at >= now:
+                    self._memory.move_to_end(key)
+                    self.memory_hits += 1
+                    return json.loads(payload)
+                del self._memory[key]
+
+            if self._disk is not None:
+                row = self._disk.execute(
+                    "SELECT expires_at, payload FROM results WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None and row[0] >= now:
+                    self._remember(key, row[0], row[1])
+                    self.disk_hits += 1
+                    return json.loads(row[1])
+
+            self.misses += 1
+            return None
+
+    def set(self, key: str, value: Any):
+        payload = json.dumps(value)
+        expires_at = time.time() + self.ttl_seconds
+        with self._lock:
+            self._remember(key, expires_at, payload)
+            if self._disk is not None:
+                self._disk.execute(
+                    "INSERT OR REPLACE INTO results (key, expires_at, payload) VALUES (?, ?, ?)",
+                    (key, expires_at, payload),
+                )
+                self._disk.commit()
+
+    def get_or_compute(self, key: str, compute: Callable[[], Any]) -> Any:
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+        value = compute()
+        self.set(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            if self._disk is not None:
+                self._disk.execute("DELETE FROM results")
+                self._disk.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            hits = self.memory_hits + self.disk_hits
+            lookups = hits + self.misses
+            return {
+                "hits": hits,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": hits / lookups if lookups else 0.0,
+                "memory_entries": len(self._memory),
+            }
+
+    def _remember(self, key: str, expires_at: float, payload: str):
+        if self.max_entries <= 0:
+            return
+        self._memory[key] = (expires_at, payload)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+
+_result_cache = None
+_result_cache_lock = threading.Lock()
+
+
+def get_result_cache() -> ResultCache:
+    """Return the process-wide result cache configured from the environment."""
+    global _result_cache
+    if _result_cache is None:
+        with _result_cache_lock:
+            if _result_cache is None:
+                load_env()
+                _result_cache = ResultCache(
+                    max_entries=int(os.getenv("RESULT_CACHE_SIZE", "256")),
+                    ttl_seconds=float(os.getenv("RESULT_CACHE_TTL", "3600")),
+                    disk_path=os.getenv("RESULT_CACHE_PATH") or None,
+                )
+    return _result_cache
+
+
+def cache_stats() -> Dict[str, Any]:
+    return get_result_cache().stats()
@@ -0,0 +1,232 @@
+import argparse
+import hashlib
+import os
+import threading
+from collections import Counter
+
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from env import load_env
+
+DEFAULT_MODEL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "corpus_model.npz")
+
+
+class CorpusModel:
+    """Corpus-level TF-IDF model fitted once and reused for every request."""
+
+    def __init__(self, terms=None, document_frequencies=None, document_count=0):
+        terms = list(terms) if terms is not None else []
+        self.vocabulary = {term: index for index, term in enumerate(terms)}
+        self.document_frequencies = np.asarray(
+            document_frequencies if document_frequencies is not None else [], dtype=np.int64
+        )
+        self.document_count = int(document_count)
+        self._idf = None
+        self._analyzer = None
+        self._lock = threading.RLock()
+        self._fingerprint = self._compute_fingerprint()
+
+    @property
+    def is_fitted(self) -> bool:
+        return self.document_count > 0 and bool(self.vocabulary)
+
+    @property
+    def fingerprint(self) -> str:
+        """Content hash of the fitted statistics, recomputed whenever they change.
+
+        It covers every term with its column index and document frequency, plus the
+        document count, so stored TF-IDF rows are never reused under different
+        term indices or IDF weights.
+        """
+        return self._fingerprint
+
+    def _compute_fingerprint(self) -> str:
+        digest = hashlib.sha256(str(self.document_count).encode("ascii"))
+        # Terms in column order, so a reordered vocabulary also gets a new fingerprint.
+        terms = sorted(self.vocabulary, key=self.vocabulary.get)
+        digest.update("\0".join(terms).encode("utf-8"))
+        digest.update(np.ascontiguousarray(self.document_frequencies, dtype="<i8").tobytes())
+        return digest.hexdigest()[:16]
+
+    @property
+    def idf(self) -> np.ndarray:
+        """Smoothed IDF weights, matching scikit-learn's ``smooth_idf=True`` formula."""
+        with self._lock:
+            if self._idf is None or len(self._idf) != len(self.document_frequencies):
+                self._idf = np.log((1 + self.document_count) / (1 + self.document_frequencies)) + 1
+            return self._idf
+
+    def fit(self, documents):
+        """Fit document frequencies from scratch over a corpus."""
+        with self._lock:
+            self.vocabulary = {}
+            self.document_frequencies = np.zeros(0, dtype=np.int64)
+            self.document_count = 0
+            self._idf = None
+            self._fingerprint = self._compute_fingerprint()
+        return self.partial_fit(documents)
+
+    def partial_fit(self, documents):
+        """Fold new documents into the vocabulary and document frequencies."""
+        analyzer = self._get_analyzer()
+        counts = Counter()
+        added = 0
+        for document in documents:
+            counts.update(set(analyzer(document)))
+            added += 1
+
+        with self._lock:
+            for term in counts:
+                if term not in self.vocabulary:
+                    self.vocabulary[term] = len(self.vocabulary)
+
+            frequencies = np.zeros(len(self.vocabulary), dtype=np.int64)
+            frequencies[: len(self.document_frequencies)] = self.document_frequencies
+            for term, count in counts.items():
+                frequencies[self.vocabulary[term]] += count
+
+            self.document_frequencies = frequencies
+            self.document_count += added
+            self._idf = None
+            self._fingerprint = self._compute_fingerprint()
+        return self
+
+    def transform(self, documents):
+        """Transform documents into L2-normalised TF-IDF rows over the stored vocabulary."""
+        analyzer = self._get_analyzer()
+        with self._lock:
+            vocabulary = self.vocabulary
+            idf = self.idf
+
+            indptr = [0]
+            indices = []
+            data = []
+            for document in documents:
+                term_counts = Counter(
+                    vocabulary[term] for term in analyzer(document) if term in vocabulary
+                )
+                indices.extend(term_counts.keys())
+                data.extend(term_counts.values())
+                indptr.append(len(indices))
+
+        matrix = sparse.csr_matrix(
+            (np.asarray(data, dtype=np.float64), np.asarray(indices, dtype=np.int64), np.asarray(indptr)),
+            shape=(len(indptr) - 1, len(idf)),
+        )
+        matrix = matrix.multiply(idf).tocsr()
+        norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+        norms[norms == 0] = 1
+        return sparse.diags(1 / norms) @ matrix
+
+    def similarity(self, text_a, text_b) -> float:
+        """Cosine similarity between two texts under the corpus IDF weights."""
+        vectors = self.transform([text_a, text_b])
+        return float(vectors[0].multiply(vectors[1]).sum())
+
+    def idf_for(self, terms) -> np.ndarray:
+        """IDF weight per term; unseen terms get the weight of a term seen in no document."""
+        unseen = np.log(1 + self.document_count) + 1
+        idf = self.idf
+        weights = []
+        for term in terms:
+            index = self.vocabulary.get(term)
+            if index is not None:
+                weights.append(idf[index])
+                continue
+            parts = [self.vocabulary.get(part) for part in term.split()]
+            known = [idf[part] for part in parts if part is not None]
+            weights.append(sum(known) / len(known) if len(parts) > 1 and known else unseen)
+        return np.asarray(weights, dtype=np.float64)
+
+    def save(self, path=DEFAULT_MODEL_PATH):
+        """Save the vocabulary and document frequencies as a compressed ``.npz`` archive."""
+        with self._lock:
+            terms = sorted(self.vocabulary, key=self.vocabulary.get)
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            np.savez_compressed(
+                path,
+                terms=np.asarray(terms, dtype=str),
+                document_frequencies=self.document_frequencies,
+                document_count=np.asarray(self.document_count),
+            )
+
+    @classmethod
+    def load(cls, path=DEFAULT_MODEL_PATH):
+        """Load a model saved with :meth:`save`."""
+        with np.load(path, allow_pickle=False) as archive:
+            return cls(
+                terms=archive["terms"].tolist(),
+                document_frequencies=archive["document_frequencies"],
+                document_count=int(archive["document_count"]),
+            )
+
+    def _get_analyzer(self):
+        if self._analyzer is None:
+            from nlp_utils import preprocess_text
+
+            self._analyzer = TfidfVectorizer(stop_words="english", preprocessor=preprocess_text).build_analyzer()
+        return self._analyzer
+
+
+_corpus_model = None
+_corpus_model_lock = threading.Lock()
+
+
+def get_model_path() -> str:
+    load_env()
+    return os.getenv("CORPUS_MODEL_PATH", DEFAULT_MODEL_PATH)
+
+
+def get_corpus_model() -> CorpusModel:
+    """Return the process-wide corpus model, loading it from disk on first use."""
+    global _corpus_model
+    if _corpus_model is None:
+        with _corpus_model_lock:
+            if _corpus_model is None:
+                path = get_model_path()
+                _corpus_model = CorpusModel.load(path) if os.path.exists(path) else CorpusModel()
+    return _corpus_model
+
+
+def update_corpus_model(documents, save=True) -> CorpusModel:
+    """Fold new resumes or job descriptions into the shared corpus model."""
+    model = get_corpus_model()
+    model.partial_fit(documents)
+    if save:
+        model.save(get_model_path())
+    return model
+
+
+def _read_documents(paths):
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                for name in sorted(files):
+                    if name.lower().endswith(".txt"):
+                        yield from _read_documents([os.path.join(root, name)])
+        else:
+            with open(path, encoding="utf-8", errors="ignore") as handle:
+                yield handle.read()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fit or update the corpus TF-IDF model.")
+    parser.add_argument("command", choices=["fit", "update"])
+    parser.add_argument("paths", nargs="+", help="Text files or directories of .txt resumes and job descriptions")
+    parser.add_argument("--model", default=get_model_path(), help="Path of the .npz model file")
+    args = parser.parse_args(argv)
+
+    if args.command == "fit" or not os.path.exists(args.model):
+        model = CorpusModel().fit(_read_documents(args.paths))
+    else:
+        model = CorpusModel.load(args.model).partial_fit(_read_documents(args.paths))
+    model.save(args.model)
+    print(f"Corpus model saved to {args.model}: {model.document_count} documents, {len(model.vocabulary)} terms")
+
+
+if __name__ == "__main__":
+    main()
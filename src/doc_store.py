@@ -0,0 +1,162 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from cache import make_key
+from env import load_env
+
+# Bump whenever a stored feature changes format or meaning so older rows are ignored.
+STORE_VERSION = "1"
+
+# Rows are evicted in batches, checked once per this many inserts.
+_PRUNE_EVERY = 100
+
+
+def content_hash(data) -> str:
+    """SHA-256 of raw file bytes or of a text's UTF-8 encoding."""
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return hashlib.sha256(data).hexdigest()
+
+
+class DocumentStore:
+    """Content-addressed store of extracted text and precomputed document features.
+
+    Extracted text is keyed by a hash of the source file's bytes and the
+    extraction options, so the same upload is parsed once. Features are keyed by
+    a hash of the text and the feature name, so a resume matched against many
+    job descriptions is analysed once. The default database is in-memory; pass a
+    file path to share the store across processes and restarts. When more than
+    ``max_documents`` texts or documents with features are held, the oldest go first.
+    """
+
+    def __init__(self, path: str = ":memory:", max_documents: int = 1000):
+        self.path = path
+        self.max_documents = max_documents
+        self.hits = 0
+        self.misses = 0
+        self._inserts = 0
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+        if path != ":memory:":
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        if path != ":memory:":
+            # Lets bulk-scoring worker processes read while another one writes.
+            self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS texts (key TEXT PRIMARY KEY, text TEXT, created_at REAL);
+            CREATE TABLE IF NOT EXISTS features (
+                text_hash TEXT, name TEXT, payload TEXT, created_at REAL, PRIMARY KEY (text_hash, name)
+            );
+            CREATE INDEX IF NOT EXISTS texts_created_at ON texts (created_at);
+            CREATE INDEX IF NOT EXISTS features_created_at ON features (created_at);
+            """
+        )
+        self._db.commit()
+
+    def get_or_extract_text(self, data: bytes, extract: Callable[[], str], **options) -> str:
+        """Return the stored text for these file bytes, running ``extract`` only on a miss.
+
+        ``options`` are the extraction settings (page or character limits) that
+        change the text. Exceptions from ``extract`` propagate and nothing is stored.
+        """
+        key = make_key("text", STORE_VERSION, content_hash(data), options)
+        with self._lock:
+            row = self._db.execute("SELECT text FROM texts WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                self.hits += 1
+                return row[0]
+            self.misses += 1
+
+        text = extract()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO texts (key, text, created_at) VALUES (?, ?, ?)", (key, text, time.time())
+            )
+            self._committed_insert()
+        return text
+
+    def get_or_compute_feature(self, text_hash: str, name: Hashable, compute: Callable[[], Any]) -> Any:
+        """Return a stored JSON feature of a text, computing and storing it on a miss.
+
+        Values round-trip through JSON, so a stored tuple comes back as a list.
+        """
+        feature_name = f"{STORE_VERSION}:{json.dumps(name)}"
+        with self._lock:
+            row = self._db.execute(
+                "SELECT payload FROM features WHERE text_hash = ? AND name = ?", (text_hash, feature_name)
+            ).fetchone()
+            if row is not None:
+                self.hits += 1
+                return json.loads(row[0])
+            self.misses += 1
+
+        value = compute()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO features (text_hash, name, payload, created_at) VALUES (?, ?, ?, ?)",
+                (text_hash, feature_name, json.dumps(value), time.time()),
+            )
+            self._committed_insert()
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._db.execute("DELETE FROM texts")
+            self._db.execute("DELETE FROM features")
+            self._db.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "texts": self._db.execute("SELECT COUNT(*) FROM texts").fetchone()[0],
+                "documents": self._db.execute("SELECT COUNT(DISTINCT text_hash) FROM features").fetchone()[0],
+            }
+
+    def _committed_insert(self):
+        self._inserts += 1
+        if self.max_documents > 0 and self._inserts % _PRUNE_EVERY == 0:
+            self._db.execute(
+                "DELETE FROM texts WHERE key NOT IN (SELECT key FROM texts ORDER BY created_at DESC LIMIT ?)",
+                (self.max_documents,),
+            )
+            self._db.execute(
+                """
+                DELETE FROM features WHERE text_hash NOT IN (
+                    SELECT text_hash FROM features GROUP BY text_hash ORDER BY MAX(created_at) DESC LIMIT ?
+                )
+                """,
+                (self.max_documents,),
+            )
+        self._db.commit()
+
+
+_document_store: Optional[DocumentStore] = None
+_document_store_lock = threading.Lock()
+
+
+def get_document_store() -> DocumentStore:
+    """Return the process-wide document store configured from the environment."""
+    global _document_store
+    # SQLite connections must not cross a fork, so worker processes open their own.
+    if _document_store is None or _document_store._pid != os.getpid():
+        with _document_store_lock:
+            if _document_store is None or _document_store._pid != os.getpid():
+                load_env()
+                _document_store = DocumentStore(
+                    path=os.getenv("DOCUMENT_STORE_PATH") or ":memory:",
+                    max_documents=int(os.getenv("DOCUMENT_STORE_SIZE", "1000")),
+                )
+    return _document_store
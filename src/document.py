@@ -0,0 +1,126 @@
+import os
+import re
+import threading
+from collections import OrderedDict
+from functools import cached_property
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+from doc_store import content_hash, get_document_store
+from env import load_env
+
+_NON_LETTERS = re.compile(r"[^a-zA-Z\s]")
+_WHITESPACE = re.compile(r"\s+")
+_SENTENCE_END = re.compile(r"[.!?]+(?=\s)|\n\s*\n|\n(?=\s*[-*•])")
+
+
+class ResumeDocument:
+    """A resume or job description normalised once and shared by every analyzer.
+
+    Derived views such as the lowered text, cleaned text, tokens, and sentence
+    boundaries are computed on first access. Extractors store their results with
+    :meth:`feature`, so asking for the same feature twice costs one dict lookup.
+    """
+
+    def __init__(self, text: str):
+        self.text = text or ""
+        self._features: Dict[Hashable, Any] = {}
+
+    @cached_property
+    def content_hash(self) -> str:
+        return content_hash(self.text)
+
+    @cached_property
+    def lowered(self) -> str:
+        return self.text.lower()
+
+    @cached_property
+    def clean(self) -> str:
+        """Lowercased text with everything but letters and single spaces removed."""
+        return _WHITESPACE.sub(" ", _NON_LETTERS.sub("", self.lowered)).strip()
+
+    @cached_property
+    def tokens(self) -> List[str]:
+        return self.text.split()
+
+    @cached_property
+    def sentence_spans(self) -> List[Tuple[int, int]]:
+        """Character offsets of each sentence or bullet in the original text."""
+        spans = []
+        start = 0
+        for match in _SENTENCE_END.finditer(self.text):
+            if self.text[start:match.end()].strip():
+                spans.append((start, match.end()))
+            start = match.end()
+        if self.text[start:].strip():
+            spans.append((start, len(self.text)))
+        return spans
+
+    @property
+    def sentences(self) -> List[str]:
+        return [self.text[start:end].strip() for start, end in self.sentence_spans]
+
+    def has_feature(self, name: Hashable) -> bool:
+        return name in self._features
+
+    def set_feature(self, name: Hashable, value: Any):
+        """Memoise a feature computed elsewhere, e.g. for a whole batch of documents at once."""
+        self._features[name] = value
+
+    def feature(self, name: Hashable, compute: Callable[["ResumeDocument"], Any], persist: bool = False) -> Any:
+        """Return a cached feature, computing it from this document on first request.
+
+        With ``persist``, the shared document store is checked before computing, so
+        the feature is computed once per distinct text rather than once per object.
+        Persisted features must be JSON-serialisable.
+        """
+        try:
+            return self._features[name]
+        except KeyError:
+            pass
+        if persist:
+            value = get_document_store().get_or_compute_feature(self.content_hash, name, lambda: compute(self))
+        else:
+            value = compute(self)
+        self._features[name] = value
+        return value
+
+
+def as_document(text) -> ResumeDocument:
+    """Wrap raw text in a :class:`ResumeDocument`, passing existing documents through."""
+    return text if isinstance(text, ResumeDocument) else ResumeDocument(text)
+
+
+_documents: "OrderedDict[str, ResumeDocument]" = OrderedDict()
+_documents_lock = threading.Lock()
+_documents_size: Optional[int] = None
+
+
+def get_document(text) -> ResumeDocument:
+    """Like :func:`as_document`, but returns the same document for the same text.
+
+    Recently used documents are kept in a process-wide LRU keyed by content
+    hash (``DOCUMENT_CACHE_SIZE`` entries, default 256), so their memoised
+    features survive from one scoring call to the next.
+    """
+    global _documents_size
+    if isinstance(text, ResumeDocument):
+        return text
+    if _documents_size is None:
+        load_env()
+        _documents_size = int(os.getenv("DOCUMENT_CACHE_SIZE", "256"))
+    if _documents_size <= 0:
+        return ResumeDocument(text)
+
+    key = content_hash(text or "")
+    with _documents_lock:
+        doc = _documents.get(key)
+        if doc is not None:
+            _documents.move_to_end(key)
+            return doc
+        doc = ResumeDocument(text)
+        # Reuse the hash just computed rather than hashing again on first access.
+        doc.__dict__["content_hash"] = key
+        _documents[key] = doc
+        while len(_documents) > _documents_size:
+            _documents.popitem(last=False)
+        return doc
@@ -0,0 +1,116 @@
+import re
+from typing import Dict, FrozenSet, Iterable, Iterator, List, NamedTuple, Set
+
+_END = ""
+
+
+class TermMatch(NamedTuple):
+    term: str
+    start: int
+    end: int
+
+
+class TermMatcher:
+    """Find every occurrence of a fixed set of terms in a single regex pass.
+
+    The terms are compiled into one trie-shaped alternation, so the scan cost
+    grows with the length of the text rather than with the number of terms.
+    Matches must start at a word boundary. By default they must also end at
+    one, so ``"go"`` does not match inside ``"good"`` and ``"sql"`` does not
+    match inside ``"mysql"``. With ``allow_suffixes=True`` a term also matches
+    the beginning of a longer word, e.g. ``"project"`` in ``"projects"``.
+    """
+
+    def __init__(self, terms: Iterable[str], allow_suffixes: bool = False):
+        self.terms = list(dict.fromkeys(term.lower() for term in terms if term))
+        self.allow_suffixes = allow_suffixes
+        self._order = {term: index for index, term in enumerate(self.terms)}
+        self._trie = _build_trie(self.terms)
+
+        tail = r"\w*" if allow_suffixes else r"(?!\w)"
+        body = _trie_pattern(self._trie) or r"(?!)"
+        self._pattern = re.compile(r"(?<!\w)(?:" + body + ")" + tail, re.IGNORECASE)
+        # The same matches in lowercased ASCII text. Without IGNORECASE, and with
+        # each branch opening on a literal character, the engine only stops at
+        # positions holding some term's first character.
+        branches = [
+            re.escape(char) + r"(?<!\w" + re.escape(char) + ")" + _trie_pattern(child)
+            for char, child in sorted(self._trie.items())
+        ]
+        self._ascii_pattern = re.compile("(?:" + "|".join(branches) + ")" + tail if branches else r"(?!)")
+
+    def finditer(self, text: str) -> Iterator[TermMatch]:
+        """Yield each term occurrence with its character offsets in ``text``."""
+        for match in self._pattern.finditer(text):
+            if self.allow_suffixes:
+                for term in self._prefix_terms(match.group(0).lower()):
+                    yield TermMatch(term, match.start(), match.start() + len(term))
+            else:
+                yield TermMatch(match.group(0).lower(), match.start(), match.end())
+
+    def find_all(self, text: str) -> List[TermMatch]:
+        return list(self.finditer(text))
+
+    def found(self, text: str) -> Set[str]:
+        """Return the set of distinct terms present in ``text``."""
+        return {match.term for match in self.finditer(text)}
+
+    def found_many(self, texts: Iterable[str]) -> List[Set[str]]:
+        """Return :meth:`found` for each text, resolving each distinct matched word only once."""
+        word_terms: Dict[str, FrozenSet[str]] = {}
+        results = []
+        for text in texts:
+            # ASCII lowercases without changing length or what IGNORECASE would match.
+            words = self._ascii_pattern.findall(text.lower()) if text.isascii() else self._pattern.findall(text)
+            present: Set[str] = set()
+            for word in set(words):
+                terms = word_terms.get(word)
+                if terms is None:
+                    lowered = word.lower()
+                    terms = word_terms[word] = frozenset(self._prefix_terms(lowered) if self.allow_suffixes else [lowered])
+                present |= terms
+            results.append(present)
+        return results
+
+    def found_in_order(self, text: str) -> List[str]:
+        """Return the distinct terms present in ``text`` in the order they were registered."""
+        return sorted(self.found(text), key=self._order.__getitem__)
+
+    def counts(self, text: str) -> Dict[str, int]:
+        counts: Dict[str, int] = {}
+        for match in self.finditer(text):
+            counts[match.term] = counts.get(match.term, 0) + 1
+        return counts
+
+    def _prefix_terms(self, word: str) -> List[str]:
+        """Return every registered term that is a prefix of ``word``."""
+        terms = []
+        node = self._trie
+        for index, char in enumerate(word):
+            node = node.get(char)
+            if node is None:
+                break
+            if _END in node:
+                terms.append(word[: index + 1])
+        return terms
+
+
+def _build_trie(terms: Iterable[str]) -> Dict:
+    trie: Dict = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[_END] = {}
+    return trie
+
+
+def _trie_pattern(node: Dict) -> str:
+    """Render a trie as a regex in which each alternation branches on a distinct character."""
+    branches = [re.escape(char) + _trie_pattern(child) for char, child in sorted(node.items()) if char != _END]
+    if not branches:
+        return ""
+    if len(branches) == 1 and _END not in node:
+        return branches[0]
+    pattern = "(?:" + "|".join(branches) + ")"
+    return pattern + "?" if _END in node else pattern
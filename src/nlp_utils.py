@@ -1,141 +1,266 @@
 import re
-
-import nltk
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-
-# Download required NLTK data
-try:
-    nltk.data.find("tokenizers/punkt")
-except LookupError:
-    nltk.download("punkt")
+from collections import Counter
+from functools import cached_property, lru_cache
+
+from document import ResumeDocument, as_document
+from matcher import TermMatcher
+from patterns import EMAIL, EXPERIENCE_YEARS, PHONE, QUANTIFIED, URL
+from taxonomy import get_taxonomy
+from tracing import traced
+
+SECTIONS = {
+    "contact": ["email", "phone", "linkedin", "github"],
+    "summary": ["summary", "objective", "profile"],
+    "experience": ["experience", "work", "employment", "career"],
+    "education": ["education", "degree", "university", "college"],
+    "skills": ["skills", "technical", "technologies"],
+    "projects": ["projects", "portfolio"],
+    "certifications": ["certification", "certified", "license"],
+}
+
+WEAK_WORDS = {
+    "responsible for": "managed, led, oversaw",
+    "worked on": "developed, implemented, created",
+    "helped": "assisted, supported, facilitated",
+    "did": "executed, performed, accomplished",
+    "made": "created, developed, built",
+    "good": "excellent, proficient, skilled",
+    "basic": "fundamental, foundational",
+}
+
+LEADERSHIP_TERMS = frozenset(["led", "managed", "mentored", "owned", "coordinated", "spearheaded"])
+COLLABORATION_TERMS = frozenset(["collaborated", "partnered", "cross-functional", "stakeholders", "team"])
+PROJECT_TERMS = frozenset(["project", "projects", "built", "developed", "launched", "shipped"])
+
+# Matchers are compiled once at import; each finds all of its terms in one pass over the text.
+SECTION_MATCHER = TermMatcher((keyword for keywords in SECTIONS.values() for keyword in keywords), allow_suffixes=True)
+WEAK_WORD_MATCHER = TermMatcher(WEAK_WORDS)
+ROLE_SIGNAL_MATCHER = TermMatcher(LEADERSHIP_TERMS | COLLABORATION_TERMS | PROJECT_TERMS, allow_suffixes=True)
+
+# scikit-learn's default token pattern, so keywords match what its vectorizers produce.
+_KEYWORD_TOKEN = re.compile(r"(?u)\b\w\w+\b")
 
 
 def preprocess_text(text):
     """Clean and preprocess text."""
-    text = text.lower()
-    text = re.sub(r"[^a-zA-Z\s]", "", text)
-    text = re.sub(r"\s+", " ", text).strip()
-    return text
+    return as_document(text).clean
 
 
+@traced("skills")
 def extract_skills(text):
     """Extract skills from text using comprehensive skill categories."""
-    skills_categories = {
-        "programming": ["python", "java", "javascript", "typescript", "c++", "c#", "go", "rust", "php", "ruby", "swift", "kotlin"],
-        "web_frameworks": ["react", "angular", "vue.js", "node.js", "express", "django", "flask", "spring", "laravel"],
-        "databases": ["sql", "mysql", "postgresql", "mongodb", "redis", "elasticsearch", "oracle", "sqlite"],
-        "cloud_devops": ["aws", "azure", "gcp", "docker", "kubernetes", "jenkins", "terraform", "ansible"],
-        "data_science": ["machine learning", "deep learning", "data analysis", "pandas", "numpy", "tensorflow", "pytorch", "scikit-learn"],
-        "tools": ["git", "jira", "confluence", "slack", "excel", "powerbi", "tableau", "figma", "photoshop"],
-    }
+    taxonomy = get_taxonomy()
+    return as_document(text).feature(
+        ("skills", taxonomy.version), lambda doc: taxonomy.extract(doc.text, skill_set="resume"), persist=True
+    )
 
-    found_skills = []
-    text_lower = text.lower()
 
-    for skills in skills_categories.values():
-        for skill in skills:
-            if skill in text_lower:
-                found_skills.append(skill)
+def extract_keywords(text, top_n=20):
+    """Extract important keywords using TF-IDF."""
+    return extract_keywords_batch([text], top_n)[0]
+
+
+@traced("keywords")
+def extract_keywords_batch(texts, top_n=20):
+    """Extract keywords for many documents, looking up each distinct n-gram's IDF once.
+
+    Keywords are unigrams and bigrams ranked by count times corpus IDF (plain
+    counts when no corpus model is fitted), ties broken alphabetically, with
+    weights L2-normalised over the returned top ``top_n``.
+    """
+    docs = [as_document(text) for text in texts]
+    name = ("keywords", top_n)
+    idf = _corpus_idf([doc.feature("ngram_counts", _ngram_counts) for doc in docs if not doc.has_feature(name)])
+    return [
+        doc.feature(name, lambda doc: _top_keywords(doc.feature("ngram_counts", _ngram_counts), idf, top_n))
+        for doc in docs
+    ]
 
-    return found_skills
 
+@lru_cache(maxsize=None)
+def english_stop_words():
+    """scikit-learn's English stop words, imported on first use."""
+    from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+
+    return frozenset(ENGLISH_STOP_WORDS)
 
-def extract_keywords(text, top_n=20):
-    """Extract important keywords using TF-IDF."""
-    vectorizer = TfidfVectorizer(stop_words="english", max_features=top_n, ngram_range=(1, 2))
-    tfidf_matrix = vectorizer.fit_transform([text])
-    feature_names = vectorizer.get_feature_names_out()
-    scores = tfidf_matrix.toarray()[0]
 
-    keywords = [(feature_names[i], scores[i]) for i in range(len(feature_names))]
-    return sorted(keywords, key=lambda x: x[1], reverse=True)
+def _ngram_counts(doc):
+    """Unigram and bigram counts, tokenised like scikit-learn's ``stop_words="english"`` analyzer."""
+    stop_words = english_stop_words()
+    tokens = [token for token in _KEYWORD_TOKEN.findall(doc.lowered) if token not in stop_words]
+    counts = Counter(tokens)
+    counts.update(" ".join(pair) for pair in zip(tokens, tokens[1:]))
+    return counts
 
 
+def _corpus_idf(counts):
+    """IDF of every n-gram in ``counts`` from the corpus model; empty when none is fitted."""
+    from corpus_model import get_corpus_model
+
+    model = get_corpus_model()
+    if not counts or not model.is_fitted:
+        return {}
+    terms = list(set().union(*counts))
+    return dict(zip(terms, model.idf_for(terms).tolist()))
+
+
+def _top_keywords(term_counts, idf, top_n):
+    weights = {term: count * idf.get(term, 1.0) for term, count in term_counts.items()}
+    top = sorted(weights.items(), key=lambda item: (-item[1], item[0]))[:top_n]
+    norm = sum(weight ** 2 for _, weight in top) ** 0.5 or 1
+    return [(term, weight / norm) for term, weight in top]
+
+
+@traced("sections")
 def analyze_sections(resume_text):
     """Analyze resume sections and identify missing ones."""
-    sections = {
-        "contact": ["email", "phone", "linkedin", "github"],
-        "summary": ["summary", "objective", "profile"],
-        "experience": ["experience", "work", "employment", "career"],
-        "education": ["education", "degree", "university", "college"],
-        "skills": ["skills", "technical", "technologies"],
-        "projects": ["projects", "portfolio"],
-        "certifications": ["certification", "certified", "license"],
-    }
+    return as_document(resume_text).feature("sections", _analyze_sections, persist=True)
 
-    found_sections = []
-    text_lower = resume_text.lower()
 
-    for section, keywords in sections.items():
-        if any(keyword in text_lower for keyword in keywords):
-            found_sections.append(section)
+def _analyze_sections(doc):
+    present_keywords = SECTION_MATCHER.found(doc.text)
+    found_sections = [
+        section for section, keywords in SECTIONS.items()
+        if any(keyword in present_keywords for keyword in keywords)
+    ]
 
-    missing_sections = [section for section in sections if section not in found_sections]
+    missing_sections = [section for section in SECTIONS if section not in found_sections]
     return found_sections, missing_sections
 
 
+@traced("similarity")
 def calculate_similarity(resume_text, job_text):
     """Calculate similarity between resume and job description."""
+    from corpus_model import get_corpus_model
+
+    model = get_corpus_model()
+    if model.is_fitted:
+        return _vector_dot(_tfidf_vector(resume_text, model), _tfidf_vector(job_text, model))
+
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.metrics.pairwise import cosine_similarity
+
+    resume_text, job_text = _similarity_text(resume_text), _similarity_text(job_text)
     vectorizer = TfidfVectorizer(stop_words="english")
     tfidf_matrix = vectorizer.fit_transform([resume_text, job_text])
     similarity = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])
     return similarity[0][0]
 
 
+@traced("similarity")
+def calculate_similarities(resume_texts, job_text):
+    """Calculate similarity of many resumes to one job description with a single TF-IDF fit."""
+    from corpus_model import get_corpus_model
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    model = get_corpus_model()
+    if model.is_fitted:
+        from scipy import sparse
+
+        docs = [as_document(text) for text in resume_texts]
+        name = ("tfidf", model.fingerprint)
+        width = len(model.idf)
+        rows = [None] * len(docs)
+        missing = [position for position, doc in enumerate(docs) if not doc.has_feature(name)]
+        if missing:
+            # One transform for every resume not seen before; its rows are stacked as they are.
+            fresh = model.transform([docs[position].clean for position in missing])
+            for offset, position in enumerate(missing):
+                row = rows[position] = fresh[offset]
+                docs[position].set_feature(name, {"indices": row.indices, "data": row.data})
+        for position, doc in enumerate(docs):
+            if rows[position] is None:
+                rows[position] = _sparse_row(_tfidf_vector(doc, model), width)
+        matrix = sparse.vstack(rows, format="csr") if rows else sparse.csr_matrix((0, width))
+        job_vector = _sparse_row(_tfidf_vector(job_text, model), width)
+        # Rows are L2-normalised, so one sparse matrix-vector product yields every cosine.
+        return (matrix @ job_vector.T).toarray().ravel()
+
+    resume_texts = [_similarity_text(text) for text in resume_texts]
+    job_text = _similarity_text(job_text)
+    vectorizer = TfidfVectorizer(stop_words="english")
+    tfidf_matrix = vectorizer.fit_transform(list(resume_texts) + [job_text])
+    # Rows are L2-normalised, so one sparse matrix-vector product yields every cosine.
+    similarities = tfidf_matrix[:-1] @ tfidf_matrix[-1].T
+    return similarities.toarray().ravel()
+
+
+def _tfidf_vector(text, model):
+    """A document's corpus TF-IDF row as ``{"indices": [...], "data": [...]}``, stored per text and model."""
+
+    def compute(doc):
+        row = model.transform([doc.clean])
+        return {"indices": row.indices.tolist(), "data": row.data.tolist()}
+
+    return as_document(text).feature(("tfidf", model.fingerprint), compute, persist=True)
+
+
+def _sparse_row(vector, width):
+    """A stored TF-IDF row as a 1 x ``width`` CSR matrix."""
+    from scipy import sparse
+
+    indices = vector["indices"]
+    return sparse.csr_matrix((vector["data"], indices, [0, len(indices)]), shape=(1, width), dtype=float)
+
+
+def _vector_dot(vector_a, vector_b):
+    """Cosine of two stored TF-IDF rows; rows are L2-normalised, so this is their dot product."""
+    weights = dict(zip(vector_a["indices"], vector_a["data"]))
+    return float(sum(weights.get(index, 0.0) * value for index, value in zip(vector_b["indices"], vector_b["data"])))
+
+
+def _similarity_text(text):
+    """Documents are compared on their cleaned text; plain strings are used as given."""
+    return text.clean if isinstance(text, ResumeDocument) else text
+
+
+@traced("weak_words")
 def identify_weak_words(text):
     """Identify weak words that should be replaced with stronger alternatives."""
-    weak_words = {
-        "responsible for": "managed, led, oversaw",
-        "worked on": "developed, implemented, created",
-        "helped": "assisted, supported, facilitated",
-        "did": "executed, performed, accomplished",
-        "made": "created, developed, built",
-        "good": "excellent, proficient, skilled",
-        "basic": "fundamental, foundational",
-    }
+    return as_document(text).feature("weak_words", _identify_weak_words)
 
-    found_weak_words = []
-    text_lower = text.lower()
 
-    for weak, strong in weak_words.items():
-        if weak in text_lower:
-            found_weak_words.append((weak, strong))
-
-    return found_weak_words
+def _identify_weak_words(doc):
+    present = WEAK_WORD_MATCHER.found_in_order(doc.text)
+    return [(weak, WEAK_WORDS[weak]) for weak in present]
 
 
+@traced("quantified_achievements")
 def count_quantified_achievements(text):
     """Estimate how many quantified achievements the resume contains."""
-    patterns = [
-        r"\b\d+%\b",
-        r"\b\d+\+?\b",
-        r"\$\s?\d[\d,]*",
-        r"\b\d+\s?(years|yrs|months|people|users|clients|projects)\b",
-    ]
+    return as_document(text).feature("quantified_achievements", _count_quantified_achievements)
 
-    match_count = 0
-    lowered = text.lower()
-    for pattern in patterns:
-        match_count += len(re.findall(pattern, lowered))
-    return match_count
 
+def _count_quantified_achievements(doc):
+    return sum(1 for _ in QUANTIFIED.finditer(doc.text))
 
+
+@traced("contact_details")
 def detect_contact_details(text):
     """Check which contact methods are present."""
-    lowered = text.lower()
+    return as_document(text).feature("contact_details", _detect_contact_details, persist=True)
+
+
+def _detect_contact_details(doc):
+    lowered = doc.lowered
     return {
-        "email": bool(re.search(r"[\w\.-]+@[\w\.-]+\.\w+", text)),
-        "phone": bool(re.search(r"(\+\d{1,3}[-.\s]?)?(\(?\d{3}\)?[-.\s]?)?\d{3}[-.\s]?\d{4}", text)),
+        "email": bool(EMAIL.search(doc.text)),
+        "phone": bool(PHONE.search(doc.text)),
         "linkedin": "linkedin.com" in lowered,
         "github": "github.com" in lowered,
-        "portfolio": bool(re.search(r"https?://", lowered)) or "portfolio" in lowered,
+        "portfolio": bool(URL.search(lowered)) or "portfolio" in lowered,
     }
 
 
+@traced("experience_years")
 def estimate_experience_years(text):
     """Estimate years of experience referenced in the resume."""
-    matches = re.findall(r"(\d+)\+?\s*(?:years|yrs)", text.lower())
+    return as_document(text).feature("experience_years", _estimate_experience_years)
+
+
+def _estimate_experience_years(doc):
+    matches = EXPERIENCE_YEARS.findall(doc.text)
     if not matches:
         return 0
     return max(int(match) for match in matches)
@@ -149,19 +274,132 @@ def score_keyword_coverage(resume_keywords, job_keywords):
     return len(set(resume_keywords) & job_set) / len(job_set)
 
 
+@traced("role_signals")
 def extract_role_signals(text):
     """Capture simple leadership, collaboration, and project-delivery signals."""
-    lowered = text.lower()
-    leadership_terms = ["led", "managed", "mentored", "owned", "coordinated", "spearheaded"]
-    collaboration_terms = ["collaborated", "partnered", "cross-functional", "stakeholders", "team"]
-    project_terms = ["project", "projects", "built", "developed", "launched", "shipped"]
+    return as_document(text).feature("role_signals", _extract_role_signals)
 
-    leadership_hits = sum(1 for term in leadership_terms if term in lowered)
-    collaboration_hits = sum(1 for term in collaboration_terms if term in lowered)
-    project_hits = sum(1 for term in project_terms if term in lowered)
+
+def _extract_role_signals(doc):
+    present = ROLE_SIGNAL_MATCHER.found(doc.text)
+    leadership_hits = len(present & LEADERSHIP_TERMS)
+    collaboration_hits = len(present & COLLABORATION_TERMS)
+    project_hits = len(present & PROJECT_TERMS)
 
     return {
         "leadership_score": min(leadership_hits * 20, 100),
         "collaboration_score": min(collaboration_hits * 20, 100),
         "project_score": min(project_hits * 15, 100),
     }
+
+
+class TextBatch:
+    """Texts prepared once for the ``*_batch`` functions.
+
+    Accepts a sequence of strings or documents, or a pandas Series, whose index
+    the batch functions' DataFrames keep. Missing values count as empty text.
+    Pass one batch to several ``*_batch`` functions to lowercase each text once.
+    Patterns run over each text in turn, which is as fast as pandas ``.str``
+    methods and faster than one combined pattern over all texts (see
+    ``benchmarks/bench_batch_features.py``); only the results are collected into arrays.
+    """
+
+    def __init__(self, texts):
+        index = getattr(texts, "index", None)
+        # A Series' index is kept; sequences such as lists only have an ``index()`` method.
+        self.index = None if callable(index) else index
+        self.texts = [_batch_text(text) for text in texts]
+
+    def __len__(self):
+        return len(self.texts)
+
+    @cached_property
+    def lowered(self):
+        return [text.lower() for text in self.texts]
+
+    def count(self, pattern):
+        """Number of matches of ``pattern`` in each text, as an integer array."""
+        import numpy as np
+
+        findall = pattern.findall
+        return np.fromiter((len(findall(text)) for text in self.texts), dtype=np.int64, count=len(self))
+
+    def contains(self, pattern, lowered=False):
+        """Whether each text contains ``pattern``, a compiled regex or a plain substring."""
+        import numpy as np
+
+        texts = self.lowered if lowered else self.texts
+        if isinstance(pattern, str):
+            found = (pattern in text for text in texts)
+        else:
+            search = pattern.search
+            found = (search(text) is not None for text in texts)
+        return np.fromiter(found, dtype=bool, count=len(self))
+
+    def frame(self, columns):
+        import pandas as pd
+
+        return pd.DataFrame(columns, index=self.index)
+
+
+def _batch_text(text):
+    if isinstance(text, ResumeDocument):
+        return text.text
+    return text if isinstance(text, str) else ""
+
+
+def _as_batch(texts):
+    return texts if isinstance(texts, TextBatch) else TextBatch(texts)
+
+
+@traced("quantified_achievements_batch")
+def count_quantified_achievements_batch(texts):
+    """:func:`count_quantified_achievements` for many texts, as an integer array."""
+    return _as_batch(texts).count(QUANTIFIED)
+
+
+@traced("contact_details_batch")
+def detect_contact_details_batch(texts):
+    """:func:`detect_contact_details` for many texts, as a DataFrame of boolean columns."""
+    batch = _as_batch(texts)
+    return batch.frame({
+        "email": batch.contains(EMAIL),
+        "phone": batch.contains(PHONE),
+        "linkedin": batch.contains("linkedin.com", lowered=True),
+        "github": batch.contains("github.com", lowered=True),
+        "portfolio": batch.contains(URL, lowered=True) | batch.contains("portfolio", lowered=True),
+    })
+
+
+@traced("experience_years_batch")
+def estimate_experience_years_batch(texts):
+    """:func:`estimate_experience_years` for many texts, as an integer array.
+
+    Values are clipped to the int64 range; only nonsense digit runs come near it.
+    """
+    import numpy as np
+
+    batch = _as_batch(texts)
+    # The pattern accepts any digit run, e.g. "99999999999999999999 years" in garbled
+    # PDF text, and np.fromiter raises OverflowError on an int that int64 cannot hold.
+    limit = np.iinfo(np.int64).max
+    years = (min(max(map(int, matches), default=0), limit) for matches in map(EXPERIENCE_YEARS.findall, batch.texts))
+    return np.fromiter(years, dtype=np.int64, count=len(batch))
+
+
+@traced("role_signals_batch")
+def extract_role_signals_batch(texts):
+    """:func:`extract_role_signals` for many texts, as a DataFrame of score columns."""
+    import numpy as np
+
+    batch = _as_batch(texts)
+    present = ROLE_SIGNAL_MATCHER.found_many(batch.texts)
+
+    def hits(terms):
+        return np.fromiter((len(found & terms) for found in present), dtype=np.int64, count=len(batch))
+
+    return batch.frame({
+        "leadership_score": np.minimum(hits(LEADERSHIP_TERMS) * 20, 100),
+        "collaboration_score": np.minimum(hits(COLLABORATION_TERMS) * 20, 100),
+        "project_score": np.minimum(hits(PROJECT_TERMS) * 15, 100),
+    })
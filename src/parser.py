@@ -1,20 +1,118 @@
-import PyPDF2
 import io
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import closing
 
-def extract_text_from_pdf(pdf_file):
-    """Extract text from uploaded PDF file"""
+from doc_store import get_document_store
+from tracing import traced
+
+
+def iter_pdf_pages(pdf_file, start=0, stop=None):
+    """Yield the text of each PDF page in order, extracting one page at a time"""
+    import PyPDF2
+
+    reader = PyPDF2.PdfReader(pdf_file)
+    page_count = len(reader.pages)
+    stop = page_count if stop is None else min(stop, page_count)
+    for index in range(start, stop):
+        yield reader.pages[index].extract_text() or ""
+
+
+def extract_text_from_pdf(pdf_file, max_pages=None, max_chars=None, workers=None):
+    """Extract text from uploaded PDF file
+
+    Like :func:`read_pdf_text`, but a PDF that cannot be read yields an
+    ``"Error reading PDF: ..."`` message instead of raising.
+    """
     try:
-        pdf_reader = PyPDF2.PdfReader(pdf_file)
-        text = ""
-        for page in pdf_reader.pages:
-            text += page.extract_text()
-        return text
+        return read_pdf_text(pdf_file, max_pages=max_pages, max_chars=max_chars, workers=workers)
     except Exception as e:
         return f"Error reading PDF: {str(e)}"
 
+
+@traced("pdf_extract")
+def read_pdf_text(pdf_file, max_pages=None, max_chars=None, workers=None):
+    """Extract text from a PDF file, raising if it cannot be read.
+
+    Extraction stops after ``max_pages`` pages or once ``max_chars`` characters
+    have been collected. With ``workers`` > 1, pages are extracted in parallel
+    processes, in chunks, so the cutoff still skips the remaining pages.
+    Text is kept in the document store under a hash of the file's bytes, so
+    the same file is only parsed once.
+    """
+    pdf_bytes = _read_bytes(pdf_file)
+    return get_document_store().get_or_extract_text(
+        pdf_bytes,
+        lambda: _extract_pdf_bytes(pdf_bytes, max_pages, max_chars, workers),
+        max_pages=max_pages,
+        max_chars=max_chars,
+    )
+
+
 def extract_text_from_txt(txt_file):
     """Extract text from uploaded text file"""
     try:
         return txt_file.read().decode('utf-8')
     except Exception as e:
-        return f"Error reading text file: {str(e)}"
\ No newline at end of file
+        return f"Error reading text file: {str(e)}"
+
+
+@traced("pdf_parse")
+def _extract_pdf_bytes(pdf_bytes, max_pages, max_chars, workers):
+    if workers and workers > 1:
+        pages = _iter_pages_parallel(pdf_bytes, max_pages, workers)
+    else:
+        pages = iter_pdf_pages(io.BytesIO(pdf_bytes), stop=max_pages)
+    with closing(pages):
+        return _join_pages(pages, max_chars)
+
+
+def _join_pages(pages, max_chars=None):
+    parts = []
+    total = 0
+    for text in pages:
+        parts.append(text)
+        total += len(text)
+        if max_chars is not None and total >= max_chars:
+            break
+    text = "".join(parts)
+    return text[:max_chars] if max_chars is not None else text
+
+
+def _read_bytes(pdf_file):
+    if isinstance(pdf_file, (str, os.PathLike)):
+        with open(pdf_file, "rb") as handle:
+            return handle.read()
+    if hasattr(pdf_file, "getvalue"):
+        return pdf_file.getvalue()
+    if hasattr(pdf_file, "seek"):
+        pdf_file.seek(0)
+    return pdf_file.read()
+
+
+def _extract_page_range(pdf_bytes, start, stop):
+    return list(iter_pdf_pages(io.BytesIO(pdf_bytes), start, stop))
+
+
+def _iter_pages_parallel(pdf_bytes, max_pages, workers, pages_per_task=None):
+    """Yield page texts in order while worker processes extract later chunks ahead of time"""
+    import PyPDF2
+
+    page_count = len(PyPDF2.PdfReader(io.BytesIO(pdf_bytes)).pages)
+    if max_pages is not None:
+        page_count = min(page_count, max_pages)
+    pages_per_task = pages_per_task or max(1, math.ceil(page_count / (workers * 2)))
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(_extract_page_range, pdf_bytes, start, min(start + pages_per_task, page_count))
+            for start in range(0, page_count, pages_per_task)
+        ]
+        try:
+            for future in futures:
+                yield from future.result()
+        finally:
+            # Reached when the caller stops early; skip chunks that have not started yet.
+            for future in futures:
+                future.cancel()
@@ -0,0 +1,43 @@
+import re
+
+# Every pattern is anchored with a lookbehind so a match can only start at the
+# beginning of a token or digit run. Greedy quantifiers never restart inside a
+# long run of digits, dashes, or word characters, so each scan stays linear in
+# the length of the text, even on malformed PDF output.
+
+EMAIL = re.compile(r"(?<![\w.-])[\w.-]+@[\w-]+(?:\.[\w-]+)+")
+
+# North American numbers, international numbers written with "+" (8-15 digits)
+# and national numbers with a leading trunk "0" (10-14 digits), e.g.
+# "(555) 123-4567", "+44 20 7946 0958", "+91 98765 43210", "09876543210".
+# Year ranges such as "2019-2023" match none of these forms. Repetitions are
+# bounded, so a long run of digits and separators is never rescanned.
+PHONE = re.compile(
+    r"(?<!\d)(?:"
+    r"\+\d(?:[\s().-]{0,2}\d){7,14}"
+    r"|0\d(?:[\s().-]{0,2}\d){8,12}"
+    r"|(?:\+\d{1,3}[-.\s]?)?(?:\(?\d{3}\)?[-.\s]?)?\d{3}[-.\s]?\d{4}"
+    r")(?!\d)"
+)
+
+URL = re.compile(r"https?://", re.IGNORECASE)
+
+# Patterns that scan every document open with a character class rather than a
+# lookbehind, so the engine skips straight to the characters a match can start
+# at; the lookbehind then runs one character later, e.g. ``\d(?<!\d\d)`` is a
+# digit that does not follow another digit, the same as ``(?<!\d)\d``.
+
+# One scan finds each quantified token; earlier alternatives take precedence, so
+# "$1,200" counts once as money and "5 years" as a unit rather than also as numbers.
+# ``match.lastgroup`` names the kind of token. The groups follow the shared first
+# character, so ``match.group()`` rather than the group is the whole token.
+QUANTIFIED = re.compile(
+    r"[$\d]"
+    r"(?:(?P<money>(?<=\$)\s?\d[\d,]*)"
+    r"|(?P<unit>(?<=\d)(?<!\w\d)\d*\s?(?:years|yrs|months|people|users|clients|projects)\b)"
+    r"|(?P<percent>(?<=\d)(?<!\w\d)\d*(?:\.\d+)?%)"
+    r"|(?P<number>(?<=\d)(?<!\w\d)\d*\+?\b))",
+    re.IGNORECASE,
+)
+
+EXPERIENCE_YEARS = re.compile(r"(\d(?<!\d\d)\d*)\+?\s*(?:years|yrs)", re.IGNORECASE)
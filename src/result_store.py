@@ -0,0 +1,467 @@
+import argparse
+import json
+import os
+import sys
+from array import array
+
+import numpy as np
+
+from boolean_query import is_operand, parse_boolean
+from nlp_utils import SECTIONS, WEAK_WORDS
+from taxonomy import get_taxonomy
+
+STORE_FORMAT = 1
+
+CONTACT_FIELDS = ["email", "phone", "linkedin", "github", "portfolio"]
+SECTION_NAMES = list(SECTIONS)
+WEAK_WORD_NAMES = list(WEAK_WORDS)
+
+# Percentages as returned by score_resume; float32 keeps two decimals exactly enough for ranking.
+PERCENT_FIELDS = [
+    "overall_score",
+    "similarity_score",
+    "skill_match_score",
+    "ats_score",
+    "experience_match",
+    "interview_readiness",
+    "keyword_coverage_score",
+    "contact_score",
+]
+COUNT_FIELDS = ["quantified_achievement_count", "estimated_experience_years"]
+SIGNAL_FIELDS = ["leadership_score", "collaboration_score", "project_score"]
+NUMERIC_FIELDS = PERCENT_FIELDS + COUNT_FIELDS + SIGNAL_FIELDS
+
+SKILL_COLUMNS = ["resume_skills", "job_skills", "matching_skills", "missing_skills"]
+KEYWORD_COLUMNS = ["resume_keywords", "job_keywords", "matching_keywords", "missing_keywords"]
+
+SCORE_DTYPE = np.dtype(
+    [(name, np.float32) for name in PERCENT_FIELDS]
+    + [(name, np.uint16) for name in COUNT_FIELDS]
+    + [(name, np.uint8) for name in SIGNAL_FIELDS]
+    + [
+        ("contact_bits", np.uint8),
+        ("section_bits", np.uint8),
+        ("weak_word_bits", np.uint8),
+        ("ai_analysis", np.bool_),
+    ]
+)
+
+_COMPARISONS = {">": np.greater, ">=": np.greater_equal, "<": np.less, "<=": np.less_equal, "==": np.equal, "!=": np.not_equal}
+# Query predicates and the column each one tests.
+_PREDICATES = {
+    "has": "resume_skills",
+    "requires": "job_skills",
+    "matches": "matching_skills",
+    "missing": "missing_skills",
+    "keyword": "resume_keywords",
+    "section": "section_bits",
+}
+
+
+def _bits(names, flags):
+    value = 0
+    for bit, name in enumerate(names):
+        if flags(name):
+            value |= 1 << bit
+    return value
+
+
+class ResultStoreBuilder:
+    """Accumulates ``score_resume`` results in compact form; :meth:`build` returns a :class:`ResultStore`.
+
+    Only the numbers, skills, keywords, sections, weak words and contact flags are
+    kept. The AI analysis's free text is dropped; only whether it came from the model is recorded.
+    """
+
+    def __init__(self):
+        self.skills = list(get_taxonomy().skills)
+        self._skill_ids = {skill: index for index, skill in enumerate(self.skills)}
+        self.keywords = []
+        self._keyword_ids = {}
+        self._candidate_ids = []
+        self._scores = []
+        self._skill_bits = {column: [] for column in SKILL_COLUMNS}
+        self._keyword_ids_flat = {column: array("i") for column in KEYWORD_COLUMNS}
+        self._keyword_offsets = {column: array("q", [0]) for column in KEYWORD_COLUMNS}
+
+    def __len__(self):
+        return len(self._scores)
+
+    def add(self, result, candidate_id=None):
+        """Add one score breakdown; ``candidate_id`` defaults to its ``candidate_id`` or ``file``, else its position."""
+        if candidate_id is None:
+            candidate_id = result.get("candidate_id", result.get("file", len(self._scores)))
+        contact = result["contact_details"]
+        found_sections = set(result["found_sections"])
+        weak_words = {weak for weak, _ in result["weak_words"]}
+        self._scores.append(
+            tuple(result[name] for name in PERCENT_FIELDS)
+            + tuple(min(int(result[name]), 0xFFFF) for name in COUNT_FIELDS)
+            + tuple(int(result[name]) for name in SIGNAL_FIELDS)
+            + (
+                _bits(CONTACT_FIELDS, lambda name: contact.get(name)),
+                _bits(SECTION_NAMES, found_sections.__contains__),
+                _bits(WEAK_WORD_NAMES, weak_words.__contains__),
+                result.get("ai_analysis", {}).get("analysis_source") == "ai",
+            )
+        )
+        for column in SKILL_COLUMNS:
+            value = 0
+            for skill in result[column]:
+                value |= 1 << self._id(skill, self._skill_ids, self.skills)
+            self._skill_bits[column].append(value)
+        for column in KEYWORD_COLUMNS:
+            ids = self._keyword_ids_flat[column]
+            ids.extend(self._id(keyword, self._keyword_ids, self.keywords) for keyword in result[column])
+            self._keyword_offsets[column].append(len(ids))
+        self._candidate_ids.append(candidate_id)
+
+    def build(self) -> "ResultStore":
+        words = max(1, -(-len(self.skills) // 64))
+        skill_columns = {}
+        for column, values in self._skill_bits.items():
+            bitset = np.zeros((len(values), words), dtype=np.uint64)
+            for row, value in enumerate(values):
+                for word in range(words):
+                    bitset[row, word] = (value >> (64 * word)) & 0xFFFFFFFFFFFFFFFF
+            skill_columns[column] = bitset
+        keyword_columns = {
+            column: (
+                np.frombuffer(self._keyword_offsets[column], dtype=np.int64).copy(),
+                np.frombuffer(self._keyword_ids_flat[column], dtype=np.int32).copy(),
+            )
+            for column in KEYWORD_COLUMNS
+        }
+        return ResultStore(
+            ids=np.asarray(self._candidate_ids),
+            scores=np.array(self._scores, dtype=SCORE_DTYPE),
+            skills=self.skills,
+            skill_columns=skill_columns,
+            keywords=self.keywords,
+            keyword_columns=keyword_columns,
+        )
+
+    @staticmethod
+    def _id(name, ids, names):
+        index = ids.get(name)
+        if index is None:
+            index = ids[name] = len(names)
+            names.append(name)
+        return index
+
+
+class CandidateRecord:
+    """One candidate in a :class:`ResultStore`, decoded on access.
+
+    Score fields are attributes (``record.ats_score``). The list-valued fields
+    decode from bitsets and keyword IDs, so weak words come back in
+    ``WEAK_WORDS`` order rather than the order they appear in the resume.
+    """
+
+    __slots__ = ("store", "row")
+
+    def __init__(self, store, row):
+        self.store = store
+        self.row = row
+
+    def __getattr__(self, name):
+        if name in PERCENT_FIELDS:
+            return round(self.store.scores[name][self.row].item(), 2)
+        if name in NUMERIC_FIELDS:
+            return self.store.scores[name][self.row].item()
+        if name in SKILL_COLUMNS:
+            return self.store.skill_names(name, self.row)
+        if name in KEYWORD_COLUMNS:
+            return self.store.keyword_names(name, self.row)
+        raise AttributeError(name)
+
+    @property
+    def candidate_id(self):
+        return self.store.ids[self.row].item()
+
+    @property
+    def contact_details(self):
+        bits = int(self.store.scores["contact_bits"][self.row])
+        return {name: bool(bits >> bit & 1) for bit, name in enumerate(CONTACT_FIELDS)}
+
+    @property
+    def found_sections(self):
+        bits = int(self.store.scores["section_bits"][self.row])
+        return [name for bit, name in enumerate(SECTION_NAMES) if bits >> bit & 1]
+
+    @property
+    def missing_sections(self):
+        found = set(self.found_sections)
+        return [name for name in SECTION_NAMES if name not in found]
+
+    @property
+    def weak_words(self):
+        bits = int(self.store.scores["weak_word_bits"][self.row])
+        return [(name, WEAK_WORDS[name]) for bit, name in enumerate(WEAK_WORD_NAMES) if bits >> bit & 1]
+
+    def to_dict(self):
+        """The stored fields in ``score_resume``'s shape, without the AI analysis text."""
+        record = {"candidate_id": self.candidate_id}
+        record.update((name, getattr(self, name)) for name in NUMERIC_FIELDS)
+        record.update((name, getattr(self, name)) for name in SKILL_COLUMNS + KEYWORD_COLUMNS)
+        record.update(
+            contact_details=self.contact_details,
+            found_sections=self.found_sections,
+            missing_sections=self.missing_sections,
+            weak_words=self.weak_words,
+            ai_analysis_source="ai" if self.store.scores["ai_analysis"][self.row] else "fallback",
+        )
+        return record
+
+    def __repr__(self):
+        return f"CandidateRecord({self.candidate_id!r}, overall_score={self.overall_score})"
+
+
+class ResultStore:
+    """Columnar store of scored candidates for ranking and filtering at scale.
+
+    Scores live in one NumPy structured array. Skills are bitsets over the
+    taxonomy plus any other skill names seen, and keywords are integer IDs into
+    a shared vocabulary. A candidate takes a few hundred bytes instead of a
+    dict of lists. :meth:`save` writes plain ``.npy`` files, which :meth:`load`
+    memory-maps, so opening a large store reads almost nothing up front.
+    """
+
+    def __init__(self, ids, scores, skills, skill_columns, keywords, keyword_columns):
+        self.ids = ids
+        self.scores = scores
+        self.skills = list(skills)
+        self.keywords = list(keywords)
+        self._skill_ids = {skill: index for index, skill in enumerate(self.skills)}
+        self._keyword_ids = {keyword: index for index, keyword in enumerate(self.keywords)}
+        self._skill_columns = skill_columns
+        self._keyword_columns = keyword_columns
+
+    @classmethod
+    def from_results(cls, results, candidate_ids=None) -> "ResultStore":
+        builder = ResultStoreBuilder()
+        if candidate_ids is None:
+            for result in results:
+                builder.add(result)
+        else:
+            for result, candidate_id in zip(results, candidate_ids):
+                builder.add(result, candidate_id)
+        return builder.build()
+
+    def __len__(self):
+        return len(self.scores)
+
+    def __getitem__(self, row) -> CandidateRecord:
+        if not -len(self) <= row < len(self):
+            raise IndexError(row)
+        return CandidateRecord(self, row % len(self))
+
+    def records(self, rows):
+        return [CandidateRecord(self, int(row)) for row in rows]
+
+    # Vectorised column tests, each returning one boolean per candidate.
+
+    def has_skill(self, skill, column="resume_skills") -> np.ndarray:
+        index = self._skill_ids.get(get_taxonomy().normalize(skill) or skill)
+        if index is None:
+            return np.zeros(len(self), dtype=bool)
+        words = self._skill_columns[column][:, index // 64]
+        return (words >> np.uint64(index % 64)) & np.uint64(1) == 1
+
+    def has_keyword(self, keyword, column="resume_keywords") -> np.ndarray:
+        mask = np.zeros(len(self), dtype=bool)
+        index = self._keyword_ids.get(keyword.lower())
+        if index is None:
+            return mask
+        offsets, ids = self._keyword_columns[column]
+        positions = np.flatnonzero(ids == index)
+        # Map each matching position back to the row whose [start, end) range holds it.
+        mask[np.searchsorted(offsets, positions, side="right") - 1] = True
+        return mask
+
+    def has_section(self, section) -> np.ndarray:
+        if section not in SECTION_NAMES:
+            raise ValueError(f"Unknown section {section!r}; expected one of {SECTION_NAMES}")
+        return (self.scores["section_bits"] >> SECTION_NAMES.index(section)) & 1 == 1
+
+    def mask(self, query) -> np.ndarray:
+        """Evaluate a filter such as ``has kubernetes AND ats_score > 70`` to a boolean mask.
+
+        Terms are ``has``/``requires``/``matches``/``missing <skill>``, ``keyword <word>``,
+        ``section <name>`` and ``<score field> <op> <number>`` with ``>``, ``>=``, ``<``,
+        ``<=``, ``==`` or ``!=``. They combine with upper-case ``AND``, ``OR``, ``NOT``
+        and parentheses, and adjacent terms are ANDed. Quote multi-word names.
+        """
+        return self._evaluate(parse_filter(query))
+
+    def query(self, query=None, sort_by="overall_score", top_k=None):
+        """Rows matching ``query`` (all rows when ``None``), best ``sort_by`` first, ties by row."""
+        rows = np.arange(len(self)) if query is None else np.flatnonzero(self.mask(query))
+        if sort_by is not None:
+            # Negated as float64, since unsigned count columns would wrap around.
+            values = -np.asarray(self.scores[sort_by][rows], dtype=np.float64)
+            if top_k is not None and top_k < len(rows):
+                keep = np.argpartition(values, top_k - 1)[:top_k]
+                rows, values = rows[keep], values[keep]
+            rows = rows[np.lexsort((rows, values))]
+        return rows[:top_k] if top_k is not None else rows
+
+    def skill_names(self, column, row):
+        words = self._skill_columns[column][row]
+        return [
+            skill for index, skill in enumerate(self.skills)
+            if int(words[index // 64]) >> (index % 64) & 1
+        ]
+
+    def keyword_names(self, column, row):
+        offsets, ids = self._keyword_columns[column]
+        return [self.keywords[index] for index in ids[offsets[row]:offsets[row + 1]]]
+
+    def nbytes(self) -> int:
+        """Bytes held by the columns, excluding the vocabularies."""
+        total = self.ids.nbytes + self.scores.nbytes
+        total += sum(column.nbytes for column in self._skill_columns.values())
+        total += sum(offsets.nbytes + ids.nbytes for offsets, ids in self._keyword_columns.values())
+        return total
+
+    def save(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        np.save(os.path.join(directory, "ids.npy"), self.ids)
+        np.save(os.path.join(directory, "scores.npy"), self.scores)
+        for column, bitset in self._skill_columns.items():
+            np.save(os.path.join(directory, f"{column}.npy"), bitset)
+        for column, (offsets, ids) in self._keyword_columns.items():
+            np.save(os.path.join(directory, f"{column}_offsets.npy"), offsets)
+            np.save(os.path.join(directory, f"{column}_ids.npy"), ids)
+        with open(os.path.join(directory, "meta.json"), "w", encoding="utf-8") as handle:
+            json.dump(
+                {
+                    "format": STORE_FORMAT,
+                    "count": len(self),
+                    "sections": SECTION_NAMES,
+                    "weak_words": WEAK_WORD_NAMES,
+                    "contact_fields": CONTACT_FIELDS,
+                    "skills": self.skills,
+                    "keywords": self.keywords,
+                },
+                handle,
+            )
+
+    @classmethod
+    def load(cls, directory, mmap=True) -> "ResultStore":
+        with open(os.path.join(directory, "meta.json"), encoding="utf-8") as handle:
+            meta = json.load(handle)
+        if meta.get("format") != STORE_FORMAT:
+            raise ValueError(f"{directory} holds result store format {meta.get('format')}, expected {STORE_FORMAT}")
+        if (meta["sections"], meta["weak_words"], meta["contact_fields"]) != (SECTION_NAMES, WEAK_WORD_NAMES, CONTACT_FIELDS):
+            raise ValueError(f"{directory} was written with different section, weak-word or contact definitions")
+
+        mode = "r" if mmap else None
+
+        def read(name):
+            return np.load(os.path.join(directory, f"{name}.npy"), mmap_mode=mode)
+
+        return cls(
+            ids=read("ids"),
+            scores=read("scores"),
+            skills=meta["skills"],
+            skill_columns={column: read(column) for column in SKILL_COLUMNS},
+            keywords=meta["keywords"],
+            keyword_columns={column: (read(f"{column}_offsets"), read(f"{column}_ids")) for column in KEYWORD_COLUMNS},
+        )
+
+    def _evaluate(self, node):
+        kind = node[0]
+        if kind == "and":
+            return self._evaluate(node[1]) & self._evaluate(node[2])
+        if kind == "or":
+            return self._evaluate(node[1]) | self._evaluate(node[2])
+        if kind == "not":
+            return ~self._evaluate(node[1])
+        if kind == "compare":
+            _, field, operator, value = node
+            column = self.scores[field]
+            if column.dtype.kind == "f":
+                # Compare at the stored precision, so "== 63.37" matches a stored 63.37.
+                value = column.dtype.type(value)
+            return _COMPARISONS[operator](column, value)
+        _, predicate, name = node
+        column = _PREDICATES[predicate]
+        if predicate == "section":
+            return self.has_section(name)
+        if predicate == "keyword":
+            return self.has_keyword(name, column)
+        return self.has_skill(name, column)
+
+
+def parse_filter(query):
+    """Parse a :meth:`ResultStore.mask` filter into a tree.
+
+    Nodes are ``("term", predicate, name)``, ``("compare", field, op, value)``,
+    ``("and", a, b)``, ``("or", a, b)`` and ``("not", a)``.
+    """
+
+    def parse_leaf(token, stream):
+        if token in _PREDICATES:
+            name = stream.peek()
+            if not is_operand(name):
+                raise ValueError(f"Expected a name after {token!r} in filter {query!r}")
+            stream.take()
+            return ("term", token, name.strip('"').lower())
+        if token in NUMERIC_FIELDS:
+            operator, value = stream.peek(), stream.peek(1)
+            if operator not in _COMPARISONS or value is None:
+                raise ValueError(f"Expected a comparison after {token!r} in filter {query!r}")
+            stream.take()
+            stream.take()
+            try:
+                return ("compare", token, operator, float(value))
+            except ValueError:
+                raise ValueError(f"Expected a number after {token} {operator} in filter {query!r}") from None
+        raise ValueError(
+            f"Unknown term {token!r} in filter {query!r}; use {', '.join(_PREDICATES)} or a score field"
+        )
+
+    return parse_boolean(query, parse_leaf, symbols=tuple(_COMPARISONS), kind="filter")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build and query compact stores of scored candidates.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build = commands.add_parser("build", help="Convert bulk_score JSONL output into a result store")
+    build.add_argument("results", help="JSONL file written by bulk_score.py")
+    build.add_argument("store", help="Output directory")
+
+    query = commands.add_parser("query", help="Filter and rank a result store")
+    query.add_argument("store", help="Store directory")
+    query.add_argument("filter", nargs="?", help='e.g. "has kubernetes AND ats_score > 70"')
+    query.add_argument("--sort", default="overall_score", choices=NUMERIC_FIELDS)
+    query.add_argument("--top", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        builder = ResultStoreBuilder()
+        skipped = 0
+        with open(args.results, encoding="utf-8") as handle:
+            for line in handle:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                if "error" in record:
+                    skipped += 1
+                    continue
+                builder.add(record)
+        store = builder.build()
+        store.save(args.store)
+        print(f"Stored {len(store)} candidates ({store.nbytes() / 1e6:.1f} MB) in {args.store}; skipped {skipped} errors", file=sys.stderr)
+        return
+
+    store = ResultStore.load(args.store)
+    rows = store.query(args.filter, sort_by=args.sort, top_k=args.top)
+    for record in store.records(rows):
+        print(json.dumps({"candidate_id": record.candidate_id, args.sort: getattr(record, args.sort)}))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,32 +1,415 @@
-from ai_analyzer import get_ai_recommendations
+import os
+import threading
+from collections.abc import Mapping
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from ai_analyzer import (
+    STREAM_COMPLETE,
+    analyze_many,
+    get_ai_model_name,
+    get_ai_recommendations,
+    get_analyzer,
+    get_fallback_recommendations,
+)
+from cache import get_result_cache, make_key
+from document import get_document
 from nlp_utils import (
+    TextBatch,
     analyze_sections,
+    calculate_similarities,
     calculate_similarity,
     count_quantified_achievements,
+    count_quantified_achievements_batch,
     detect_contact_details,
+    detect_contact_details_batch,
     estimate_experience_years,
+    estimate_experience_years_batch,
     extract_keywords,
     extract_role_signals,
+    extract_role_signals_batch,
     extract_skills,
     identify_weak_words,
-    preprocess_text,
     score_keyword_coverage,
 )
+from env import load_env
+from taxonomy import get_taxonomy
+from tracing import attach_timings, bind, span, trace, traced
+
+# Bump whenever scoring logic changes so cached results from older versions are ignored.
+SCORER_VERSION = "3"
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    """Background pool that lets the remote AI call and local feature extraction overlap."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                load_env()
+                workers = int(os.getenv("AI_REQUEST_WORKERS", "8"))
+                _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="score-bg")
+    return _executor
+
+
+def score_resume(resume_text, job_text, ai_analysis=None):
+    """Comprehensive resume scoring against a job description with AI analysis.
+
+    The remote AI call runs in the background while the local NLP features are
+    computed, so latency is the slower of the two rather than their sum. Pass
+    ``ai_analysis`` to reuse an analysis obtained elsewhere instead of calling the model.
+    With tracing enabled, the result carries per-stage ``timings`` in milliseconds.
+    """
+    with trace("score_resume") as timings:
+        result = _score_resume(get_document(resume_text), get_document(job_text), ai_analysis)
+    return attach_timings(result, timings)
+
+
+def _score_resume(resume_doc, job_doc, ai_analysis):
+    with span("cache_lookup"):
+        cache_key, model_name = _score_cache_key(resume_doc, job_doc)
+        cached = get_result_cache().get(cache_key)
+    if cached is not None:
+        return cached
+
+    ai_future = None
+    if ai_analysis is None:
+        ai_future = _get_executor().submit(bind(get_ai_recommendations), resume_doc.text, job_doc.text)
+
+    local_features = _local_features(resume_doc, job_doc)
+    if ai_future is not None:
+        with span("ai_wait"):
+            ai_analysis = ai_future.result()
+
+    with span("merge"):
+        result = _merge_ai_analysis(local_features, ai_analysis)
+    _cache_score(cache_key, model_name, result)
+    return result
+
+
+def score_resume_progressive(resume_text, job_text):
+    """Return a local-only score immediately plus a future for the AI-enriched score.
+
+    The local-only score uses the built-in fallback analysis in place of the
+    model's. The future resolves to the same result ``score_resume`` would return.
+    """
+    resume_doc = get_document(resume_text)
+    job_doc = get_document(job_text)
+
+    cache_key, model_name = _score_cache_key(resume_doc, job_doc)
+    full_result = Future()
+    cached = get_result_cache().get(cache_key)
+    if cached is not None:
+        full_result.set_result(cached)
+        return cached, full_result
+
+    ai_future = _get_executor().submit(bind(get_ai_recommendations), resume_doc.text, job_doc.text)
+    local_features = _local_features(resume_doc, job_doc)
+    local_result = _merge_ai_analysis(local_features, get_fallback_recommendations(resume_doc, job_doc))
+
+    def complete(future):
+        try:
+            result = _merge_ai_analysis(local_features, future.result())
+        except Exception as exc:
+            full_result.set_exception(exc)
+            return
+        _cache_score(cache_key, model_name, result)
+        full_result.set_result(result)
+
+    ai_future.add_done_callback(complete)
+    return local_result, full_result
+
+
+def score_resume_streaming(resume_text, job_text):
+    """Score a resume while streaming the AI analysis field by field.
+
+    Yields ``(field, value)`` for each AI field as soon as the model finishes it,
+    then ``(STREAM_COMPLETE, score_data)`` with the full result. Local features
+    are computed in the background while the stream is consumed.
+    """
+    resume_doc = get_document(resume_text)
+    job_doc = get_document(job_text)
+
+    cache_key, model_name = _score_cache_key(resume_doc, job_doc)
+    cached = get_result_cache().get(cache_key)
+    if cached is not None:
+        yield STREAM_COMPLETE, cached
+        return
+
+    local_future = _get_executor().submit(bind(_local_features), resume_doc, job_doc)
+    ai_analysis = None
+    for field, value in get_analyzer().stream_analysis(resume_doc.text, job_doc.text):
+        if field == STREAM_COMPLETE:
+            ai_analysis = value
+        else:
+            yield field, value
+
+    result = _merge_ai_analysis(local_future.result(), ai_analysis)
+    _cache_score(cache_key, model_name, result)
+    yield STREAM_COMPLETE, result
+
+
+def score_resumes(job_text, resumes, use_ai=False):
+    """Score many resumes against one job description with a single shared TF-IDF fit.
+
+    With ``use_ai`` the AI calls for every resume run in the background while the
+    local features are computed.
+    """
+    resume_docs = [get_document(text) for text in resumes]
+    if not resume_docs:
+        return []
+
+    job_doc = get_document(job_text)
+    ai_futures = None
+    if use_ai:
+        executor = _get_executor()
+        ai_futures = [
+            executor.submit(bind(get_ai_recommendations), resume_doc.text, job_doc.text) for resume_doc in resume_docs
+        ]
+    similarity_scores = calculate_similarities(resume_docs, job_doc)
+
+    results = []
+    for index, (resume_doc, similarity_score) in enumerate(zip(resume_docs, similarity_scores)):
+        local_features = _local_features(resume_doc, job_doc, similarity_score=float(similarity_score))
+        if ai_futures is not None:
+            with span("ai_wait"):
+                ai_analysis = ai_futures[index].result()
+        else:
+            ai_analysis = get_fallback_recommendations(resume_doc, job_doc)
+        results.append(_merge_ai_analysis(local_features, ai_analysis))
+    return results
+
+
+def score_resumes_for_job(job_text, resumes, use_ai=False):
+    """Score many resumes against one job description, each exactly as :func:`score_resume` would.
+
+    Job-side features are extracted once for the whole batch, but every
+    similarity is computed for its own pair (against the corpus model when one is
+    fitted), so a resume's score does not depend on which other resumes share the
+    batch. Results go through the result cache. Without ``use_ai`` the fallback
+    analysis is used, cached under the ``"fallback"`` model name.
+    """
+    job_doc = get_document(job_text)
+    job_features(job_doc)
+    resume_docs = [get_document(text) for text in resumes]
+    model_name = get_ai_model_name() if use_ai else "fallback"
+    cache_keys = [_score_cache_key(resume_doc, job_doc, model_name)[0] for resume_doc in resume_docs]
+    with span("cache_lookup"):
+        results = [get_result_cache().get(cache_key) for cache_key in cache_keys]
+    pending = [index for index, result in enumerate(results) if result is None]
+
+    ai_futures = {}
+    if use_ai:
+        executor = _get_executor()
+        ai_futures = {
+            index: executor.submit(bind(get_ai_recommendations), resume_docs[index].text, job_doc.text)
+            for index in pending
+        }
+    for index in pending:
+        resume_doc = resume_docs[index]
+        local_features = _local_features(resume_doc, job_doc)
+        if use_ai:
+            with span("ai_wait"):
+                ai_analysis = ai_futures[index].result()
+        else:
+            ai_analysis = get_fallback_recommendations(resume_doc, job_doc)
+        results[index] = _merge_ai_analysis(local_features, ai_analysis)
+        _cache_score(cache_keys[index], model_name, results[index])
+    return results
+
+
+async def score_many(pairs, concurrency=8, request_timeout=None, deadline=None, max_rate=None):
+    """Score many (resume, job description) pairs, running their AI analyses concurrently.
+
+    See :func:`ai_analyzer.analyze_many` for the concurrency, timeout, and rate-limit options.
+    Pairs whose AI call times out or fails are scored with the fallback analysis.
+    """
+    docs = [(get_document(resume_text), get_document(job_text)) for resume_text, job_text in pairs]
+    ai_analyses = await analyze_many(
+        [(resume_doc.text, job_doc.text) for resume_doc, job_doc in docs],
+        concurrency=concurrency,
+        request_timeout=request_timeout,
+        deadline=deadline,
+        max_rate=max_rate,
+    )
+    return [
+        score_resume(resume_doc, job_doc, ai_analysis=ai_analysis)
+        for (resume_doc, job_doc), ai_analysis in zip(docs, ai_analyses)
+    ]
+
+
+def rank_resumes(job_text, resumes, top_k=10, use_ai=False):
+    """Rank resumes against a job description and return the top-K score breakdowns.
+
+    ``resumes`` is either a sequence of resume texts or a mapping of candidate id
+    to resume text. Each returned entry is the full ``score_resume`` breakdown plus
+    ``rank`` and ``candidate_id``.
+    """
+    if isinstance(resumes, Mapping):
+        candidate_ids = list(resumes.keys())
+        resume_texts = list(resumes.values())
+    else:
+        resume_texts = list(resumes)
+        candidate_ids = list(range(len(resume_texts)))
+
+    return _rank(score_resumes(job_text, resume_texts, use_ai=use_ai), candidate_ids, top_k)
+
+
+def _rank(scores, candidate_ids, top_k):
+    order = sorted(range(len(scores)), key=lambda index: (-scores[index]["overall_score"], index))
+    if top_k is not None:
+        order = order[:top_k]
+
+    ranked = []
+    for rank, index in enumerate(order, start=1):
+        ranked.append({"rank": rank, "candidate_id": candidate_ids[index], **scores[index]})
+    return ranked
+
+
+class Shortlist:
+    """A fixed set of resumes prepared once for repeated scoring against edited job descriptions.
+
+    Resume-side features and TF-IDF rows are computed when the shortlist is
+    built, so each :meth:`rank` call costs the job description's own features
+    plus one sparse matrix-vector product. With a fitted corpus model the
+    similarities equal ``score_resume``'s. Otherwise IDF is fitted on the
+    shortlist itself, not refitted for every job description.
+    """
+
+    def __init__(self, resumes):
+        from corpus_model import get_corpus_model
+        from sklearn.feature_extraction.text import TfidfVectorizer
+
+        if isinstance(resumes, Mapping):
+            self.candidate_ids = list(resumes.keys())
+            texts = list(resumes.values())
+        else:
+            texts = list(resumes)
+            self.candidate_ids = list(range(len(texts)))
+        self._docs = [get_document(text) for text in texts]
+        for doc in self._docs:
+            resume_features(doc)
+
+        model = get_corpus_model()
+        if model.is_fitted:
+            self._transform = model.transform
+        else:
+            self._transform = TfidfVectorizer(stop_words="english").fit([doc.clean for doc in self._docs]).transform
+        self._matrix = self._transform([doc.clean for doc in self._docs]) if self._docs else None
+
+    def __len__(self):
+        return len(self._docs)
+
+    def similarities(self, job_text):
+        """Cosine similarity of every shortlisted resume to the job description."""
+        import numpy as np
+
+        if not self._docs:
+            return np.zeros(0)
+        job_vector = self._transform([get_document(job_text).clean])
+        # Rows are L2-normalised, so one sparse product gives every cosine.
+        return (self._matrix @ job_vector.T).toarray().ravel()
+
+    @traced("shortlist_score")
+    def score(self, job_text, use_ai=False):
+        """Score every shortlisted resume against ``job_text``, in shortlist order."""
+        job_doc = get_document(job_text)
+        ai_futures = None
+        if use_ai:
+            executor = _get_executor()
+            ai_futures = [executor.submit(bind(get_ai_recommendations), doc.text, job_doc.text) for doc in self._docs]
+
+        results = []
+        for index, (doc, similarity_score) in enumerate(zip(self._docs, self.similarities(job_doc))):
+            local_features = _local_features(doc, job_doc, similarity_score=float(similarity_score))
+            if ai_futures is not None:
+                ai_analysis = ai_futures[index].result()
+            else:
+                ai_analysis = get_fallback_recommendations(doc, job_doc)
+            results.append(_merge_ai_analysis(local_features, ai_analysis))
+        return results
+
+    def rank(self, job_text, top_k=10, use_ai=False):
+        """Like :func:`rank_resumes` over the shortlist, reusing its prepared resume features."""
+        return _rank(self.score(job_text, use_ai=use_ai), self.candidate_ids, top_k)
+
+
+def _scorer_version():
+    """Everything besides the inputs that changes a score: scoring logic, taxonomy, and corpus IDF."""
+    from corpus_model import get_corpus_model
+
+    return f"{SCORER_VERSION}/{get_taxonomy().version}/{get_corpus_model().fingerprint}"
+
+
+def _score_cache_key(resume_doc, job_doc, model_name=None):
+    if model_name is None:
+        model_name = get_ai_model_name()
+    return make_key("score_resume", resume_doc.text, job_doc.text, _scorer_version(), model_name), model_name
+
+
+def _cache_score(cache_key, model_name, result):
+    # A fallback produced by a failed AI call is not cached, so the next run retries the model.
+    if model_name == "fallback" or result["ai_analysis"].get("analysis_source") == "ai":
+        get_result_cache().set(cache_key, result)
+
+
+def resume_features(resume_text):
+    """Every resume-side input to the score, memoised per distinct resume text."""
+    return get_document(resume_text).feature(("resume_features", _scorer_version()), _resume_features)
+
+
+def _resume_features(resume_doc):
+    contact_details = detect_contact_details(resume_doc)
+    found_sections, missing_sections = analyze_sections(resume_doc)
+    return {
+        "resume_skills": extract_skills(resume_doc),
+        "resume_keywords": [kw[0] for kw in extract_keywords(resume_doc, 15)],
+        "found_sections": found_sections,
+        "missing_sections": missing_sections,
+        "weak_words": identify_weak_words(resume_doc),
+        "quantified_achievement_count": count_quantified_achievements(resume_doc),
+        "contact_details": contact_details,
+        "contact_score": sum(contact_details.values()) / max(len(contact_details), 1),
+        "estimated_experience_years": estimate_experience_years(resume_doc),
+        "role_signals": extract_role_signals(resume_doc),
+        "ats_score": _resume_ats_score(resume_doc),
+    }
+
+
+def job_features(job_text):
+    """Every job-description-side input to the score, memoised per distinct job description."""
+    return get_document(job_text).feature(("job_features", _scorer_version()), _job_features)
+
+
+def _job_features(job_doc):
+    return {
+        "job_skills": extract_skills(job_doc),
+        "job_keywords": [kw[0] for kw in extract_keywords(job_doc, 15)],
+    }
+
 
+def _local_features(resume_doc, job_doc, similarity_score=None):
+    """Combine the memoised resume and job features with their similarity.
 
-def score_resume(resume_text, job_text):
-    """Comprehensive resume scoring against a job description with AI analysis."""
-    ai_analysis = get_ai_recommendations(resume_text, job_text)
+    Only the similarity depends on both documents, so changing one side leaves
+    the other side's features cached.
+    """
+    if similarity_score is None:
+        similarity_score = calculate_similarity(resume_doc, job_doc)
+    return {"similarity_score": similarity_score, **resume_features(resume_doc), **job_features(job_doc)}
 
-    resume_clean = preprocess_text(resume_text)
-    job_clean = preprocess_text(job_text)
-    similarity_score = calculate_similarity(resume_clean, job_clean)
 
-    resume_skills = extract_skills(resume_text)
-    job_skills = extract_skills(job_text)
+def _merge_ai_analysis(local_features, ai_analysis):
+    """Combine the local features with an AI analysis into the final score breakdown."""
+    similarity_score = local_features["similarity_score"]
+    resume_skills = local_features["resume_skills"]
+    job_skills = local_features["job_skills"]
 
-    ai_matching_skills = ai_analysis.get("matching_skills", [])
-    ai_missing_skills = ai_analysis.get("missing_critical_skills", [])
+    taxonomy = get_taxonomy()
+    ai_matching_skills = taxonomy.canonicalize(ai_analysis.get("matching_skills", []))
+    ai_missing_skills = taxonomy.canonicalize(ai_analysis.get("missing_critical_skills", []))
 
     matching_skills = list(set(set(resume_skills) & set(job_skills)).union(ai_matching_skills))
     missing_skills = list(set(set(job_skills) - set(resume_skills)).union(ai_missing_skills))
@@ -37,22 +420,17 @@ def score_resume(resume_text, job_text):
     else:
         skill_match_score = 0
 
-    resume_keywords = [kw[0] for kw in extract_keywords(resume_text, 15)]
-    job_keywords = [kw[0] for kw in extract_keywords(job_text, 15)]
+    resume_keywords = local_features["resume_keywords"]
+    job_keywords = local_features["job_keywords"]
     matching_keywords = set(resume_keywords) & set(job_keywords)
     missing_keywords = list((set(job_keywords) - set(resume_keywords)).union(ai_analysis.get("keyword_gaps", [])))
     keyword_coverage = score_keyword_coverage(resume_keywords, job_keywords)
 
-    found_sections, missing_sections = analyze_sections(resume_text)
-    weak_words = identify_weak_words(resume_text)
+    quantified_achievement_count = local_features["quantified_achievement_count"]
+    contact_score = local_features["contact_score"]
+    role_signals = local_features["role_signals"]
 
-    quantified_achievement_count = count_quantified_achievements(resume_text)
-    contact_details = detect_contact_details(resume_text)
-    contact_score = sum(contact_details.values()) / max(len(contact_details), 1)
-    estimated_experience_years = estimate_experience_years(resume_text)
-    role_signals = extract_role_signals(resume_text)
-
-    ats_score = calculate_ats_score(resume_text, job_text)
+    ats_score = local_features["ats_score"]
     experience_match = float(ai_analysis.get("experience_match", 70)) / 100
     interview_readiness = float(ai_analysis.get("interview_readiness", 65)) / 100
 
@@ -77,49 +455,111 @@ def score_resume(resume_text, job_text):
         "keyword_coverage_score": round(keyword_coverage * 100, 2),
         "contact_score": round(contact_score * 100, 2),
         "quantified_achievement_count": quantified_achievement_count,
-        "estimated_experience_years": estimated_experience_years,
-        "contact_details": contact_details,
+        "estimated_experience_years": local_features["estimated_experience_years"],
+        "contact_details": dict(local_features["contact_details"]),
         "leadership_score": role_signals["leadership_score"],
         "collaboration_score": role_signals["collaboration_score"],
         "project_score": role_signals["project_score"],
-        "resume_skills": resume_skills,
-        "job_skills": job_skills,
+        # Copies, so callers editing a result cannot change the memoised features.
+        "resume_skills": list(resume_skills),
+        "job_skills": list(job_skills),
         "matching_skills": matching_skills,
         "missing_skills": missing_skills,
-        "resume_keywords": resume_keywords,
-        "job_keywords": job_keywords,
+        "resume_keywords": list(resume_keywords),
+        "job_keywords": list(job_keywords),
         "matching_keywords": list(matching_keywords),
         "missing_keywords": missing_keywords,
-        "found_sections": found_sections,
-        "missing_sections": missing_sections,
-        "weak_words": weak_words,
+        "found_sections": list(local_features["found_sections"]),
+        "missing_sections": list(local_features["missing_sections"]),
+        "weak_words": list(local_features["weak_words"]),
         "ai_analysis": ai_analysis,
     }
 
 
 def calculate_ats_score(resume_text, job_text):
-    """Calculate ATS compatibility score."""
+    """Calculate ATS compatibility score.
+
+    The score depends only on the resume; ``job_text`` is accepted for compatibility.
+    """
+    return _resume_ats_score(get_document(resume_text))
+
+
+@traced("ats_score")
+def _resume_ats_score(resume_doc):
     score = 0.8
 
-    if len(resume_text.split()) < 200:
+    if len(resume_doc.tokens) < 200:
         score -= 0.2
 
-    if "pdf" in resume_text.lower() or "image" in resume_text.lower():
+    if "pdf" in resume_doc.lowered or "image" in resume_doc.lowered:
         score -= 0.1
 
     for section in ["experience", "education", "skills"]:
-        if section in resume_text.lower():
+        if section in resume_doc.lowered:
             score += 0.05
 
-    if not detect_contact_details(resume_text)["email"]:
+    if not detect_contact_details(resume_doc)["email"]:
         score -= 0.1
 
-    if count_quantified_achievements(resume_text) >= 3:
+    if count_quantified_achievements(resume_doc) >= 3:
         score += 0.05
 
     return min(max(score, 0), 1.0)
 
 
+@traced("ats_score_batch")
+def calculate_ats_scores(resume_texts):
+    """:func:`calculate_ats_score` for many resumes, as a float array.
+
+    ``resume_texts`` may be a sequence, a pandas Series or a :class:`TextBatch`.
+    The adjustments are applied in the same order as the scalar version, so the
+    scores are identical to the last bit.
+    """
+    batch = resume_texts if isinstance(resume_texts, TextBatch) else TextBatch(resume_texts)
+    return _ats_scores(
+        batch,
+        detect_contact_details_batch(batch)["email"].to_numpy(),
+        count_quantified_achievements_batch(batch),
+    )
+
+
+def _ats_scores(batch, has_email, quantified):
+    import numpy as np
+
+    token_counts = np.fromiter((len(text.split()) for text in batch.texts), dtype=np.int64, count=len(batch))
+    score = np.full(len(batch), 0.8)
+    score = np.where(token_counts < 200, score - 0.2, score)
+    score = np.where(batch.contains("pdf", lowered=True) | batch.contains("image", lowered=True), score - 0.1, score)
+    for section in ["experience", "education", "skills"]:
+        score = np.where(batch.contains(section, lowered=True), score + 0.05, score)
+    score = np.where(has_email, score, score - 0.1)
+    score = np.where(quantified >= 3, score + 0.05, score)
+    return np.clip(score, 0, 1.0)
+
+
+@traced("features_batch")
+def extract_features_batch(resume_texts):
+    """The resume-only regex features of many resumes as one DataFrame, one row per resume.
+
+    Columns are ``quantified_achievements``, ``experience_years``, the contact
+    flags, the role-signal scores and ``ats_score``; a Series input keeps its index.
+    Values equal the per-document functions', but are not memoised on the documents.
+    """
+    batch = resume_texts if isinstance(resume_texts, TextBatch) else TextBatch(resume_texts)
+    contact = detect_contact_details_batch(batch)
+    role_signals = extract_role_signals_batch(batch)
+    quantified = count_quantified_achievements_batch(batch)
+    columns = {
+        "quantified_achievements": quantified,
+        "experience_years": estimate_experience_years_batch(batch),
+    }
+    # Columns go in as arrays so a Series input with a duplicate index still lines up row by row.
+    columns.update((name, contact[name].to_numpy()) for name in contact.columns)
+    columns.update((name, role_signals[name].to_numpy()) for name in role_signals.columns)
+    columns["ats_score"] = _ats_scores(batch, columns["email"], quantified)
+    return batch.frame(columns)
+
+
 def generate_suggestions(score_data):
     """Generate comprehensive improvement suggestions."""
     suggestions = {
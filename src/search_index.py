@@ -0,0 +1,342 @@
+import argparse
+import math
+import os
+import sqlite3
+import threading
+from collections import Counter
+from collections.abc import Mapping
+from contextlib import closing
+
+from boolean_query import parse_boolean
+from document import as_document
+from nlp_utils import english_stop_words, extract_keywords, extract_skills
+from taxonomy import get_taxonomy
+
+# Keywords indexed per resume on top of its plain tokens.
+INDEX_KEYWORDS = 20
+
+
+def encode_postings(postings, previous_doc_id=0) -> bytes:
+    """Varint-encode ascending ``(doc_id, term_frequency)`` pairs, storing each id as a gap."""
+    out = bytearray()
+    for doc_id, frequency in postings:
+        for value in (doc_id - previous_doc_id, frequency):
+            while value >= 0x80:
+                out.append((value & 0x7F) | 0x80)
+                value >>= 7
+            out.append(value)
+        previous_doc_id = doc_id
+    return bytes(out)
+
+
+def decode_postings(data):
+    """Yield the ``(doc_id, term_frequency)`` pairs written by :func:`encode_postings`."""
+    doc_id = 0
+    values = []
+    value = shift = 0
+    for byte in data:
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+            continue
+        values.append(value)
+        value = shift = 0
+        if len(values) == 2:
+            doc_id += values[0]
+            yield doc_id, values[1]
+            values.clear()
+
+
+def parse_query(query):
+    """Parse a boolean query such as ``kubernetes AND (go OR rust) NOT php`` into a tree.
+
+    ``AND``, ``OR`` and ``NOT`` must be upper case; adjacent terms are ANDed;
+    quoted phrases are single terms. Nodes are ``("term", t)``, ``("and", a, b)``,
+    ``("or", a, b)`` and ``("not", a)``.
+    """
+    return parse_boolean(query, lambda token, stream: ("term", normalize_term(token.strip('"'))))
+
+
+def normalize_term(term):
+    """Map a query term onto the indexed vocabulary: canonical skill names, else cleaned words."""
+    return get_taxonomy().normalize(term) or as_document(term).clean
+
+
+def _positive_terms(node):
+    if node[0] == "term":
+        return [node[1]]
+    if node[0] == "not":
+        return []
+    return _positive_terms(node[1]) + _positive_terms(node[2])
+
+
+class ResumeIndex:
+    """Inverted index over resumes for boolean filtering and BM25 ranking.
+
+    Each resume contributes its tokens (minus stop words), its skills and its top
+    keywords. Posting lists hold ``(doc_id, term_frequency)`` pairs, delta- and
+    varint-encoded. Document ids only grow, so adding a resume appends to the
+    end of each list; removing one records a tombstone until :meth:`compact`.
+    With a ``path``, :meth:`save` writes only what changed since the last save.
+    """
+
+    def __init__(self, path=None, k1=1.5, b=0.75):
+        self.path = path
+        self.k1 = k1
+        self.b = b
+        self._postings = {}
+        self._last_doc = {}
+        self._doc_lengths = {}
+        self._candidate_ids = {}
+        self._doc_ids = {}
+        self._deleted = set()
+        self._next_doc_id = 1
+        self._total_length = 0
+        self._dirty_terms = set()
+        self._dropped_terms = set()
+        self._dirty_docs = set()
+        self._lock = threading.RLock()
+        if path and os.path.exists(path):
+            self._load(path)
+
+    def __len__(self):
+        return len(self._doc_lengths)
+
+    def __contains__(self, candidate_id):
+        return candidate_id in self._doc_ids
+
+    def add(self, candidate_id, text):
+        """Index a resume, replacing any earlier version with the same candidate id."""
+        term_counts = self._document_terms(text)
+        with self._lock:
+            if candidate_id in self._doc_ids:
+                self.remove(candidate_id)
+            doc_id = self._next_doc_id
+            self._next_doc_id += 1
+            for term, frequency in term_counts.items():
+                encoded = encode_postings([(doc_id, frequency)], self._last_doc.get(term, 0))
+                self._postings.setdefault(term, bytearray()).extend(encoded)
+                self._last_doc[term] = doc_id
+                self._dirty_terms.add(term)
+            length = sum(term_counts.values())
+            self._doc_lengths[doc_id] = length
+            self._total_length += length
+            self._candidate_ids[doc_id] = candidate_id
+            self._doc_ids[candidate_id] = doc_id
+            self._dirty_docs.add(doc_id)
+            return doc_id
+
+    def remove(self, candidate_id):
+        """Drop a resume from results; its postings are reclaimed by :meth:`compact`."""
+        with self._lock:
+            doc_id = self._doc_ids.pop(candidate_id, None)
+            if doc_id is None:
+                return False
+            del self._candidate_ids[doc_id]
+            self._total_length -= self._doc_lengths.pop(doc_id)
+            self._deleted.add(doc_id)
+            self._dirty_docs.add(doc_id)
+            return True
+
+    def match(self, query):
+        """Candidate ids matching a boolean query."""
+        with self._lock:
+            return {self._candidate_ids[doc_id] for doc_id in self._evaluate(parse_query(query))}
+
+    def search(self, query, top_k=None):
+        """Candidates matching a boolean query, ranked by BM25 over the query's non-negated terms."""
+        tree = parse_query(query)
+        with self._lock:
+            return self._rank(_positive_terms(tree), self._evaluate(tree), top_k)
+
+    def rank_terms(self, terms, top_k=None, query=None):
+        """Rank candidates containing any of ``terms`` by BM25, optionally within a boolean query's matches."""
+        terms = [normalize_term(term) for term in terms]
+        with self._lock:
+            allowed = self._evaluate(parse_query(query)) if query else None
+            return self._rank(terms, allowed, top_k)
+
+    def compact(self):
+        """Rewrite posting lists without removed resumes."""
+        with self._lock:
+            if not self._deleted:
+                return
+            for term in list(self._postings):
+                live = [posting for posting in decode_postings(self._postings[term]) if posting[0] not in self._deleted]
+                if live:
+                    self._postings[term] = bytearray(encode_postings(live))
+                    self._last_doc[term] = live[-1][0]
+                    self._dirty_terms.add(term)
+                else:
+                    del self._postings[term]
+                    del self._last_doc[term]
+                    self._dirty_terms.discard(term)
+                    self._dropped_terms.add(term)
+            self._deleted.clear()
+
+    def save(self, path=None):
+        """Persist to SQLite; saving back to the index's own path only writes changes."""
+        path = path or self.path
+        if not path:
+            raise ValueError("No path to save the index to")
+        incremental = path == self.path and os.path.exists(path)
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self._lock, closing(sqlite3.connect(path)) as db, db:
+            db.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER);
+                CREATE TABLE IF NOT EXISTS documents (doc_id INTEGER PRIMARY KEY, candidate_id UNIQUE, length INTEGER);
+                CREATE TABLE IF NOT EXISTS postings (term TEXT PRIMARY KEY, last_doc INTEGER, data BLOB);
+                CREATE TABLE IF NOT EXISTS deleted (doc_id INTEGER PRIMARY KEY);
+                """
+            )
+            if incremental:
+                terms = self._dirty_terms
+                doc_ids = self._dirty_docs
+                db.executemany("DELETE FROM postings WHERE term = ?", ((term,) for term in self._dropped_terms))
+            else:
+                for table in ("documents", "postings", "deleted"):
+                    db.execute(f"DELETE FROM {table}")
+                terms = self._postings
+                doc_ids = set(self._doc_lengths) | self._deleted
+
+            db.executemany(
+                "INSERT OR REPLACE INTO postings (term, last_doc, data) VALUES (?, ?, ?)",
+                ((term, self._last_doc[term], bytes(self._postings[term])) for term in terms),
+            )
+            db.executemany("DELETE FROM documents WHERE doc_id = ?", ((doc_id,) for doc_id in doc_ids))
+            db.executemany(
+                "INSERT INTO documents (doc_id, candidate_id, length) VALUES (?, ?, ?)",
+                (
+                    (doc_id, self._candidate_ids[doc_id], self._doc_lengths[doc_id])
+                    for doc_id in doc_ids if doc_id in self._doc_lengths
+                ),
+            )
+            db.execute("DELETE FROM deleted")
+            db.executemany("INSERT INTO deleted (doc_id) VALUES (?)", ((doc_id,) for doc_id in self._deleted))
+            db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('next_doc_id', ?)", (self._next_doc_id,))
+
+            self.path = path
+            self._dirty_terms = set()
+            self._dropped_terms = set()
+            self._dirty_docs = set()
+
+    def _load(self, path):
+        with closing(sqlite3.connect(path)) as db:
+            row = db.execute("SELECT value FROM meta WHERE key = 'next_doc_id'").fetchone()
+            self._next_doc_id = row[0] if row else 1
+            for doc_id, candidate_id, length in db.execute("SELECT doc_id, candidate_id, length FROM documents"):
+                self._doc_lengths[doc_id] = length
+                self._candidate_ids[doc_id] = candidate_id
+                self._doc_ids[candidate_id] = doc_id
+                self._total_length += length
+            for term, last_doc, data in db.execute("SELECT term, last_doc, data FROM postings"):
+                self._postings[term] = bytearray(data)
+                self._last_doc[term] = last_doc
+            self._deleted = {doc_id for (doc_id,) in db.execute("SELECT doc_id FROM deleted")}
+
+    def _document_terms(self, text):
+        doc = as_document(text)
+        stop_words = english_stop_words()
+        term_counts = Counter(token for token in doc.clean.split() if token not in stop_words)
+        # Multi-word skills and keyword bigrams are indexed as single terms.
+        for term in extract_skills(doc) + [keyword for keyword, _ in extract_keywords(doc, INDEX_KEYWORDS)]:
+            term_counts[term] = max(term_counts[term], 1)
+        return term_counts
+
+    def _postings_for(self, term):
+        data = self._postings.get(term)
+        if data is None:
+            return []
+        return [posting for posting in decode_postings(data) if posting[0] not in self._deleted]
+
+    def _evaluate(self, node):
+        kind = node[0]
+        if kind == "term":
+            return {doc_id for doc_id, _ in self._postings_for(node[1])}
+        if kind == "not":
+            return set(self._doc_lengths) - self._evaluate(node[1])
+        left = self._evaluate(node[1])
+        if kind == "and":
+            return left & self._evaluate(node[2]) if left else left
+        return left | self._evaluate(node[2])
+
+    def _rank(self, terms, allowed, top_k):
+        document_count = len(self._doc_lengths)
+        if not document_count or allowed is not None and not allowed:
+            return []
+        average_length = self._total_length / document_count
+
+        scores = Counter()
+        for term in dict.fromkeys(terms):
+            postings = self._postings_for(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (document_count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for doc_id, frequency in postings:
+                if allowed is not None and doc_id not in allowed:
+                    continue
+                norm = self.k1 * (1 - self.b + self.b * self._doc_lengths[doc_id] / average_length)
+                scores[doc_id] += idf * frequency * (self.k1 + 1) / (frequency + norm)
+
+        if allowed is not None:
+            # Boolean matches with no positively scored term still belong in the results.
+            for doc_id in allowed:
+                scores.setdefault(doc_id, 0.0)
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        if top_k is not None:
+            ranked = ranked[:top_k]
+        return [(self._candidate_ids[doc_id], score) for doc_id, score in ranked]
+
+
+def job_terms(job_text):
+    """Query terms for a job description: its skills followed by its top keywords."""
+    job_doc = as_document(job_text)
+    return extract_skills(job_doc) + [keyword for keyword, _ in extract_keywords(job_doc, INDEX_KEYWORDS)]
+
+
+def retrieve_and_rank(job_text, index, resumes, query=None, shortlist=300, top_k=10, use_ai=False):
+    """Two-stage search: BM25-retrieve a shortlist from the index, then run the full scorer on it.
+
+    ``resumes`` maps candidate id to resume text, or is a callable returning the
+    text for a candidate id, so only shortlisted resumes are loaded. ``query``
+    is an optional boolean filter such as ``"kubernetes AND (go OR rust)"``.
+    """
+    from scorer import rank_resumes
+
+    hits = index.rank_terms(job_terms(job_text), top_k=shortlist, query=query)
+    load = resumes.__getitem__ if isinstance(resumes, Mapping) else resumes
+    return rank_resumes(job_text, {candidate_id: load(candidate_id) for candidate_id, _ in hits}, top_k=top_k, use_ai=use_ai)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build or query a resume search index.")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+    build = subcommands.add_parser("add", help="Index a directory or archive of resumes")
+    build.add_argument("input", help="Directory, .zip, or .tar(.gz) of PDF/TXT resumes")
+    build.add_argument("--index", required=True, help="SQLite index file (created if missing)")
+    search = subcommands.add_parser("search", help="Run a boolean query against an index")
+    search.add_argument("query", help='Boolean query, e.g. "kubernetes AND (go OR rust)"')
+    search.add_argument("--index", required=True)
+    search.add_argument("--top-k", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    index = ResumeIndex(args.index)
+    if args.command == "add":
+        from bulk_score import iter_resume_texts
+
+        for name, text in iter_resume_texts(args.input):
+            index.add(name, text)
+        index.compact()
+        index.save()
+        print(f"Indexed {len(index)} resumes in {args.index}")
+    else:
+        for candidate_id, score in index.search(args.query, top_k=args.top_k):
+            print(f"{score:8.3f}  {candidate_id}")
+
+
+if __name__ == "__main__":
+    main()
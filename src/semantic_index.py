@@ -0,0 +1,286 @@
+import argparse
+import json
+import math
+import os
+
+import numpy as np
+
+from corpus_model import get_corpus_model
+
+DEFAULT_PROJECTION_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "lsa_projection.npz")
+
+# Storage types for indexed vectors; int8 keeps one float32 scale per vector.
+VECTOR_DTYPES = {"float32": np.float32, "float16": np.float16, "int8": np.int8}
+
+# Rows projected or assigned per step, which bounds peak memory while building.
+_BATCH_SIZE = 4096
+
+
+def _normalize_rows(matrix):
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1
+    return matrix / norms
+
+
+class LsaProjection:
+    """Dense LSA embedding of texts: corpus TF-IDF rows projected onto truncated SVD components."""
+
+    def __init__(self, components, fingerprint):
+        self.components = np.asarray(components, dtype=np.float32)
+        self.fingerprint = fingerprint
+
+    @property
+    def dimensions(self) -> int:
+        return self.components.shape[0]
+
+    @classmethod
+    def fit(cls, texts, dimensions=256, model=None):
+        """Fit the projection offline on a sample of resumes and job descriptions."""
+        from sklearn.decomposition import TruncatedSVD
+
+        model = model or get_corpus_model()
+        if not model.is_fitted:
+            raise ValueError("LSA needs a fitted corpus model; run corpus_model.py fit first")
+        matrix = model.transform(texts)
+        dimensions = min(dimensions, matrix.shape[1] - 1, matrix.shape[0] - 1)
+        svd = TruncatedSVD(n_components=dimensions, random_state=0).fit(matrix)
+        return cls(svd.components_, model.fingerprint)
+
+    def transform(self, texts, model=None) -> np.ndarray:
+        """L2-normalised float32 embeddings, one row per text."""
+        model = model or get_corpus_model()
+        if model.fingerprint != self.fingerprint:
+            raise ValueError("The corpus model changed since this projection was fitted; refit it")
+        return _normalize_rows(np.asarray(model.transform(texts) @ self.components.T, dtype=np.float32))
+
+    def save(self, path=DEFAULT_PROJECTION_PATH):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        np.savez_compressed(path, components=self.components, fingerprint=np.asarray(self.fingerprint))
+
+    @classmethod
+    def load(cls, path=DEFAULT_PROJECTION_PATH):
+        with np.load(path, allow_pickle=False) as archive:
+            return cls(archive["components"], str(archive["fingerprint"]))
+
+
+class IVFIndex:
+    """Inverted-file approximate nearest-neighbour index over L2-normalised vectors.
+
+    Vectors are clustered with spherical k-means and stored grouped by cluster,
+    so a query scores the ``n_probe`` closest centroids and then reads only those
+    clusters' contiguous slices. The vector file is memory-mapped, so RAM use is
+    the centroids plus whatever clusters queries touch. Vectors can be stored as
+    float32, float16 or int8 (with one scale per vector).
+    """
+
+    def __init__(self, directory, centroids, offsets, ids, vectors, scales=None):
+        self.directory = directory
+        self.centroids = centroids
+        self.offsets = offsets
+        self.ids = ids
+        self.vectors = vectors
+        self.scales = scales
+
+    def __len__(self):
+        return len(self.ids)
+
+    @classmethod
+    def build(cls, directory, vectors, ids, n_lists=None, dtype="float16", iterations=10, sample_size=None):
+        """Cluster ``vectors`` (rows L2-normalised, may be a memmap) and write the index to ``directory``."""
+        if dtype not in VECTOR_DTYPES:
+            raise ValueError(f"dtype must be one of {sorted(VECTOR_DTYPES)}")
+        count = len(vectors)
+        if count == 0 or count != len(ids):
+            raise ValueError("Need one id per vector and at least one vector")
+        n_lists = min(count, n_lists or max(1, int(4 * math.sqrt(count))))
+
+        rng = np.random.default_rng(0)
+        sample_size = min(count, sample_size or n_lists * 64)
+        sample = np.asarray(vectors[np.sort(rng.choice(count, sample_size, replace=False))], dtype=np.float32)
+        centroids = _spherical_kmeans(sample, n_lists, iterations, rng)
+
+        assignments = np.concatenate([
+            np.argmax(np.asarray(vectors[start:start + _BATCH_SIZE], dtype=np.float32) @ centroids.T, axis=1)
+            for start in range(0, count, _BATCH_SIZE)
+        ])
+        order = np.argsort(assignments, kind="stable")
+        offsets = np.zeros(n_lists + 1, dtype=np.int64)
+        np.cumsum(np.bincount(assignments, minlength=n_lists), out=offsets[1:])
+
+        os.makedirs(directory, exist_ok=True)
+        stored = np.lib.format.open_memmap(
+            os.path.join(directory, "vectors.npy"), mode="w+", dtype=VECTOR_DTYPES[dtype], shape=(count, vectors.shape[1])
+        )
+        scales = np.ones(count, dtype=np.float32)
+        for start in range(0, count, _BATCH_SIZE):
+            rows = order[start:start + _BATCH_SIZE]
+            # Rows are read in ascending order for locality, then placed back in cluster order.
+            ascending = np.argsort(rows)
+            batch = np.empty((len(rows), vectors.shape[1]), dtype=np.float32)
+            batch[ascending] = vectors[rows[ascending]]
+            if dtype == "int8":
+                batch_scales = np.abs(batch).max(axis=1) / 127
+                batch_scales[batch_scales == 0] = 1
+                scales[start:start + len(batch)] = batch_scales
+                batch = np.round(batch / batch_scales[:, None])
+            stored[start:start + len(batch)] = batch
+        stored.flush()
+        del stored
+
+        np.save(os.path.join(directory, "centroids.npy"), centroids)
+        np.save(os.path.join(directory, "offsets.npy"), offsets)
+        np.save(os.path.join(directory, "ids.npy"), np.asarray(ids)[order])
+        if dtype == "int8":
+            np.save(os.path.join(directory, "scales.npy"), scales)
+        with open(os.path.join(directory, "meta.json"), "w", encoding="utf-8") as handle:
+            json.dump({"dtype": dtype, "dimensions": int(vectors.shape[1]), "count": count, "lists": n_lists}, handle)
+        return cls.load(directory)
+
+    @classmethod
+    def load(cls, directory):
+        """Open an index, memory-mapping the vectors and ids rather than reading them into RAM."""
+        with open(os.path.join(directory, "meta.json"), encoding="utf-8") as handle:
+            meta = json.load(handle)
+        scales = np.load(os.path.join(directory, "scales.npy"), mmap_mode="r") if meta["dtype"] == "int8" else None
+        return cls(
+            directory,
+            centroids=np.load(os.path.join(directory, "centroids.npy")),
+            offsets=np.load(os.path.join(directory, "offsets.npy")),
+            ids=np.load(os.path.join(directory, "ids.npy"), mmap_mode="r"),
+            vectors=np.load(os.path.join(directory, "vectors.npy"), mmap_mode="r"),
+            scales=scales,
+        )
+
+    def search(self, query, k=10, n_probe=8):
+        """Return up to ``k`` ``(id, cosine)`` pairs from the ``n_probe`` closest clusters."""
+        query = _normalize_rows(np.asarray(query, dtype=np.float32).reshape(1, -1))[0]
+        n_probe = min(n_probe, len(self.centroids))
+        probed = np.argpartition(-(self.centroids @ query), n_probe - 1)[:n_probe]
+
+        positions = []
+        scores = []
+        for cluster in probed:
+            start, end = int(self.offsets[cluster]), int(self.offsets[cluster + 1])
+            if start == end:
+                continue
+            cluster_scores = np.asarray(self.vectors[start:end], dtype=np.float32) @ query
+            if self.scales is not None:
+                cluster_scores *= self.scales[start:end]
+            positions.append(np.arange(start, end))
+            scores.append(cluster_scores)
+        if not scores:
+            return []
+
+        positions = np.concatenate(positions)
+        scores = np.concatenate(scores)
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(self.ids[positions[index]].item(), float(scores[index])) for index in top]
+
+
+def _spherical_kmeans(sample, n_lists, iterations, rng):
+    centroids = sample[rng.choice(len(sample), n_lists, replace=False)].copy()
+    for _ in range(iterations):
+        assignments = np.argmax(sample @ centroids.T, axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignments, sample)
+        empty = ~sums.any(axis=1)
+        # Re-seed clusters that lost every member so all lists stay in use.
+        sums[empty] = sample[rng.choice(len(sample), int(empty.sum()), replace=False)]
+        centroids = _normalize_rows(sums)
+    return centroids.astype(np.float32)
+
+
+def semantic_search(job_text, index, projection, k=10, n_probe=8):
+    """Resumes whose LSA embedding is closest to the job description's."""
+    return index.search(projection.transform([job_text])[0], k=k, n_probe=n_probe)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fit LSA embeddings and build or query an IVF resume index.")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+    fit = subcommands.add_parser("fit", help="Fit the LSA projection on a sample of resumes")
+    fit.add_argument("input", help="Directory, .zip, or .tar(.gz) of PDF/TXT resumes")
+    fit.add_argument("--dimensions", type=int, default=256)
+    fit.add_argument("--sample", type=int, default=50000, help="Resumes used for fitting")
+    build = subcommands.add_parser("build", help="Embed every resume and build the index")
+    build.add_argument("input", help="Directory, .zip, or .tar(.gz) of PDF/TXT resumes")
+    build.add_argument("--index", required=True, help="Index directory")
+    build.add_argument("--lists", type=int, help="IVF clusters (default: 4 x sqrt(resumes))")
+    build.add_argument("--dtype", choices=sorted(VECTOR_DTYPES), default="float16")
+    query = subcommands.add_parser("query", help="Find the resumes closest to a job description")
+    query.add_argument("--job", required=True, help="Job description file (.txt or .pdf)")
+    query.add_argument("--index", required=True)
+    query.add_argument("--k", type=int, default=20)
+    query.add_argument("--probe", type=int, default=8)
+    for subcommand in (fit, build, query):
+        subcommand.add_argument("--projection", default=DEFAULT_PROJECTION_PATH, help="Path of the .npz projection")
+    args = parser.parse_args(argv)
+
+    from bulk_score import iter_resume_texts, read_text
+
+    if args.command == "fit":
+        texts = []
+        for _, text in iter_resume_texts(args.input):
+            texts.append(text)
+            if len(texts) >= args.sample:
+                break
+        LsaProjection.fit(texts, args.dimensions).save(args.projection)
+        print(f"LSA projection saved to {args.projection}")
+    elif args.command == "build":
+        _build_from_files(args)
+    else:
+        with open(args.job, "rb") as handle:
+            job_text = read_text(args.job, handle.read())
+        index = IVFIndex.load(args.index)
+        for candidate_id, score in semantic_search(job_text, index, LsaProjection.load(args.projection), args.k, args.probe):
+            print(f"{score:6.3f}  {candidate_id}")
+
+
+def _build_from_files(args):
+    """Embed resumes in batches into a scratch memmap, so the corpus is never held in RAM at once."""
+    from bulk_score import iter_resume_texts
+
+    projection = LsaProjection.load(args.projection)
+    os.makedirs(args.index, exist_ok=True)
+    scratch_path = os.path.join(args.index, "embeddings.tmp.npy")
+    capacity = 1 << 16
+    embeddings = np.lib.format.open_memmap(scratch_path, mode="w+", dtype=np.float32, shape=(capacity, projection.dimensions))
+    ids = []
+    batch_names, batch_texts = [], []
+
+    def flush():
+        nonlocal embeddings, capacity
+        if not batch_texts:
+            return
+        if len(ids) + len(batch_texts) > capacity:
+            embeddings.flush()
+            capacity *= 2
+            grown = np.lib.format.open_memmap(scratch_path + ".grow", mode="w+", dtype=np.float32, shape=(capacity, projection.dimensions))
+            grown[: len(ids)] = embeddings[: len(ids)]
+            del embeddings
+            os.replace(scratch_path + ".grow", scratch_path)
+            embeddings = grown
+        embeddings[len(ids):len(ids) + len(batch_texts)] = projection.transform(batch_texts)
+        ids.extend(batch_names)
+        batch_names.clear()
+        batch_texts.clear()
+
+    for name, text in iter_resume_texts(args.input):
+        batch_names.append(name)
+        batch_texts.append(text)
+        if len(batch_texts) >= 1000:
+            flush()
+    flush()
+
+    index = IVFIndex.build(args.index, embeddings[: len(ids)], ids, n_lists=args.lists, dtype=args.dtype)
+    del embeddings
+    os.remove(scratch_path)
+    print(f"Indexed {len(index)} resumes in {args.index}")
+
+
+if __name__ == "__main__":
+    main()
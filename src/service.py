@@ -0,0 +1,306 @@
+"""Headless JSON scoring service.
+
+    python src/service.py --port 8000 --workers 4
+    curl -s localhost:8000/score -d '{"resume_text": "...", "job_description": "..."}'
+
+Endpoints:
+    POST /score        {"resume_text", "job_description", "use_ai": false} -> score breakdown plus "suggestions"
+    POST /suggestions  a score breakdown -> {"critical": [...], "important": [...], "optional": [...]}
+    GET  /healthz      worker and batching counters
+    GET  /metrics      scoring stage latency histograms from every worker (Prometheus text; needs TRACING=1)
+
+Scoring runs in a pool of worker processes that load the taxonomy, corpus model
+and NLP libraries once at start-up. Requests that arrive within a few
+milliseconds of each other for the same job description are scored together as
+one batch, which shares the job-side feature extraction. Each resume is still
+scored against the job description on its own, exactly as ``score_resume``
+would, so a score never depends on which other requests shared its batch.
+"""
+
+import argparse
+import json
+import os
+import signal
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, wait
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Deque, Dict, List, Optional, Tuple
+
+from doc_store import content_hash
+from tracing import merge_metrics, render_metrics, reset_metrics, span, take_metrics
+
+MAX_BODY_BYTES = 2 * 1024 * 1024
+
+
+def _init_worker():
+    """Load everything a first request would otherwise pay for."""
+    from corpus_model import get_corpus_model
+    from env import load_env
+    from nlp_utils import english_stop_words
+    from scorer import score_resumes
+    from taxonomy import get_taxonomy
+
+    load_env()
+    get_taxonomy()
+    get_corpus_model()
+    english_stop_words()
+    score_resumes("Python developer", ["Python developer with SQL experience"])
+    # The warm-up call is not a request; keep it out of the exported histograms.
+    reset_metrics()
+
+
+def _warm():
+    return os.getpid()
+
+
+def _score_batch(job_text: str, resume_texts: List[str], use_ai: bool) -> Tuple[List[dict], Dict[str, list]]:
+    """Score a batch in a worker; also returns the stage histograms it recorded, for ``/metrics``."""
+    from scorer import generate_suggestions, score_resumes_for_job
+
+    results = score_resumes_for_job(job_text, resume_texts, use_ai=use_ai)
+    for result in results:
+        result["suggestions"] = generate_suggestions(result)
+    return results, take_metrics()
+
+
+class MicroBatcher:
+    """Coalesces concurrent requests for the same job description into one worker call.
+
+    The first request for a job description opens a batch. After ``max_wait``
+    seconds the batch goes to the pool if a worker is free; while every worker is
+    busy it stays open and keeps collecting requests, so batches grow with load.
+    A batch holding ``max_batch`` resumes is sent immediately.
+    """
+
+    def __init__(self, executor: ProcessPoolExecutor, workers: int, max_batch: int = 32, max_wait: float = 0.01):
+        self.executor = executor
+        self.workers = workers
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.batches = 0
+        self.requests = 0
+        self._in_flight = 0
+        self._pending: Dict[Tuple[str, bool], Tuple[str, List[Tuple[str, Future]]]] = {}
+        self._ready: Deque[Tuple[str, bool]] = deque()
+        self._lock = threading.Lock()
+
+    def submit(self, resume_text: str, job_text: str, use_ai: bool = False) -> Future:
+        future: Future = Future()
+        key = (content_hash(job_text), use_ai)
+        with self._lock:
+            self.requests += 1
+            batch = self._pending.get(key)
+            if batch is None:
+                batch = self._pending[key] = (job_text, [])
+                timer = threading.Timer(self.max_wait, self._on_timer, (key,))
+                timer.daemon = True
+                timer.start()
+            batch[1].append((resume_text, future))
+            full = len(batch[1]) >= self.max_batch
+            dispatch = self._take(key) if full else None
+        if dispatch:
+            self._dispatch(key, *dispatch)
+        return future
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "batches": self.batches,
+                "in_flight": self._in_flight,
+                "mean_batch_size": self.requests / self.batches if self.batches else 0.0,
+            }
+
+    def _take(self, key):
+        """Remove a pending batch for dispatch; call with the lock held."""
+        batch = self._pending.pop(key, None)
+        if batch is not None:
+            self._in_flight += 1
+            self.batches += 1
+        return batch
+
+    def _on_timer(self, key):
+        with self._lock:
+            if key not in self._pending:
+                # Already sent because it filled up before the timer fired.
+                return
+            if self._in_flight >= self.workers:
+                self._ready.append(key)
+                return
+            batch = self._take(key)
+        self._dispatch(key, *batch)
+
+    def _dispatch(self, key, job_text, items):
+        try:
+            pooled = self.executor.submit(_score_batch, job_text, [text for text, _ in items], key[1])
+        except Exception as exc:
+            self._resolve_error(exc, items)
+            self._finished()
+            return
+        pooled.add_done_callback(lambda done: self._resolve(done, items))
+
+    def _resolve(self, done: Future, items):
+        error = done.exception()
+        if error is not None:
+            self._resolve_error(error, items)
+        else:
+            results, histograms = done.result()
+            merge_metrics(histograms)
+            for (_, future), result in zip(items, results):
+                future.set_result(result)
+        self._finished()
+
+    @staticmethod
+    def _resolve_error(error, items):
+        for _, future in items:
+            future.set_exception(error)
+
+    def _finished(self):
+        """Free a worker slot and send the oldest batch that was waiting for one."""
+        with self._lock:
+            self._in_flight -= 1
+            batch = None
+            while self._ready and batch is None:
+                key = self._ready.popleft()
+                batch = self._take(key)
+        if batch is not None:
+            self._dispatch(key, *batch)
+
+
+class ScoringServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # The default backlog of 5 resets connections under any real concurrency.
+    request_queue_size = 128
+
+
+class BadRequest(ValueError):
+    pass
+
+
+def _parse_score_request(payload) -> Tuple[str, str, bool]:
+    if not isinstance(payload, dict):
+        raise BadRequest("Expected a JSON object")
+    resume_text = payload.get("resume_text")
+    job_text = payload.get("job_description")
+    if not isinstance(resume_text, str) or not resume_text.strip():
+        raise BadRequest("resume_text must be a non-empty string")
+    if not isinstance(job_text, str) or not job_text.strip():
+        raise BadRequest("job_description must be a non-empty string")
+    return resume_text, job_text, bool(payload.get("use_ai", False))
+
+
+def make_handler(batcher: MicroBatcher, request_timeout: Optional[float] = None):
+    from scorer import generate_suggestions
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            if self.path == "/healthz":
+                self._send_json(200, {"status": "ok", **batcher.stats()})
+            elif self.path == "/metrics":
+                self._send_text(200, render_metrics(), "text/plain; version=0.0.4")
+            else:
+                self._send_json(404, {"error": f"No route for GET {self.path}"})
+
+        def do_POST(self):
+            try:
+                payload = self._read_json()
+                if self.path == "/score":
+                    with span("http_score"):
+                        future = batcher.submit(*_parse_score_request(payload))
+                        result = future.result(timeout=request_timeout)
+                    self._send_json(200, result)
+                elif self.path == "/suggestions":
+                    if not isinstance(payload, dict):
+                        raise BadRequest("Expected a score breakdown object")
+                    self._send_json(200, generate_suggestions(payload))
+                else:
+                    self._send_json(404, {"error": f"No route for POST {self.path}"})
+            except BadRequest as exc:
+                self._send_json(400, {"error": str(exc)})
+            except KeyError as exc:
+                self._send_json(400, {"error": f"Missing field {exc}"})
+            except FutureTimeoutError:
+                # Only an alias of the built-in TimeoutError from Python 3.11.
+                self._send_json(504, {"error": "Scoring timed out"})
+            except Exception as exc:
+                self._send_json(500, {"error": f"{type(exc).__name__}: {exc}"})
+
+        def _read_json(self):
+            length = int(self.headers.get("Content-Length", 0))
+            if length > MAX_BODY_BYTES:
+                self.close_connection = True
+                raise BadRequest(f"Request body exceeds {MAX_BODY_BYTES} bytes")
+            try:
+                return json.loads(self.rfile.read(length) or b"{}")
+            except ValueError as exc:
+                raise BadRequest(f"Invalid JSON: {exc}") from exc
+
+        def _send_json(self, status, payload):
+            self._send_text(status, json.dumps(payload), "application/json")
+
+        def _send_text(self, status, text, content_type):
+            body = text.encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def start_workers(workers: int) -> ProcessPoolExecutor:
+    """Start the pool and wait until every worker has preloaded its models."""
+    executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker)
+    # The pool starts processes on demand, so keep submitting until each one has answered.
+    pids = set()
+    deadline = time.monotonic() + 300
+    while len(pids) < workers and time.monotonic() < deadline:
+        done, _ = wait([executor.submit(_warm) for _ in range(workers)])
+        pids.update(future.result() for future in done)
+    return executor
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve resume scoring over HTTP with JSON in and out.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Scoring processes")
+    parser.add_argument("--max-batch", type=int, default=32, help="Most resumes scored in one batch")
+    parser.add_argument("--batch-wait-ms", type=float, default=10.0, help="How long a batch stays open for more requests")
+    parser.add_argument("--timeout", type=float, default=120.0, help="Seconds before a request gives up on its result")
+    args = parser.parse_args(argv)
+
+    executor = start_workers(args.workers)
+    batcher = MicroBatcher(executor, args.workers, max_batch=args.max_batch, max_wait=args.batch_wait_ms / 1000)
+    server = ScoringServer((args.host, args.port), make_handler(batcher, request_timeout=args.timeout))
+    print(f"Scoring service on http://{args.host}:{server.server_port} with {args.workers} workers", file=sys.stderr)
+
+    def stop(signum, frame):
+        raise KeyboardInterrupt
+
+    # Shut the pool down on SIGTERM too, so worker processes are not orphaned.
+    signal.signal(signal.SIGTERM, stop)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if sys.version_info >= (3, 9):
+            executor.shutdown(cancel_futures=True)
+        else:
+            executor.shutdown()
+
+
+if __name__ == "__main__":
+    main()
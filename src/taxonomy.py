@@ -0,0 +1,104 @@
+import json
+import os
+import threading
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from env import load_env
+from matcher import TermMatcher
+
+DEFAULT_TAXONOMY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "skills_taxonomy.json")
+
+
+class SkillTaxonomy:
+    """Canonical skills, aliases, and categories compiled into in-memory indexes.
+
+    Aliases resolve to their canonical skill through a hash lookup, and every
+    surface form is compiled into a single :class:`TermMatcher`, so extracting
+    skills from a document is one pass regardless of the taxonomy size.
+    """
+
+    def __init__(self, categories: Dict[str, list], skill_sets: Optional[Dict[str, dict]] = None, version: str = ""):
+        self.version = version
+        self.skills: List[str] = []
+        self.category_of: Dict[str, str] = {}
+        self.aliases: Dict[str, str] = {}
+
+        for category, entries in categories.items():
+            for entry in entries:
+                if isinstance(entry, str):
+                    entry = {"name": entry}
+                name = entry["name"].strip().lower()
+                if name in self.category_of:
+                    raise ValueError(f"Skill '{name}' is listed more than once in the taxonomy")
+                self.skills.append(name)
+                self.category_of[name] = category
+                for surface in [name, *entry.get("aliases", [])]:
+                    self._add_alias(surface.strip().lower(), name)
+
+        self._order = {skill: index for index, skill in enumerate(self.skills)}
+        self.matcher = TermMatcher(self.aliases)
+        self.skill_sets: Dict[str, Tuple[str, ...]] = {
+            name: self._resolve_skill_set(name, definition) for name, definition in (skill_sets or {}).items()
+        }
+
+    @classmethod
+    def from_file(cls, path: str = DEFAULT_TAXONOMY_PATH) -> "SkillTaxonomy":
+        with open(path, encoding="utf-8") as handle:
+            payload = json.load(handle)
+        return cls(payload["categories"], payload.get("skill_sets"), str(payload.get("version", "")))
+
+    def normalize(self, term: str) -> Optional[str]:
+        """Map a skill name or alias to its canonical skill, or ``None`` if unknown."""
+        return self.aliases.get(term.strip().lower())
+
+    def find(self, text: str) -> Set[str]:
+        """Return the canonical skills mentioned anywhere in ``text``."""
+        return {self.aliases[surface] for surface in self.matcher.found(text)}
+
+    def extract(self, text: str, skill_set: Optional[str] = None) -> List[str]:
+        """Return canonical skills found in ``text``, ordered as in the taxonomy or skill set."""
+        found = self.find(text)
+        if skill_set is None:
+            return sorted(found, key=self._order.__getitem__)
+        return [skill for skill in self.skill_sets[skill_set] if skill in found]
+
+    def skills_in(self, category: str) -> List[str]:
+        return [skill for skill in self.skills if self.category_of[skill] == category]
+
+    def canonicalize(self, skills: Iterable[str]) -> List[str]:
+        """Normalize free-form skill names, keeping unknown names unchanged."""
+        return [self.normalize(skill) or skill for skill in skills]
+
+    def _add_alias(self, surface: str, skill: str):
+        existing = self.aliases.get(surface)
+        if existing is not None and existing != skill:
+            raise ValueError(f"Alias '{surface}' maps to both '{existing}' and '{skill}'")
+        self.aliases[surface] = skill
+
+    def _resolve_skill_set(self, name: str, definition: dict) -> Tuple[str, ...]:
+        skills = list(definition.get("skills", []))
+        for category in definition.get("categories", []):
+            skills.extend(self.skills_in(category))
+
+        resolved = []
+        for skill in skills:
+            canonical = self.normalize(skill)
+            if canonical is None:
+                raise ValueError(f"Skill set '{name}' references unknown skill '{skill}'")
+            resolved.append(canonical)
+        return tuple(dict.fromkeys(resolved))
+
+
+_taxonomy = None
+_taxonomy_lock = threading.Lock()
+
+
+def get_taxonomy() -> SkillTaxonomy:
+    """Return the process-wide skills taxonomy, compiling it on first use."""
+    global _taxonomy
+    if _taxonomy is None:
+        with _taxonomy_lock:
+            if _taxonomy is None:
+                load_env()
+                _taxonomy = SkillTaxonomy.from_file(os.getenv("SKILLS_TAXONOMY_PATH", DEFAULT_TAXONOMY_PATH))
+    return _taxonomy
@@ -0,0 +1,270 @@
+import contextvars
+import functools
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, Optional
+
+from env import load_env
+
+# Histogram bucket upper bounds, in seconds, for every stage.
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+METRIC_NAME = "resume_analyzer_stage_seconds"
+
+
+class Timings:
+    """Per-request stage durations; repeated stages accumulate."""
+
+    def __init__(self):
+        self._seconds: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def add(self, stage: str, seconds: float):
+        with self._lock:
+            self._seconds[stage] = self._seconds.get(stage, 0.0) + seconds
+
+    def as_dict(self) -> Dict[str, float]:
+        """Stage durations in milliseconds."""
+        with self._lock:
+            return {stage: round(seconds * 1000, 3) for stage, seconds in self._seconds.items()}
+
+
+class _Settings:
+    def __init__(self, enabled=False, profile_rate=0.0, profile_dir=".profiles", profiler="cprofile"):
+        self.enabled = enabled
+        self.profile_rate = profile_rate
+        self.profile_dir = profile_dir
+        self.profiler = profiler
+
+
+_settings: Optional[_Settings] = None
+_current_timings: "contextvars.ContextVar[Optional[Timings]]" = contextvars.ContextVar("timings", default=None)
+_histograms: Dict[str, list] = {}
+_histograms_lock = threading.Lock()
+
+
+def _get_settings() -> _Settings:
+    global _settings
+    if _settings is None:
+        load_env()
+        _settings = _Settings(
+            enabled=os.getenv("TRACING", "").lower() in ("1", "true", "yes"),
+            profile_rate=float(os.getenv("TRACE_PROFILE_RATE", "0")),
+            profile_dir=os.getenv("TRACE_PROFILE_DIR", ".profiles"),
+            profiler=os.getenv("TRACE_PROFILER", "cprofile").lower(),
+        )
+    return _settings
+
+
+def configure(enabled=None, profile_rate=None, profile_dir=None, profiler=None):
+    """Override the ``TRACING``/``TRACE_PROFILE_*`` environment settings at runtime."""
+    settings = _get_settings()
+    if enabled is not None:
+        settings.enabled = enabled
+    if profile_rate is not None:
+        settings.profile_rate = profile_rate
+    if profile_dir is not None:
+        settings.profile_dir = profile_dir
+    if profiler is not None:
+        settings.profiler = profiler.lower()
+
+
+def is_enabled() -> bool:
+    return (_settings or _get_settings()).enabled
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class _Span:
+    __slots__ = ("stage", "start")
+
+    def __init__(self, stage):
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        record(self.stage, time.perf_counter() - self.start)
+        return False
+
+
+def span(stage: str):
+    """Context manager timing one stage; a shared no-op object when tracing is off."""
+    if not is_enabled():
+        return _NOOP_SPAN
+    return _Span(stage)
+
+
+def traced(stage: Optional[str] = None):
+    """Decorator form of :func:`span`; the stage defaults to the function name."""
+
+    def decorate(func):
+        name = stage or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not is_enabled():
+                return func(*args, **kwargs)
+            with _Span(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+def record(stage: str, seconds: float):
+    """Add a duration to the active request's timings and to the process-wide histogram."""
+    timings = _current_timings.get()
+    if timings is not None:
+        timings.add(stage, seconds)
+    with _histograms_lock:
+        histogram = _histograms.get(stage)
+        if histogram is None:
+            histogram = _histograms[stage] = [[0] * len(BUCKETS), 0.0, 0]
+        counts = histogram[0]
+        for index, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                counts[index] += 1
+                break
+        histogram[1] += seconds
+        histogram[2] += 1
+
+
+@contextmanager
+def trace(name: str) -> Iterator[Optional[Timings]]:
+    """Collect the spans of one request; yields its :class:`Timings`, or ``None`` when tracing is off.
+
+    The outermost trace is profiled for a ``TRACE_PROFILE_RATE`` fraction of requests,
+    with the dump written to ``TRACE_PROFILE_DIR``.
+    """
+    settings = _settings or _get_settings()
+    if not settings.enabled:
+        yield None
+        return
+
+    outermost = _current_timings.get() is None
+    timings = Timings()
+    token = _current_timings.set(timings)
+    profiler = _start_profiler(settings) if outermost and random.random() < settings.profile_rate else None
+    start = time.perf_counter()
+    try:
+        yield timings
+    finally:
+        elapsed = time.perf_counter() - start
+        if profiler is not None:
+            _stop_profiler(profiler, settings, name)
+        record(name, elapsed)
+        _current_timings.reset(token)
+
+
+def bind(func: Callable) -> Callable:
+    """Wrap ``func`` to run inside the current trace, e.g. when handed to a worker thread."""
+    if _current_timings.get() is None:
+        return func
+    return functools.partial(contextvars.copy_context().run, func)
+
+
+def attach_timings(result: dict, timings: Optional[Timings]) -> dict:
+    """Add ``timings`` (milliseconds per stage) to a result when tracing collected any."""
+    if timings is not None:
+        result["timings"] = timings.as_dict()
+    return result
+
+
+def render_metrics(openmetrics: bool = False) -> str:
+    """Stage histograms in Prometheus text format, or OpenMetrics with ``openmetrics=True``."""
+    lines = [
+        f"# HELP {METRIC_NAME} Time spent in each resume scoring stage.",
+        f"# TYPE {METRIC_NAME} histogram",
+    ]
+    with _histograms_lock:
+        snapshot = {stage: (list(counts), total, count) for stage, (counts, total, count) in _histograms.items()}
+    for stage in sorted(snapshot):
+        counts, total, count = snapshot[stage]
+        label = stage.replace("\\", "\\\\").replace('"', '\\"')
+        cumulative = 0
+        for bound, bucket_count in zip(BUCKETS, counts):
+            cumulative += bucket_count
+            lines.append(f'{METRIC_NAME}_bucket{{stage="{label}",le="{bound}"}} {cumulative}')
+        lines.append(f'{METRIC_NAME}_bucket{{stage="{label}",le="+Inf"}} {count}')
+        lines.append(f'{METRIC_NAME}_sum{{stage="{label}"}} {total}')
+        lines.append(f'{METRIC_NAME}_count{{stage="{label}"}} {count}')
+    if openmetrics:
+        lines.append("# EOF")
+    return "\n".join(lines) + "\n"
+
+
+def reset_metrics():
+    with _histograms_lock:
+        _histograms.clear()
+
+
+def take_metrics() -> Dict[str, list]:
+    """Remove and return this process's histograms, e.g. to hand them to a parent process."""
+    with _histograms_lock:
+        histograms = dict(_histograms)
+        _histograms.clear()
+    return histograms
+
+
+def merge_metrics(histograms: Dict[str, list]):
+    """Add histograms returned by :func:`take_metrics` in another process to this one's."""
+    with _histograms_lock:
+        for stage, (counts, total, count) in histograms.items():
+            histogram = _histograms.get(stage)
+            if histogram is None:
+                histogram = _histograms[stage] = [[0] * len(BUCKETS), 0.0, 0]
+            histogram[0] = [mine + theirs for mine, theirs in zip(histogram[0], counts)]
+            histogram[1] += total
+            histogram[2] += count
+
+
+def _start_profiler(settings):
+    if settings.profiler == "pyinstrument":
+        try:
+            from pyinstrument import Profiler
+        except ImportError:
+            pass
+        else:
+            profiler = Profiler()
+            profiler.start()
+            return profiler
+
+    import cProfile
+
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError:
+        # Another profiler is already active on this thread.
+        return None
+    return profiler
+
+
+def _stop_profiler(profiler, settings, name):
+    os.makedirs(settings.profile_dir, exist_ok=True)
+    path = os.path.join(settings.profile_dir, f"{name}-{time.time_ns()}")
+    if hasattr(profiler, "output_html"):
+        profiler.stop()
+        with open(path + ".html", "w", encoding="utf-8") as handle:
+            handle.write(profiler.output_html())
+    else:
+        profiler.disable()
+        profiler.dump_stats(path + ".prof")